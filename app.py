@@ -3,9 +3,14 @@ ANTT Railway Network Dashboard
 Main application entry point with i18n support
 """
 import streamlit as st
-from config.settings import PAGE_CONFIG, LANGUAGES, DEFAULT_LANGUAGE
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from config.settings import PAGE_CONFIG, LANGUAGES, DEFAULT_LANGUAGE, PROFILE_LOG_PATH
 from config.translations import get_text
-from src.pages import page_yards, page_capacity, page_speed
+from src.data.loader import summaries_are_current
+from src.data.warmup import start_warmup
+from src.database import repository
+from src.pages import PAGES, get_page
+from src.utils import profiling
 
 
 def main():
@@ -16,15 +21,37 @@ def main():
     # Initialize language in session state
     if 'language' not in st.session_state:
         st.session_state.language = DEFAULT_LANGUAGE
+
+    # Initialize concession filters (None = all)
+    if 'filters' not in st.session_state:
+        st.session_state.filters = {'ferrovia': None, 'ano': None}
+
+    # Opt-in profiling: env var for every session, sidebar toggle for this one
+    if 'profiling' not in st.session_state:
+        st.session_state.profiling = profiling.env_enabled()
+    if st.session_state.profiling:
+        profiling.start_run()
     
     # Render sidebar (includes language selector)
-    selected_analysis = render_sidebar()
+    selected_page = render_sidebar()
     
     # Render header
     render_header()
     
     # Route to appropriate page
-    route_page(selected_analysis)
+    route_page(selected_page)
+
+    profile = profiling.finish_run(
+        session=get_script_run_ctx().session_id,
+        page=selected_page,
+        language=st.session_state.language,
+        filters=st.session_state.filters
+    )
+    if profile is not None:
+        render_debug_panel(profile)
+
+    # After the first paint: preload the other pages for the next sessions
+    start_warmup()
 
 
 def render_header():
@@ -33,6 +60,10 @@ def render_header():
     
     st.title(get_text('app_title', lang))
     st.markdown(get_text('app_subtitle', lang))
+
+    if not summaries_are_current():
+        st.warning(get_text('summaries_outdated', lang))
+
     st.divider()
 
 
@@ -59,37 +90,108 @@ def render_sidebar():
 
     st.sidebar.divider()
 
+    # Concession filters, applied by every page query
+    st.sidebar.header(get_text('nav_filters', lang))
+    st.session_state.filters = render_filters()
+
+    st.sidebar.divider()
+
     # Navigation menu
     st.sidebar.header(get_text('nav_header', lang))
 
-    analysis_options = [
-        get_text('analysis_yards', lang),
-        get_text('analysis_capacity', lang),
-        get_text('analysis_speed', lang)
-    ]
-
-    return st.sidebar.radio(
+    # Page keys as options, shown with the label of the current language
+    selected = st.sidebar.radio(
         get_text('nav_select', lang),
-        analysis_options
+        list(PAGES),
+        format_func=lambda key: get_text(PAGES[key].label_key, lang),
+        key='page'
     )
 
+    st.sidebar.divider()
+    st.sidebar.toggle(get_text('nav_profiling', lang), key='profiling')
+
+    return selected
 
-def route_page(selected_analysis: str):
+
+def render_filters() -> dict:
     """
-    Route to the selected page based on user choice.
+    Render railway/year selectors from the concessions in the database.
+    
+    Returns:
+        Filter values for the repository queries (None = all)
+    """
+    lang = st.session_state.language
+    all_label = get_text('filter_all', lang)
+
+    df = repository.concessions()
+
+    ferrovias = [None] + sorted(df['ferrovia'].unique().tolist())
+    ferrovia = st.sidebar.selectbox(
+        get_text('filter_railway', lang),
+        ferrovias,
+        format_func=lambda x: all_label if x is None else x,
+        key='filter_ferrovia'
+    )
+
+    if ferrovia is not None:
+        df = df[df['ferrovia'] == ferrovia]
+
+    # Plain ints: numpy scalars cannot be bound as SQLite parameters
+    anos = [None] + sorted((int(a) for a in df['ano'].unique()), reverse=True)
+    ano = st.sidebar.selectbox(
+        get_text('filter_year', lang),
+        anos,
+        format_func=lambda x: all_label if x is None else str(x),
+        key='filter_ano'
+    )
+
+    return {'ferrovia': ferrovia, 'ano': ano}
+
+
+def render_debug_panel(profile: profiling.RunProfile):
+    """
+    Render the timings collected during this rerun.
     
     Args:
-        selected_analysis: Selected analysis option from sidebar
+        profile: Finished profile of the current rerun
     """
     lang = st.session_state.language
 
-    # Map selection to page (language-independent)
-    if selected_analysis == get_text('analysis_yards', lang):
-        page_yards.render()
-    elif selected_analysis == get_text('analysis_capacity', lang):
-        page_capacity.render()
-    elif selected_analysis == get_text('analysis_speed', lang):
-        page_speed.render()
+    st.divider()
+    with st.expander(get_text('debug_title', lang), expanded=True):
+        queries = profile.queries_frame()
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric(get_text('debug_total', lang), f"{profile.total_ms:.0f} ms")
+        col2.metric(get_text('debug_queries', lang), len(queries))
+        col3.metric(get_text('debug_query_time', lang), f"{queries['ms'].sum():.0f} ms")
+
+        st.markdown(f"**{get_text('debug_caches', lang)}**")
+        st.dataframe(profile.caches_frame(), width='stretch')
+
+        st.markdown(f"**{get_text('debug_sections', lang)}**")
+        sections = profile.sections_frame()
+        # Indent nested sections under their caller
+        sections['section'] = [
+            '\u2003' * depth + name
+            for name, depth in zip(sections['section'], sections['depth'])
+        ]
+        st.dataframe(sections[['section', 'ms']], width='stretch', hide_index=True)
+
+        st.markdown(f"**{get_text('debug_queries', lang)}**")
+        st.dataframe(queries.sort_values('ms', ascending=False), width='stretch', hide_index=True)
+
+        st.caption(get_text('debug_log_note', lang, path=PROFILE_LOG_PATH))
+
+
+def route_page(page_key: str):
+    """
+    Render the selected page, importing its module on first use.
+    
+    Args:
+        page_key: Key of the selected page in PAGES
+    """
+    get_page(page_key).render()
 
 
 if __name__ == "__main__":
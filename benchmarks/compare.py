@@ -0,0 +1,108 @@
+"""
+Compara dois resultados do run.py e aponta as regressões.
+
+Cada medição é casada por (escala, grupo, nome, motor) e comparada pela
+mediana. Uma medição regrediu quando ficou mais lenta que a base além do
+limite relativo E do piso absoluto (abaixo dele a diferença é ruído).
+Sai com código 1 se houver regressão, para ser usado antes do deploy.
+
+Uso:
+    python benchmarks/compare.py base.json novo.json --threshold 0.25
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        report = json.load(f)
+    results = {
+        (r['scale'], r['group'], r['name'], r['engine']): r
+        for r in report['results']
+    }
+    return report, results
+
+
+def label(key):
+    scale, group, name, engine = key
+    suffix = f" ({engine})" if engine else ""
+    return f"{scale}x {group} {name}{suffix}"
+
+
+def compare(base, new, threshold, min_seconds):
+    """Retorna (regressões, melhorias, linhas divergentes, só na base, só no novo)"""
+    regressions, improvements, row_changes = [], [], []
+
+    for key in sorted(set(base) & set(new), key=str):
+        before, after = base[key]['median_s'], new[key]['median_s']
+        delta = after - before
+        ratio = after / before if before else float('inf')
+
+        if new[key]['rows'] != base[key]['rows']:
+            row_changes.append((key, base[key]['rows'], new[key]['rows']))
+
+        if abs(delta) < min_seconds:
+            continue
+        if ratio > 1 + threshold:
+            regressions.append((key, before, after, ratio))
+        elif ratio < 1 / (1 + threshold):
+            improvements.append((key, before, after, ratio))
+
+    only_base = sorted(set(base) - set(new), key=str)
+    only_new = sorted(set(new) - set(base), key=str)
+    return regressions, improvements, row_changes, only_base, only_new
+
+
+def print_section(title, items):
+    if not items:
+        return
+    print(f"\n{title}:")
+    for key, before, after, ratio in sorted(items, key=lambda item: -abs(item[2] - item[1])):
+        print(f"   {label(key):<70} {before * 1000:>10.2f} ms -> {after * 1000:>10.2f} ms  ({ratio:.2f}x)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compara dois resultados de benchmark")
+    parser.add_argument('base', help="JSON de referência (ex: último deploy)")
+    parser.add_argument('new', help="JSON a validar")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="Aumento relativo da mediana tolerado (padrão: 0.25 = 25%%)")
+    parser.add_argument('--min-seconds', type=float, default=0.005,
+                        help="Diferenças absolutas menores que isto são ignoradas (padrão: 5 ms)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    base_report, base = load_results(args.base)
+    new_report, new = load_results(args.new)
+
+    print(f"Base: {args.base} (commit {base_report.get('commit')}, {base_report.get('created_at')})")
+    print(f"Novo: {args.new} (commit {new_report.get('commit')}, {new_report.get('created_at')})")
+    if base_report.get('platform') != new_report.get('platform'):
+        print("   [AVISO] Máquinas diferentes: os tempos podem não ser comparáveis.")
+
+    regressions, improvements, row_changes, only_base, only_new = compare(
+        base, new, args.threshold, args.min_seconds
+    )
+
+    print_section("Regressões", regressions)
+    print_section("Melhorias", improvements)
+
+    if row_changes:
+        print("\nNº de linhas diferente (dados ou consulta mudaram):")
+        for key, before, after in row_changes:
+            print(f"   {label(key)}: {before} -> {after}")
+    if only_base:
+        print(f"\n{len(only_base)} medições só na base (ex: {label(only_base[0])}).")
+    if only_new:
+        print(f"{len(only_new)} medições só no novo (ex: {label(only_new[0])}).")
+
+    print(f"\n{len(regressions)} regressão(ões), {len(improvements)} melhoria(s) "
+          f"em {len(set(base) & set(new))} medições comparadas.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
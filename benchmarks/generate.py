@@ -0,0 +1,196 @@
+"""
+Gerador de Declarações de Rede sintéticas para os benchmarks.
+
+Usa uma planilha real como molde: as linhas de cabeçalho das quatro abas lidas
+pelo ETL são copiadas como estão (o ExcelExtractor continua vendo o mesmo
+layout) e as linhas de dados são replicadas para várias concessões
+(ferrovia x ano). Cada réplica recebe códigos de pátio, terminais e nomes de
+linha próprios e valores numéricos perturbados, para que as chaves naturais
+continuem únicas e as agregações não sejam triviais.
+
+Uso:
+    python benchmarks/generate.py --scale 100 --output /tmp/dr_x100
+"""
+import argparse
+import os
+import random
+import re
+
+import openpyxl
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+DEFAULT_TEMPLATE = os.path.join(PROJECT_DIR, 'db', 'data', 'DR2025-MRS.xlsx')
+
+# Abas lidas pelo ExcelExtractor e nº de linhas de cabeçalho (incluindo as vazias)
+SHEETS = ['Pátios', 'Terminais', 'Entre Pátios', 'Entre Trechos']
+HEADER_ROWS = 3
+
+# Escala (multiplicador de linhas sobre o molde) -> (ferrovias, anos, réplicas por planilha)
+SCALES = {
+    1: (1, 1, 1),
+    10: (5, 2, 1),
+    100: (10, 5, 2),
+    1000: (20, 10, 5),
+}
+
+REAL_RAILWAYS = ['MRS', 'FCA', 'RMN', 'RMP', 'RMS', 'RMO', 'EFC', 'EFVM', 'FTL', 'FNS', 'FTC']
+
+# Código entre parênteses: 'Brisamar (FBA), km 0,000' / 'Água Branca (IAB, MRS)'
+CODE_PATTERN = re.compile(r"\(([A-Z0-9]+)")
+
+
+def railway_names(count):
+    names = REAL_RAILWAYS[:count]
+    names += [f"F{i:02d}" for i in range(len(names), count)]
+    return names
+
+
+def _suffix_code(text, replica):
+    """Acrescenta a réplica ao código entre parênteses"""
+    if replica == 0 or not isinstance(text, str):
+        return text
+    return CODE_PATTERN.sub(lambda m: f"({m.group(1)}{replica}", text, count=1)
+
+
+def _suffix_line(text, replica):
+    """Linha distinta por réplica; em 'Linhas de Referência' só a primeira linha muda"""
+    if replica == 0 or not isinstance(text, str):
+        return text
+    if ' (km' in text:
+        return text.replace(' (km', f" - R{replica} (km", 1)
+    return f"{text} - R{replica}"
+
+
+def _suffix_name(text, replica):
+    if replica == 0 or text is None:
+        return text
+    return f"{text}{replica}"
+
+
+def _jitter(value, rng):
+    """Perturba ±10% os valores numéricos, mantendo inteiros como inteiros"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    factor = rng.uniform(0.9, 1.1)
+    if isinstance(value, int):
+        return int(round(value * factor))
+    return value * factor
+
+
+# Coluna do cabeçalho (primeira linha) -> regra aplicada em cada réplica
+COLUMN_RULES = {
+    'Pátio': _suffix_name,
+    'Código': _suffix_name,
+    'Linhas de Referência': _suffix_line,
+    'Linha': _suffix_line,
+    'Segmento': _suffix_code,
+    'Pátio de Referência': _suffix_code,
+    'Terminal': _suffix_name,
+}
+
+
+def read_template(template_path):
+    """Cabeçalhos e linhas de dados das abas usadas pelo ETL"""
+    workbook = openpyxl.load_workbook(template_path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for name in SHEETS:
+            rows = [list(row) for row in workbook[name].iter_rows(values_only=True)]
+            header, data = rows[:HEADER_ROWS], rows[HEADER_ROWS:]
+            data = [row for row in data if any(v not in (None, '') for v in row)]
+            sheets[name] = (header, data)
+        return sheets
+    finally:
+        workbook.close()
+
+
+def _column_rules(header_row):
+    """Índice da coluna -> regra; 'Segmento' ocupa duas colunas (Pátio A e Pátio B)"""
+    rules = {}
+    for i, name in enumerate(header_row):
+        if name in COLUMN_RULES:
+            rules[i] = COLUMN_RULES[name]
+            if name == 'Segmento':
+                rules[i + 1] = COLUMN_RULES[name]
+    return rules
+
+
+def synthetic_rows(header, data, ferrovia, ano, replicas, rng):
+    rules = _column_rules(header[0])
+    for replica in range(replicas):
+        for row in data:
+            new_row = [ferrovia, ano]
+            for i, value in enumerate(row[2:], start=2):
+                if i in rules:
+                    new_row.append(rules[i](value, replica))
+                else:
+                    new_row.append(_jitter(value, rng))
+            yield new_row
+
+
+def write_workbook(path, sheets, ferrovia, ano, replicas, rng):
+    workbook = openpyxl.Workbook(write_only=True)
+    for name, (header, data) in sheets.items():
+        worksheet = workbook.create_sheet(name)
+        for row in header:
+            worksheet.append(row)
+        for row in synthetic_rows(header, data, ferrovia, ano, replicas, rng):
+            worksheet.append(row)
+    workbook.save(path)
+
+
+def generate_workbooks(output_dir, ferrovias, anos, replicas,
+                       template_path=DEFAULT_TEMPLATE, seed=42):
+    """
+    Gera uma planilha DR<ano>-<ferrovia>.xlsx por concessão.
+    Planilhas já existentes são reaproveitadas (mesma semente, mesmo conteúdo).
+
+    Retorna a lista de caminhos gerados.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    sheets = None
+    paths = []
+
+    last_year = 2025
+    for ferrovia in railway_names(ferrovias):
+        for ano in range(last_year, last_year - anos, -1):
+            path = os.path.join(output_dir, f"DR{ano}-{ferrovia}.xlsx")
+            paths.append(path)
+            if os.path.exists(path):
+                continue
+
+            if sheets is None:
+                sheets = read_template(template_path)
+            rng = random.Random(f"{seed}:{ferrovia}:{ano}")
+            write_workbook(path, sheets, ferrovia, ano, replicas, rng)
+
+    return paths
+
+
+def scale_plan(scale):
+    if scale not in SCALES:
+        raise ValueError(f"Escala sem plano: {scale} (disponíveis: {sorted(SCALES)})")
+    return SCALES[scale]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gera Declarações de Rede sintéticas")
+    parser.add_argument('--scale', type=int, choices=sorted(SCALES), default=10,
+                        help="Multiplicador de linhas sobre o molde (padrão: 10)")
+    parser.add_argument('--output', required=True, help="Diretório das planilhas geradas")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="Planilha real usada como molde")
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    ferrovias, anos, replicas = scale_plan(args.scale)
+    paths = generate_workbooks(args.output, ferrovias, anos, replicas, args.template, args.seed)
+    print(f"{len(paths)} planilha(s) em '{args.output}' "
+          f"({ferrovias} ferrovias x {anos} anos, {replicas} réplica(s) por planilha).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+"""
+Benchmarks do ETL e das consultas do dashboard sobre dados sintéticos.
+
+Para cada escala, gera as planilhas (generate.py) e mede:
+- extract: cada aba, somada sobre todas as planilhas, e o total;
+- transform / materialize / load: cada tabela, por motor (pandas, spark);
+- query: cada QUERY_* de src/database/queries.py direto no SQLite (e no DuckDB,
+  sobre a cópia Parquet);
+- repository: cada função do repositório, sem cache, com e sem filtro de concessão,
+  em cada backend do dashboard (DATA_BACKEND), e o acerto no cache (repository_cached);
+- figure: cada figura das páginas (pandas + Plotly Express) e a serialização JSON,
+  com as consultas já em cache;
+- network: montagem do grafo da malha e consultas de rota/alcance entre pátios sorteados.
+
+O resultado é um JSON comparável entre execuções (compare.py).
+
+Uso:
+    python benchmarks/run.py --scales 1 10 100 --repeat 3
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+
+# Roda como script (python benchmarks/run.py): a raiz entra no path para
+# importar o ETL (db.*) e o dashboard (src.*) como pacotes
+if PROJECT_DIR not in sys.path:
+    sys.path.append(PROJECT_DIR)
+
+import pandas as pd
+
+from db.extract import ExcelExtractor
+from db.transform_pandas import PandasTransformer
+from db.load import DataModeler
+from db.etl import spark_unavailable
+from generate import SCALES, generate_workbooks, scale_plan
+
+WORK_DIR = os.path.join(BENCH_DIR, 'work')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+ENGINES = ['pandas', 'spark']
+BACKENDS = ['sqlite', 'parquet', 'duckdb']
+
+# O dashboard resolve DB_PATH (db/data/antt.db) e a cópia Parquet a partir do diretório atual
+DASHBOARD_DB = os.path.join('db', 'data', 'antt.db')
+DASHBOARD_PARQUET = os.path.join('db', 'data', 'parquet')
+
+# Chamadas do repositório medidas: (rótulo, função, argumentos)
+REPOSITORY_CALLS = [
+    ('concessions', 'concessions', {}),
+    ('yards', 'yards', {}),
+    ('yards_by_status', 'yards_by_status', {}),
+    ('yards_by_line', 'yards_by_line', {'limit': 15}),
+    ('capacity_by_commodity', 'capacity_by_commodity', {}),
+    ('capacity_by_sector', 'capacity_by_sector', {}),
+    ('top_terminals', 'top_terminals', {'limit': 15}),
+    ('load_vs_speed[vma]', 'load_vs_speed', {'speed': 'vma'}),
+    ('load_vs_speed[vmc]', 'load_vs_speed', {'speed': 'vmc'}),
+    ('speed_anomalies', 'speed_anomalies', {}),
+    ('speed_efficiency', 'speed_efficiency', {}),
+    ('corridor_efficiency', 'corridor_efficiency', {'ascending': True, 'limit': 10}),
+]
+
+
+class Results:
+    """Tempos de cada medição, agregados em mediana/mínimo por (escala, grupo, nome, motor)"""
+
+    def __init__(self):
+        self.runs = defaultdict(list)
+        self.rows = {}
+
+    def add(self, scale, group, name, seconds, rows=None, engine=None):
+        key = (scale, group, name, engine)
+        self.runs[key].append(seconds)
+        if rows is not None:
+            self.rows[key] = rows
+
+    def add_records(self, scale, records, engine=None):
+        """Registros da telemetria do ETL: soma as planilhas de cada (etapa, tabela)"""
+        seconds = defaultdict(float)
+        rows = defaultdict(int)
+        for record in records:
+            key = (record['stage'], record['target'])
+            seconds[key] += record['wall_s']
+            rows[key] += record['rows_out'] or 0
+        for (stage, target), value in seconds.items():
+            self.add(scale, stage, target, value, rows[(stage, target)], engine)
+
+    def to_list(self):
+        results = []
+        for (scale, group, name, engine), runs in self.runs.items():
+            results.append({
+                'scale': scale,
+                'group': group,
+                'name': name,
+                'engine': engine,
+                'rows': self.rows.get((scale, group, name, engine)),
+                'median_s': round(statistics.median(runs), 6),
+                'min_s': round(min(runs), 6),
+                'runs_s': [round(r, 6) for r in runs],
+            })
+        return results
+
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """Silencia as mensagens de progresso do ETL durante as medições"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def _extract_one(excel_file, output_dir, verbose):
+    with quiet(not verbose):
+        stem = os.path.splitext(os.path.basename(excel_file))[0]
+        extractor = ExcelExtractor(excel_file, os.path.join(output_dir, stem))
+        paths = extractor.run()
+    return paths, extractor.telemetry.records
+
+
+def extract_all(workbooks, output_dir, workers, verbose):
+    """Mesma estratégia do etl.py: uma planilha por processo"""
+    if workers == 1 or len(workbooks) == 1:
+        results = [_extract_one(w, output_dir, verbose) for w in workbooks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(workbooks))) as pool:
+            futures = [pool.submit(_extract_one, w, output_dir, verbose) for w in workbooks]
+            results = [f.result() for f in futures]
+
+    paths_dict = {}
+    records = []
+    for paths, extract_records in results:
+        records.extend(extract_records)
+        for table_name, path in paths.items():
+            paths_dict.setdefault(table_name, []).append(path)
+    return paths_dict, records
+
+
+def available_engines(engines):
+    available = []
+    for engine in engines:
+        reason = spark_unavailable() if engine == 'spark' else None
+        if reason:
+            print(f"   [AVISO] Motor 'spark' ignorado: {reason}.")
+            continue
+        available.append(engine)
+    return available
+
+
+def available_backends(backends):
+    if 'duckdb' in backends and importlib.util.find_spec('duckdb') is None:
+        print("   [AVISO] DuckDB não instalado: backend 'duckdb' ignorado.")
+        return [b for b in backends if b != 'duckdb']
+    return list(backends)
+
+
+def engine_label(backend):
+    """SQLite fica sem rótulo: mantém as medições comparáveis com resultados anteriores"""
+    return None if backend == 'sqlite' else backend
+
+
+def make_transformer(engine):
+    if engine == 'spark':
+        from db.transform import SparkTransformer
+        from db.etl import start_spark
+
+        return SparkTransformer(start_spark())
+    return PandasTransformer()
+
+
+def engine_db_path(scale_dir, engine):
+    """O banco do pandas fica onde o dashboard o procura; os outros ao lado"""
+    if engine == 'pandas':
+        return os.path.join(scale_dir, DASHBOARD_DB)
+    return os.path.join(scale_dir, engine, 'antt.db')
+
+
+def bench_etl(scale, scale_dir, workbooks, engines, repeat, workers, results, verbose):
+    temp_dir = os.path.join(scale_dir, 'temp')
+
+    for _ in range(repeat):
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        start = time.perf_counter()
+        paths_dict, records = extract_all(workbooks, temp_dir, workers, verbose)
+        results.add(scale, 'extract', 'total', time.perf_counter() - start)
+        results.add_records(scale, records)
+
+    for engine in engines:
+        db_path = engine_db_path(scale_dir, engine)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        for _ in range(repeat):
+            if os.path.exists(db_path):
+                os.remove(db_path)
+
+            with quiet(not verbose):
+                transformer = make_transformer(engine)
+                start = time.perf_counter()
+                frames = transformer.run(paths_dict)
+                loader = DataModeler(db_path)
+                loader.run(frames)
+                elapsed = time.perf_counter() - start
+
+                if engine == 'spark':
+                    transformer.spark.stop()
+
+                # Fora do tempo medido: a cópia Parquet é uma etapa opcional (etapa 'parquet')
+                if engine == 'pandas':
+                    loader.parquet_dir = os.path.join(scale_dir, DASHBOARD_PARQUET)
+                    loader.export_parquet()
+
+            results.add(scale, 'etl', 'transform+load', elapsed, engine=engine)
+            results.add_records(scale, transformer.telemetry.records, engine)
+            results.add_records(scale, loader.telemetry.records, engine)
+
+
+def _query_names():
+    from src.database import queries
+
+    return [(name, getattr(queries, name)) for name in sorted(vars(queries)) if name.startswith('QUERY_')]
+
+
+def bench_queries(scale, db_path, repeat, results):
+    """Consultas de queries.py direto no SQLite, sem pool nem cache"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        for name, sql in _query_names():
+            for _ in range(repeat):
+                start = time.perf_counter()
+                df = pd.read_sql_query(sql, conn)
+                results.add(scale, 'query', name, time.perf_counter() - start, len(df))
+    finally:
+        conn.close()
+
+
+def bench_queries_duckdb(scale, parquet_dir, repeat, results):
+    """As mesmas consultas no DuckDB sobre a cópia Parquet, sem cache"""
+    from src.database.backends import DuckDBBackend
+    from src.database.parquet_store import ParquetStore
+
+    backend = DuckDBBackend(ParquetStore(parquet_dir))
+    for name, sql in _query_names():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            df = backend.read_sql(sql, ())
+            results.add(scale, 'query', name, time.perf_counter() - start, len(df), engine='duckdb')
+
+
+def _figure_builders():
+    """Funções de figura das páginas (decoradas com cached_figure)"""
+    from src.pages import page_yards, page_capacity, page_speed
+
+    builders = []
+    for module in (page_yards, page_capacity, page_speed):
+        for name, obj in vars(module).items():
+            if name.endswith('_figure') and hasattr(obj, '__wrapped__'):
+                builders.append((f"{module.__name__.rsplit('.', 1)[-1]}.{name}", obj.__wrapped__))
+    return builders
+
+
+def bench_dashboard(scale, scale_dir, backend, repeat, results):
+    """Caminho real das páginas: repositório (pool + SQL ou cópia Parquet) e montagem das figuras"""
+    import streamlit as st
+    from streamlit import config as st_config
+    from streamlit.logger import set_log_level
+
+    # Fora do `streamlit run` o cache avisa a cada chamada. A config é lida antes,
+    # senão a leitura preguiçosa dela volta o nível para 'info' no meio da medição
+    st_config.get_option('logger.level')
+    set_log_level('error')
+
+    from src.data import loader
+    from src.database import repository
+
+    engine = engine_label(backend)
+
+    cwd = os.getcwd()
+    os.chdir(scale_dir)
+    loader.DATA_BACKEND = backend
+    try:
+        st.cache_resource.clear()
+        st.cache_data.clear()
+
+        first = repository.concessions().iloc[0]
+        variants = {
+            'all': {},
+            'filtered': {'ferrovia': first['ferrovia'], 'ano': int(first['ano'])},
+        }
+
+        for variant, filters in variants.items():
+            for label, func_name, kwargs in REPOSITORY_CALLS:
+                if func_name == 'concessions' and filters:
+                    continue
+                func = getattr(repository, func_name)
+                for _ in range(repeat):
+                    loader._load_data_cached.clear()
+                    loader._load_table_cached.clear()
+                    start = time.perf_counter()
+                    df = func(**kwargs, **filters)
+                    results.add(scale, f"repository[{variant}]", label,
+                                time.perf_counter() - start, len(df), engine)
+                # Acerto no cache: só a cópia do resultado já tipado (src/data/dtypes.py)
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    df = func(**kwargs, **filters)
+                    results.add(scale, f"repository_cached[{variant}]", label,
+                                time.perf_counter() - start, len(df), engine)
+
+            for label, builder in _figure_builders():
+                builder('pt', **filters)  # consultas em cache: mede só pandas + Plotly
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    fig = builder('pt', **filters)
+                    built = time.perf_counter()
+                    fig.to_json()
+                    done = time.perf_counter()
+                    results.add(scale, f"figure[{variant}]", label, built - start, engine=engine)
+                    results.add(scale, f"figure_json[{variant}]", label, done - built, engine=engine)
+
+        bench_network(scale, engine, repeat, results)
+    finally:
+        os.chdir(cwd)
+
+
+def bench_network(scale, engine, repeat, results, queries=50):
+    """Grafo da malha (página Rede): montagem sem cache e lotes de consultas entre pátios sorteados"""
+    import random
+
+    from src.data import loader
+    from src.database import repository
+
+    for _ in range(repeat):
+        repository._rail_network.clear()
+        loader._load_data_cached.clear()
+        loader._load_table_cached.clear()
+        start = time.perf_counter()
+        network = repository.rail_network()
+        results.add(scale, 'network', 'build', time.perf_counter() - start, len(network.edges), engine)
+
+    if network.nodes.empty:
+        return
+
+    rng = random.Random(0)
+    nodes = network.nodes['id_no'].tolist()
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+    batches = {
+        'shortest_route': lambda: [network.shortest_route(a, b) for a, b in pairs],
+        'widest_route': lambda: [network.widest_route(a, b) for a, b in pairs],
+        'reachable[12h]': lambda: [network.reachable([a], max_time=12 * 60) for a, _ in pairs],
+    }
+    for name, batch in batches.items():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            batch()
+            results.add(scale, 'network', f"{name}[x{queries}]", time.perf_counter() - start, engine=engine)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmarks do ETL e do dashboard")
+    parser.add_argument('--scales', type=int, nargs='+', choices=sorted(SCALES), default=[1, 10],
+                        help="Multiplicadores de linhas sobre a planilha real (padrão: 1 10)")
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=ENGINES,
+                        help="Motores de transformação medidos (spark é ignorado sem PySpark ou Java)")
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS,
+                        help="Backends do dashboard medidos (duckdb é ignorado se não instalado)")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições de cada medição (padrão: 3)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Processos da extração, como no etl.py")
+    parser.add_argument('--output', help="Arquivo JSON de saída (padrão: benchmarks/results/<data>.json)")
+    parser.add_argument('--skip-etl', action='store_true',
+                        help="Reaproveita o banco já gerado em benchmarks/work e mede só as consultas")
+    parser.add_argument('--verbose', action='store_true', help="Mostra as mensagens do ETL")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    engines = available_engines(args.engines)
+    backends = available_backends(args.backends)
+    results = Results()
+
+    created_at = datetime.now(timezone.utc)
+    output = args.output or os.path.join(
+        RESULTS_DIR, created_at.strftime('%Y%m%dT%H%M%SZ') + '.json'
+    )
+
+    for scale in args.scales:
+        ferrovias, anos, replicas = scale_plan(scale)
+        scale_dir = os.path.join(WORK_DIR, f"x{scale}")
+        print(f"--- ESCALA {scale}x: {ferrovias} ferrovias x {anos} anos, {replicas} réplica(s) ---")
+
+        workbooks = generate_workbooks(
+            os.path.join(scale_dir, 'workbooks'), ferrovias, anos, replicas
+        )
+
+        if not args.skip_etl:
+            print("   [BENCH] ETL...")
+            bench_etl(scale, scale_dir, workbooks, engines, args.repeat,
+                      args.workers, results, args.verbose)
+
+        db_path = engine_db_path(scale_dir, 'pandas')
+        if not os.path.exists(db_path):
+            print(f"   [AVISO] Banco ausente em '{db_path}': rode sem --skip-etl.")
+            continue
+
+        parquet_dir = os.path.join(scale_dir, DASHBOARD_PARQUET)
+        scale_backends = backends
+        if not os.path.isdir(parquet_dir):
+            print(f"   [AVISO] Cópia Parquet ausente em '{parquet_dir}': só o backend 'sqlite'.")
+            scale_backends = [b for b in backends if b == 'sqlite']
+
+        print("   [BENCH] Consultas...")
+        bench_queries(scale, db_path, args.repeat, results)
+        if 'duckdb' in scale_backends:
+            bench_queries_duckdb(scale, parquet_dir, args.repeat, results)
+
+        for backend in scale_backends:
+            print(f"   [BENCH] Dashboard (repositório e figuras) com '{backend}'...")
+            bench_dashboard(scale, scale_dir, backend, args.repeat, results)
+
+    report = {
+        'created_at': created_at.isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'scales': args.scales,
+        'engines': engines,
+        'backends': backends,
+        'repeat': args.repeat,
+        'workers': args.workers,
+        'results': results.to_list(),
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"--- {len(report['results'])} medições gravadas em '{output}' ---")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Business rules shared by the ETL and the dashboard.
+
+The ETL (db/summaries.py) classifies sectors and efficiency into the summary
+tables; the dashboard reads them and checks their version. Both import this
+module, so it depends on neither side.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Version of the summary tables built by the ETL (db/summaries.py).
+# Bump when a summary definition changes so the next ETL run rebuilds them.
+SUMMARY_VERSION = 2
+
+# Sector classification keywords (language-agnostic)
+SECTOR_KEYWORDS = {
+    'Mining & Steel': [
+        'minério', 'ferro', 'aço', 'bauxita', 'magnetita', 'zinco',
+        'cobre', 'siderúrgicos', 'carvão', 'coque', 'gusa', 'sucata',
+        'escória', 'enxofre'
+    ],
+    'Agriculture & Forestry': [
+        'soja', 'milho', 'açúcar', 'grãos', 'trigo', 'celulose', 'madeira'
+    ],
+    'Civil Construction': [
+        'cimento', 'areia', 'brita', 'calcário', 'construção'
+    ],
+    'General Cargo / Containers': [
+        'contêiner'
+    ]
+}
+
+DEFAULT_SECTOR = 'Others'
+
+# Efficiency classification thresholds
+EFFICIENCY_THRESHOLDS = {
+    'high': 80,      # >= 80%
+    'medium': 50,    # 50-80%
+    'critical': 0    # < 50%
+}
+
+# Efficiency status (internal keys - will be translated)
+EFFICIENCY_STATUS = {
+    'high': "High Efficiency (80-100%)",
+    'medium': "Attention Required (50-80%)",
+    'critical': "Critical Bottleneck (<50%)"
+}
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents, so 'Minério' and 'minerio' compare equal."""
+    nfkd = unicodedata.normalize('NFKD', text)
+    return "".join(c for c in nfkd if not unicodedata.combining(c)).lower()
+
+
+def _compile_sector_pattern(sector_keywords: dict, normalize) -> re.Pattern:
+    """
+    Build one regex for all sectors: a named group per sector inside a lookahead,
+    so every position is tested and overlapping keywords are still found.
+    Keywords match anywhere in the name, as plain substrings, after normalize.
+    """
+    groups = []
+    for i, keywords in enumerate(sector_keywords.values()):
+        alternatives = "|".join(re.escape(normalize(k)) for k in keywords)
+        groups.append(f"(?P<s{i}>{alternatives})")
+    return re.compile(f"(?=(?:{'|'.join(groups)}))")
+
+
+_SECTORS = list(SECTOR_KEYWORDS)
+_SECTOR_PATTERN = _compile_sector_pattern(SECTOR_KEYWORDS, str.lower)
+_FOLDED_SECTOR_PATTERN = _compile_sector_pattern(SECTOR_KEYWORDS, _fold)
+
+
+def _first_sector(pattern: re.Pattern, text: str):
+    """Index of the first sector (in SECTOR_KEYWORDS order) with a keyword in text."""
+    best = None
+    for match in pattern.finditer(text):
+        index = int(match.lastgroup[1:])
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    return best
+
+
+@lru_cache(maxsize=4096)
+def classify_sector(commodity_name: str) -> str:
+    """
+    Classify a commodity into a business sector (memoized).
+
+    Keywords are matched as substrings of the lowercased name, as always.
+    Only when none is found, the accent-folded name is tried ('Minerio'
+    matches 'minério'); folding first would let 'aco' (aço) claim
+    'Cimento acondicionado'.
+
+    Args:
+        commodity_name: Name of the commodity
+
+    Returns:
+        Sector name
+    """
+    best = _first_sector(_SECTOR_PATTERN, commodity_name.lower())
+    if best is None:
+        best = _first_sector(_FOLDED_SECTOR_PATTERN, _fold(commodity_name))
+
+    return _SECTORS[best] if best is not None else DEFAULT_SECTOR
+
+
+def classify_sectors(commodity_names: pd.Series) -> pd.Series:
+    """
+    Classify a whole Series of commodity names at once.
+    Each distinct name is classified a single time.
+
+    Args:
+        commodity_names: Series of commodity names
+
+    Returns:
+        Series of sector names aligned with the input
+    """
+    codes, uniques = pd.factorize(commodity_names)
+    # Missing names get code -1, which lands on the trailing default sector
+    labels = np.array([classify_sector(str(name)) for name in uniques] + [DEFAULT_SECTOR], dtype=object)
+    return pd.Series(labels[codes], index=commodity_names.index, name=commodity_names.name)
+
+
+def classify_efficiency(efficiency_pct: float) -> str:
+    """
+    Classify operational efficiency into status categories.
+
+    Args:
+        efficiency_pct: Efficiency percentage (0-100)
+
+    Returns:
+        Status label
+    """
+    if efficiency_pct >= EFFICIENCY_THRESHOLDS['high']:
+        return EFFICIENCY_STATUS['high']
+    elif efficiency_pct >= EFFICIENCY_THRESHOLDS['medium']:
+        return EFFICIENCY_STATUS['medium']
+    else:
+        return EFFICIENCY_STATUS['critical']
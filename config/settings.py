@@ -6,6 +6,49 @@ import os
 # Database configuration
 DB_PATH = os.path.join('db', 'data', 'antt.db')
 
+# Read-only connection pool (src/database/connection.py)
+DB_POOL_SIZE = 4                       # concurrent connections per server process
+DB_MMAP_SIZE = 256 * 1024 * 1024       # bytes memory-mapped per connection
+# Open antt.db with immutable=1 (no locking). Only when the ETL publishes by
+# atomic swap alone: incremental runs, the manifest and the telemetry write to
+# the live file, which immutable readers may then read wrong or as corrupt
+DB_IMMUTABLE = False
+
+# Columnar copy published by the ETL with --parquet (db/parquet_store.py)
+PARQUET_STORE_DIR = os.path.join('db', 'data', 'parquet')
+
+# Data backend of src/data/loader.py (src/database/backends.py):
+#   'sqlite'  - every read on antt.db
+#   'parquet' - single-table scans from the Parquet copy (pyarrow), SQL on SQLite
+#   'duckdb'  - scans from the Parquet copy, SQL on DuckDB over it (pip install duckdb)
+# Until the ETL has published the Parquet copy, every read falls back to SQLite.
+DATA_BACKEND = 'sqlite'
+DUCKDB_THREADS = None                  # None: one per core
+DUCKDB_IN_MEMORY = True                # load the copy into DuckDB; False: query the files
+
+# Query cache (src/data/loader.py); entries are also keyed on the data version
+CACHE_TTL_SECONDS = 60 * 60
+CACHE_MAX_ENTRIES = 256
+
+# Rendered figures shared across sessions (src/data/figure_cache.py)
+FIGURE_CACHE_MAX_ENTRIES = 128
+
+# Yard box plot (src/utils/boxplot.py): up to BOX_PLOT_WEBGL_POINTS yards Plotly
+# draws the boxes with every point; above it the boxes are computed here and the
+# points go in a WebGL trace, cut to the outliers plus a stratified sample once
+# there are more than BOX_PLOT_MAX_POINTS
+BOX_PLOT_WEBGL_POINTS = 2000
+BOX_PLOT_MAX_POINTS = 5000
+
+# Preload every page's queries and figures in a background thread once the
+# first page of a new server process has rendered (src/data/warmup.py)
+WARMUP_ON_START = True
+
+# Opt-in render/query profiling (src/utils/profiling.py): set the env var to
+# profile every session, or use the sidebar toggle for the current one
+PROFILE_ENV_VAR = 'ANTT_PROFILE'
+PROFILE_LOG_PATH = os.path.join('logs', 'profile.jsonl')
+
 # Page configuration
 PAGE_CONFIG = {
     "page_title": "ANTT Dashboard - Network Declaration",
@@ -13,24 +56,6 @@ PAGE_CONFIG = {
     "layout": "wide"
 }
 
-# Sector classification keywords (language-agnostic)
-SECTOR_KEYWORDS = {
-    'Mining & Steel': [
-        'minério', 'ferro', 'aço', 'bauxita', 'magnetita', 'zinco', 
-        'cobre', 'siderúrgicos', 'carvão', 'coque', 'gusa', 'sucata', 
-        'escória', 'enxofre'
-    ],
-    'Agriculture & Forestry': [
-        'soja', 'milho', 'açúcar', 'grãos', 'trigo', 'celulose', 'madeira'
-    ],
-    'Civil Construction': [
-        'cimento', 'areia', 'brita', 'calcário', 'construção'
-    ],
-    'General Cargo / Containers': [
-        'contêiner'
-    ]
-}
-
 # Color mapping for sectors
 SECTOR_COLORS = {
     'Mining & Steel': '#2E86C1',
@@ -40,20 +65,6 @@ SECTOR_COLORS = {
     'Others': '#95A5A6'
 }
 
-# Efficiency classification thresholds
-EFFICIENCY_THRESHOLDS = {
-    'high': 80,      # >= 80%
-    'medium': 50,    # 50-80%
-    'critical': 0    # < 50%
-}
-
-# Efficiency status (internal keys - will be translated)
-EFFICIENCY_STATUS = {
-    'high': "High Efficiency (80-100%)",
-    'medium': "Attention Required (50-80%)",
-    'critical': "Critical Bottleneck (<50%)"
-}
-
 # Efficiency colors
 EFFICIENCY_COLORS = {
     "High Efficiency (80-100%)": "#27AE60",
@@ -2,22 +2,42 @@
 Internationalization (i18n) translations for the dashboard.
 Supports PT-BR and EN languages.
 """
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
 
 TRANSLATIONS = {
     'pt': {
         # App header
         'app_title': 'Monitoramento da Malha Ferroviária (ANTT)',
         'app_subtitle': 'Este painel apresenta indicadores operacionais e físicos da Declaração de Rede 2025.',
+        'summaries_outdated': 'As tabelas de resumo do banco estão ausentes ou desatualizadas. Execute o ETL novamente (python -m db.etl).',
         
         # Navigation
         'nav_header': 'Navegação',
         'nav_select': 'Selecione o Indicador:',
         'nav_language': 'Idioma / Language',
+        'nav_filters': 'Filtros',
+        'filter_railway': 'Ferrovia',
+        'filter_year': 'Ano',
+        'filter_all': 'Todas',
+        'nav_profiling': 'Medir desempenho',
+        
+        # Profiling panel
+        'debug_title': 'Desempenho desta execução',
+        'debug_total': 'Tempo total',
+        'debug_queries': 'Consultas',
+        'debug_query_time': 'Tempo em consultas',
+        'debug_caches': 'Caches (acertos / faltas)',
+        'debug_sections': 'Seções',
+        'debug_log_note': 'Cada execução também é gravada em {path} (uma linha JSON por execução).',
         
         # Analysis options
         'analysis_yards': '1. Licenciamento de pátios por situação operacional',
         'analysis_capacity': '2. Capacidade de Terminais por Mercadoria',
         'analysis_speed': '3. Relação Carga x Velocidade',
+        'analysis_network': '4. Rede Ferroviária',
         
         # Common
         'overview': 'Visão Geral',
@@ -36,6 +56,7 @@ TRANSLATIONS = {
         'yards_box_title': 'Dispersão de Tempo de Licenciamento por Situação',
         'yards_box_xlabel': 'Em Operação?',
         'yards_box_ylabel': 'Tempo (min)',
+        'yards_box_sampled': 'Exibindo {shown} de {total} pátios (amostra estratificada; os atípicos têm prioridade)',
         'yards_corridor_title': 'Identificando Corredores Congestionados',
         'yards_corridor_desc': 'Esta análise agrupa os pátios pela sua **Linha de Referência**. Médias altas indicam problemas sistêmicos no corredor logístico, e não apenas em um pátio isolado.',
         'yards_worst_corridor': 'O corredor **{name}** tem a maior média de espera ({time:.1f} min).',
@@ -92,6 +113,64 @@ TRANSLATIONS = {
         'speed_sort_best': 'Melhores (Eficientes)',
         'speed_top_corridors': 'Top {n} Corredores - {mode}',
         'speed_no_data': 'Sem dados suficientes de trechos físicos para calcular a correlação.',
+        'track_title': 'Características da Via por Quilômetro',
+        'track_desc': 'Velocidades, carga por eixo e perfil do trilho em vigor em um ponto da linha.',
+        'track_line': 'Linha:',
+        'track_km': 'Km:',
+        'track_attribute': 'Atributo',
+        'track_value': 'Valor',
+        'track_from': 'Do km',
+        'track_to': 'Ao km',
+        'track_no_data': 'Nenhuma faixa cadastrada neste km.',
+        
+        # Track attributes (trechos_segmentos)
+        'attr_perfil_trilho': 'Perfil do trilho',
+        'attr_fixacao': 'Fixação',
+        'attr_dormente': 'Dormente',
+        'attr_taxa_de_dormentacao': 'Taxa de dormentação (un/km)',
+        'attr_gabarito_horizontal': 'Gabarito horizontal (m)',
+        'attr_gabarito_vertical': 'Gabarito vertical (m)',
+        'attr_vma_trem_carregado': 'VMA trem carregado (km/h)',
+        'attr_vma_trem_vazio': 'VMA trem vazio (km/h)',
+        'attr_vma_produto_perigoso': 'VMA produto perigoso (km/h)',
+        'attr_vmc_trem_carregado': 'VMC trem carregado (km/h)',
+        'attr_vmc_trem_vazio': 'VMC trem vazio (km/h)',
+        'attr_vmc_produto_perigoso': 'VMC produto perigoso (km/h)',
+        'attr_carga_max_por_eixo': 'Carga máxima por eixo (t)',
+        
+        # Railway network page
+        'network_title': 'Rede Ferroviária: Rotas e Gargalos',
+        'network_subtitle': 'Pátios ligados pelos segmentos entre pátios, com tempo de percurso e capacidade instalada em cada sentido.',
+        'network_concession': 'Concessão:',
+        'network_route_title': 'Rota entre Pátios',
+        'network_origin': 'Origem:',
+        'network_destination': 'Destino:',
+        'network_criterion': 'Critério:',
+        'network_fastest': 'Menor tempo',
+        'network_widest': 'Maior capacidade no gargalo',
+        'network_time': 'Tempo de percurso',
+        'network_length': 'Extensão',
+        'network_bottleneck': 'Capacidade no gargalo',
+        'network_bottleneck_segment': 'Gargalo da rota: **{segment}** ({capacity:.1f} trens/dia, utilização {utilization:.0%}).',
+        'network_unreachable': 'Não há rota com circulação de {origin} para {destination}.',
+        'network_from': 'De',
+        'network_to': 'Para',
+        'network_direction': 'Sentido',
+        'network_leg_time': 'Tempo (min)',
+        'network_leg_length': 'Extensão (km)',
+        'network_capacity': 'Capacidade (trens/dia)',
+        'network_utilization': 'Utilização (%)',
+        'network_dir_crescente': 'Crescente (km ↑)',
+        'network_dir_decrescente': 'Decrescente (km ↓)',
+        'network_reach_title': 'Alcance a partir de um Terminal',
+        'network_terminal': 'Terminal:',
+        'network_max_hours': 'Tempo máximo de percurso (h):',
+        'network_reach_count': 'Pátios alcançáveis',
+        'network_yard': 'Pátio',
+        'network_code': 'Código',
+        'network_hours': 'Tempo (h)',
+        'network_no_data': 'O grafo da rede não está no banco. Execute o ETL novamente (python -m db.etl).',
+        'network_no_terminals': 'Nenhum terminal desta concessão está ligado a um pátio da rede.',
         
         # Sectors
         'sector_mining': 'Mineração & Siderurgia',
@@ -110,16 +189,32 @@ TRANSLATIONS = {
         # App header
         'app_title': 'Railway Network Monitoring (ANTT)',
         'app_subtitle': 'This dashboard presents operational and physical indicators from the 2025 Network Declaration.',
+        'summaries_outdated': 'The database summary tables are missing or outdated. Please run the ETL again (python -m db.etl).',
         
         # Navigation
         'nav_header': 'Navigation',
         'nav_select': 'Select Indicator:',
         'nav_language': 'Language / Idioma',
+        'nav_filters': 'Filters',
+        'filter_railway': 'Railway',
+        'filter_year': 'Year',
+        'filter_all': 'All',
+        'nav_profiling': 'Measure performance',
+        
+        # Profiling panel
+        'debug_title': 'Performance of this run',
+        'debug_total': 'Total time',
+        'debug_queries': 'Queries',
+        'debug_query_time': 'Time in queries',
+        'debug_caches': 'Caches (hits / misses)',
+        'debug_sections': 'Sections',
+        'debug_log_note': 'Each run is also appended to {path} (one JSON line per run).',
         
         # Analysis options
         'analysis_yards': '1. Yard Licensing by Operational Status',
         'analysis_capacity': '2. Terminal Capacity by Commodity',
         'analysis_speed': '3. Load vs Speed Relationship',
+        'analysis_network': '4. Railway Network',
         
         # Common
         'overview': 'Overview',
@@ -138,6 +233,7 @@ TRANSLATIONS = {
         'yards_box_title': 'Licensing Time Distribution by Status',
         'yards_box_xlabel': 'In Operation?',
         'yards_box_ylabel': 'Time (min)',
+        'yards_box_sampled': 'Showing {shown} of {total} yards (stratified sample; outliers first)',
         'yards_corridor_title': 'Identifying Congested Corridors',
         'yards_corridor_desc': 'This analysis groups yards by their **Reference Line**. High averages indicate systemic problems in the logistics corridor, not just isolated yard issues.',
         'yards_worst_corridor': 'The corridor **{name}** has the highest average wait time ({time:.1f} min).',
@@ -194,6 +290,64 @@ TRANSLATIONS = {
         'speed_sort_best': 'Best (Efficient)',
         'speed_top_corridors': 'Top {n} Corridors - {mode}',
         'speed_no_data': 'Insufficient physical segment data to calculate correlation.',
+        'track_title': 'Track Characteristics by Kilometer',
+        'track_desc': 'Speeds, axle load and rail profile in force at one point of the line.',
+        'track_line': 'Line:',
+        'track_km': 'Km:',
+        'track_attribute': 'Attribute',
+        'track_value': 'Value',
+        'track_from': 'From km',
+        'track_to': 'To km',
+        'track_no_data': 'No range registered at this km.',
+        
+        # Track attributes (trechos_segmentos)
+        'attr_perfil_trilho': 'Rail profile',
+        'attr_fixacao': 'Fastening',
+        'attr_dormente': 'Sleeper',
+        'attr_taxa_de_dormentacao': 'Sleeper density (per km)',
+        'attr_gabarito_horizontal': 'Horizontal clearance (m)',
+        'attr_gabarito_vertical': 'Vertical clearance (m)',
+        'attr_vma_trem_carregado': 'VMA loaded train (km/h)',
+        'attr_vma_trem_vazio': 'VMA empty train (km/h)',
+        'attr_vma_produto_perigoso': 'VMA dangerous goods (km/h)',
+        'attr_vmc_trem_carregado': 'VMC loaded train (km/h)',
+        'attr_vmc_trem_vazio': 'VMC empty train (km/h)',
+        'attr_vmc_produto_perigoso': 'VMC dangerous goods (km/h)',
+        'attr_carga_max_por_eixo': 'Max axle load (t)',
+        
+        # Railway network page
+        'network_title': 'Railway Network: Routes and Bottlenecks',
+        'network_subtitle': 'Yards linked by the yard-to-yard segments, with travel time and installed capacity in each direction.',
+        'network_concession': 'Concession:',
+        'network_route_title': 'Route between Yards',
+        'network_origin': 'Origin:',
+        'network_destination': 'Destination:',
+        'network_criterion': 'Criterion:',
+        'network_fastest': 'Shortest time',
+        'network_widest': 'Highest bottleneck capacity',
+        'network_time': 'Travel time',
+        'network_length': 'Length',
+        'network_bottleneck': 'Bottleneck capacity',
+        'network_bottleneck_segment': 'Route bottleneck: **{segment}** ({capacity:.1f} trains/day, {utilization:.0%} utilization).',
+        'network_unreachable': 'There is no route with traffic from {origin} to {destination}.',
+        'network_from': 'From',
+        'network_to': 'To',
+        'network_direction': 'Direction',
+        'network_leg_time': 'Time (min)',
+        'network_leg_length': 'Length (km)',
+        'network_capacity': 'Capacity (trains/day)',
+        'network_utilization': 'Utilization (%)',
+        'network_dir_crescente': 'Increasing (km ↑)',
+        'network_dir_decrescente': 'Decreasing (km ↓)',
+        'network_reach_title': 'Reach from a Terminal',
+        'network_terminal': 'Terminal:',
+        'network_max_hours': 'Maximum travel time (h):',
+        'network_reach_count': 'Reachable yards',
+        'network_yard': 'Yard',
+        'network_code': 'Code',
+        'network_hours': 'Time (h)',
+        'network_no_data': 'The network graph is not in the database. Please run the ETL again (python -m db.etl).',
+        'network_no_terminals': 'No terminal of this concession is attached to a network yard.',
         
         # Sectors
         'sector_mining': 'Mining & Steel',
@@ -210,6 +364,48 @@ TRANSLATIONS = {
 }
 
 
+# Data labels (as produced by the queries) -> translation key
+SECTOR_KEYS = {
+    'Mining & Steel': 'sector_mining',
+    'Agriculture & Forestry': 'sector_agriculture',
+    'Civil Construction': 'sector_construction',
+    'General Cargo / Containers': 'sector_containers',
+    'Others': 'sector_others'
+}
+
+EFFICIENCY_KEYS = {
+    'High Efficiency (80-100%)': 'efficiency_high',
+    'Attention Required (50-80%)': 'efficiency_medium',
+    'Critical Bottleneck (<50%)': 'efficiency_critical'
+}
+
+
+class _Catalog:
+    """Strings of one language, resolved once: plain dicts from key and from data label."""
+
+    def __init__(self, texts: dict):
+        self.texts = texts
+        self.sectors = {label: texts.get(key, key) for label, key in SECTOR_KEYS.items()}
+        self.efficiency = {label: texts.get(key, key) for label, key in EFFICIENCY_KEYS.items()}
+        self.default_sector = texts.get('sector_others', 'sector_others')
+        self.default_efficiency = texts.get('efficiency_high', 'efficiency_high')
+
+
+_CATALOGS = {lang: _Catalog(texts) for lang, texts in TRANSLATIONS.items()}
+
+
+def _catalog(lang: str) -> _Catalog:
+    return _CATALOGS.get(lang, _CATALOGS['pt'])
+
+
+@lru_cache(maxsize=1024)
+def _format(text: str, kwargs: tuple) -> str:
+    try:
+        return text.format(**dict(kwargs))
+    except KeyError:
+        return text
+
+
 def get_text(key: str, lang: str = 'pt', **kwargs) -> str:
     """
     Get translated text for a given key.
@@ -222,13 +418,15 @@ def get_text(key: str, lang: str = 'pt', **kwargs) -> str:
     Returns:
         Translated and formatted text
     """
-    text = TRANSLATIONS.get(lang, TRANSLATIONS['pt']).get(key, key)
+    text = _catalog(lang).texts.get(key, key)
     
     if kwargs:
+        arguments = tuple(sorted(kwargs.items()))
         try:
-            return text.format(**kwargs)
-        except KeyError:
-            return text
+            return _format(text, arguments)
+        except TypeError:
+            # Unhashable argument: format without the cache
+            return _format.__wrapped__(text, arguments)
     
     return text
 
@@ -244,16 +442,8 @@ def get_sector_name(sector_key: str, lang: str = 'pt') -> str:
     Returns:
         Translated sector name
     """
-    mapping = {
-        'Mining & Steel': 'sector_mining',
-        'Agriculture & Forestry': 'sector_agriculture',
-        'Civil Construction': 'sector_construction',
-        'General Cargo / Containers': 'sector_containers',
-        'Others': 'sector_others'
-    }
-    
-    key = mapping.get(sector_key, 'sector_others')
-    return get_text(key, lang)
+    catalog = _catalog(lang)
+    return catalog.sectors.get(sector_key, catalog.default_sector)
 
 
 def get_efficiency_status(status_key: str, lang: str = 'pt') -> str:
@@ -267,11 +457,81 @@ def get_efficiency_status(status_key: str, lang: str = 'pt') -> str:
     Returns:
         Translated status
     """
-    mapping = {
-        'High Efficiency (80-100%)': 'efficiency_high',
-        'Attention Required (50-80%)': 'efficiency_medium',
-        'Critical Bottleneck (<50%)': 'efficiency_critical'
-    }
+    catalog = _catalog(lang)
+    return catalog.efficiency.get(status_key, catalog.default_efficiency)
+
+
+def _remap(values: pd.Series, labels: dict, default=None) -> pd.Series:
+    """
+    Translate a Series through its categories: one lookup per distinct value,
+    then a take on the integer codes. Values missing from labels become
+    default (or stay as they are when default is None); NaN stays NaN.
+    """
+    categorical = values.astype('category')
+    translated = [
+        labels.get(value, value if default is None else default)
+        for value in categorical.cat.categories
+    ]
+
+    # Several values may share a label ('Others' and unknown sectors)
+    names = pd.Index(pd.unique(pd.Series(translated, dtype=object)))
+    positions = names.get_indexer(translated)
+    codes = categorical.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, positions[codes] if len(positions) else codes, -1)
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=names),
+        index=values.index,
+        name=values.name
+    )
+
+
+def translate_sectors(values: pd.Series, lang: str = 'pt') -> pd.Series:
+    """
+    Vectorized get_sector_name.
+    
+    Args:
+        values: Series of internal sector keys
+        lang: Language code
+        
+    Returns:
+        Categorical Series of translated sector names
+    """
+    catalog = _catalog(lang)
+    return _remap(values, catalog.sectors, catalog.default_sector)
+
+
+def translate_efficiency(values: pd.Series, lang: str = 'pt') -> pd.Series:
+    """
+    Vectorized get_efficiency_status.
+    
+    Args:
+        values: Series of internal status keys
+        lang: Language code
+        
+    Returns:
+        Categorical Series of translated statuses
+    """
+    catalog = _catalog(lang)
+    return _remap(values, catalog.efficiency, catalog.default_efficiency)
+
+
+def translate_keys(values: pd.Series, lang: str = 'pt', prefix: str = '') -> pd.Series:
+    """
+    Vectorized get_text(prefix + value) for data values that name a key.
     
-    key = mapping.get(status_key, 'efficiency_high')
-    return get_text(key, lang)
\ No newline at end of file
+    Args:
+        values: Series of key suffixes
+        lang: Language code
+        prefix: Common key prefix (e.g. 'attr_')
+        
+    Returns:
+        Categorical Series of translated texts (values without a key are kept)
+    """
+    texts = _catalog(lang).texts
+    labels = {
+        value: texts[prefix + str(value)]
+        for value in values.dropna().unique()
+        if prefix + str(value) in texts
+    }
+    return _remap(values, labels)
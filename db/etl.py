@@ -1,46 +1,315 @@
+import argparse
+import glob
+import importlib.util
 import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-from pyspark.sql import SparkSession
+# O ETL é um pacote (db.*) que importa as regras de config/: roda da raiz do projeto
+if __name__ == '__main__' and not __package__:
+    raise SystemExit("Execute o ETL a partir da raiz do projeto: python -m db.etl")
 
-from extract import ExcelExtractor
-from transform import SparkTransformer
-from load import DataModeler
+from db.extract import ExcelExtractor
+from db.transform_pandas import PandasTransformer
+from db.load import DataModeler
+from db.manifest import RunManifest, file_hash
+from db.telemetry import StageTelemetry, new_run_id
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-EXCEL_FILE = os.path.join(BASE_DIR, 'data', 'DR2025-MRS.xlsx')
-TEMP_DIR = os.path.join(BASE_DIR, 'data', 'temp')
-DB_PATH = os.path.join(BASE_DIR, 'data', 'antt.db')
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+DEFAULT_INPUT = os.path.join(DATA_DIR, 'DR*.xlsx')
+TEMP_DIR = os.path.join(DATA_DIR, 'temp')
+DB_PATH = os.path.join(DATA_DIR, 'antt.db')
+REPORT_PATH = os.path.join(DATA_DIR, 'etl_report.json')
+PARQUET_DIR = os.path.join(DATA_DIR, 'parquet')
+
+ENGINES = ['auto', 'pandas', 'spark']
+
+# Acima deste volume de entrada o custo de subir a JVM compensa
+SPARK_MIN_INPUT_BYTES = 256 * 1024 * 1024
 
 
 def start_spark():
+    from pyspark.sql import SparkSession
+
     return SparkSession.builder \
         .appName("ETL_Ferrovias_OO") \
         .master("local[*]") \
         .config("spark.sql.execution.arrow.pyspark.enabled", "true") \
         .getOrCreate()
 
+def resolve_workbooks(input_arg):
+    """Aceita um arquivo, um diretório ou um glob de Declarações de Rede"""
+    if os.path.isdir(input_arg):
+        pattern = os.path.join(input_arg, '*.xlsx')
+    else:
+        pattern = input_arg
+
+    workbooks = sorted(glob.glob(pattern))
+    return [w for w in workbooks if not os.path.basename(w).startswith('~$')]
+
+def extract_workbook(excel_file, output_format, only):
+    """Tarefa de um worker: extrai as abas pedidas de uma única planilha"""
+    stem = os.path.splitext(os.path.basename(excel_file))[0]
+    extractor = ExcelExtractor(excel_file, os.path.join(TEMP_DIR, stem), output_format)
+    paths = extractor.run(only=only)
+    # A telemetria volta junto: cada worker mede o próprio pico de memória
+    return excel_file, paths, extractor.telemetry.records
+
+def extract_all(jobs, output_format, workers):
+    """Extrai as planilhas em paralelo, uma por processo"""
+    if len(jobs) == 1 or workers == 1:
+        return [extract_workbook(excel_file, output_format, only) for excel_file, only in jobs]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [
+            pool.submit(extract_workbook, excel_file, output_format, only)
+            for excel_file, only in jobs
+        ]
+        return [future.result() for future in futures]
+
+def spark_unavailable():
+    """Motivo pelo qual o Spark não pode subir neste ambiente (None se pode)"""
+    if importlib.util.find_spec('pyspark') is None:
+        return "pyspark não está instalado"
+    if shutil.which('java') is None and not os.environ.get('JAVA_HOME'):
+        # A imagem Docker padrão não traz o JRE (INSTALL_JRE=false)
+        return "Java não encontrado (nem 'java' no PATH nem JAVA_HOME)"
+    return None
+
+def choose_engine(engine, paths_dict):
+    """Resolve o motor 'auto' a partir do tamanho total dos arquivos extraídos"""
+    if engine != 'auto':
+        return engine
+
+    input_bytes = sum(
+        os.path.getsize(path) for paths in paths_dict.values() for path in paths
+    )
+    if input_bytes < SPARK_MIN_INPUT_BYTES:
+        return 'pandas'
+
+    reason = spark_unavailable()
+    if reason:
+        print(f"   [AVISO] Entrada grande para o pandas, mas o Spark não pode subir: {reason}. Usando 'pandas'.")
+        return 'pandas'
+    return 'spark'
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Pipeline ETL da Declaração de Rede (ANTT)")
+    parser.add_argument(
+        '--input',
+        default=DEFAULT_INPUT,
+        help="Planilha, diretório ou glob de planilhas (padrão: data/DR*.xlsx)"
+    )
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default='auto',
+        help="Motor de transformação (padrão: auto, escolhido pelo volume de entrada)"
+    )
+    parser.add_argument(
+        '--extract-format',
+        choices=ExcelExtractor.OUTPUT_FORMATS,
+        default='parquet',
+        help="Formato intermediário da extração (padrão: parquet, leitura única da planilha)"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processos usados na extração, uma planilha por processo"
+    )
+    parser.add_argument(
+        '--full-refresh',
+        action='store_true',
+        help="Ignora o manifesto e recarrega todas as abas do zero"
+    )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help="Carga completa em massa: monta o banco em arquivo separado e troca de forma atômica"
+    )
+    parser.add_argument(
+        '--parquet',
+        action='store_true',
+        help="Publica também a cópia Parquet particionada lida pelo dashboard (data/parquet/)"
+    )
+    parser.add_argument(
+        '--report',
+        default=REPORT_PATH,
+        help="Relatório JSON da execução: tempo, linhas e memória por etapa (padrão: data/etl_report.json)"
+    )
+    return parser.parse_args()
+
+def changed_sources(manifest, workbook_name, sheet_hashes):
+    """Abas cujo hash mudou ou cujas tabelas de saída não estão registradas no manifesto"""
+    changed = set()
+    for source, tables in DataModeler.SOURCE_TABLES.items():
+        if source not in sheet_hashes:
+            continue
+        sheet_current = manifest.is_current('sheet', f"{workbook_name}:{source}", sheet_hashes[source])
+        if not sheet_current or not manifest.has_tables(tables):
+            changed.add(source)
+    return changed
+
+def parquet_target(args):
+    """Uma vez publicada, a cópia Parquet é mantida em dia mesmo sem --parquet"""
+    if args.parquet or os.path.isdir(PARQUET_DIR):
+        return PARQUET_DIR
+    return None
+
+def save_telemetry(telemetry, run_id, args, started, **info):
+    """Grava as etapas medidas em etl_runs e no relatório JSON"""
+    if not telemetry.records:
+        return
+
+    if os.path.exists(DB_PATH):
+        telemetry.save(DB_PATH, run_id)
+
+    telemetry.write_report(
+        args.report,
+        run_id,
+        input=args.input,
+        full_refresh=args.full_refresh,
+        bulk=args.bulk,
+        wall_s=round(time.perf_counter() - started, 4),
+        **info
+    )
+    print(f"   [TELEMETRIA] {len(telemetry.records)} etapas registradas (execução {run_id}).")
+
 def main():
+    args = parse_args()
+    run_id = new_run_id()
+    started = time.perf_counter()
+    telemetry = StageTelemetry()
+
     print("--- INICIANDO PIPELINE DE DADOS (POO) ---")
 
-    extractor = ExcelExtractor(EXCEL_FILE, TEMP_DIR)
-    csv_paths = extractor.run()
+    # Falha antes da extração, e não no meio da carga com erro do gateway Java
+    if args.engine == 'spark':
+        reason = spark_unavailable()
+        if reason:
+            raise SystemExit(f"   [ERRO] --engine spark indisponível: {reason}. Use --engine pandas ou auto.")
+
+    workbooks = resolve_workbooks(args.input)
+    if not workbooks:
+        print(f"Nenhuma planilha encontrada em '{args.input}'. Pipeline abortado.")
+        return
+
+    if args.bulk:
+        args.full_refresh = True
+
+    if not args.full_refresh and not DataModeler.schema_is_current(DB_PATH):
+        print("   [SCHEMA] Banco ausente ou com DDL antiga: carga completa.")
+        args.full_refresh = True
+
+    manifest = RunManifest(DB_PATH)
+    if args.full_refresh:
+        manifest.clear()
+
+    all_tables = [t for tables in DataModeler.SOURCE_TABLES.values() for t in tables]
+    tables_ok = manifest.has_tables(all_tables)
+
+    jobs = []
+    workbook_hashes = {}
+    sheet_hashes = {}
+    for excel_file in workbooks:
+        workbook_name = os.path.basename(excel_file)
+        workbook_hashes[workbook_name] = file_hash(excel_file)
 
-    if not csv_paths:
+        if tables_ok and manifest.is_current('workbook', workbook_name, workbook_hashes[workbook_name]):
+            print(f"   [MANIFESTO] '{workbook_name}' não mudou desde a última carga.")
+            continue
+
+        sheet_hashes[workbook_name] = ExcelExtractor(excel_file, TEMP_DIR).sheet_hashes()
+        sources = changed_sources(manifest, workbook_name, sheet_hashes[workbook_name])
+
+        if not sources:
+            print(f"   [MANIFESTO] '{workbook_name}': nenhuma aba alterada.")
+            manifest.record('workbook', workbook_name, workbook_hashes[workbook_name])
+            continue
+
+        print(f"   [MANIFESTO] '{workbook_name}': abas alteradas: {', '.join(sorted(sources))}.")
+        jobs.append((excel_file, sources))
+
+    if not jobs:
+        if not DataModeler.summaries_are_current(DB_PATH):
+            print("   [RESUMOS] Definições dos resumos mudaram: remontando.")
+            loader = DataModeler(DB_PATH, incremental=True, parquet_dir=parquet_target(args))
+            loader.refresh_summaries()
+            telemetry.extend(loader.telemetry.records)
+            save_telemetry(telemetry, run_id, args, started)
+        elif args.parquet and not os.path.isdir(PARQUET_DIR):
+            print("   [PARQUET] Dados sem mudança: publicando só a cópia colunar.")
+            loader = DataModeler(DB_PATH, parquet_dir=PARQUET_DIR)
+            loader.export_parquet()
+            telemetry.extend(loader.telemetry.records)
+            save_telemetry(telemetry, run_id, args, started)
+        else:
+            print("   Nada a fazer.")
+        print("--- PIPELINE FINALIZADO ---")
+        return
+
+    print(f"   [EXTRACT] {len(jobs)} planilha(s), até {args.workers} processo(s).")
+    extracted = extract_all(jobs, args.extract_format, args.workers)
+
+    # Lote único por tabela: {'patios': [arquivo_da_planilha_1, arquivo_da_planilha_2, ...]}
+    extracted_paths = {}
+    for _, paths, records in extracted:
+        telemetry.extend(records)
+        for table_name, path in paths.items():
+            extracted_paths.setdefault(table_name, []).append(path)
+
+    if not extracted_paths:
         print("Pipeline abortado.")
         return
 
-    spark = start_spark()
+    engine = choose_engine(args.engine, extracted_paths)
+    print(f"   [ENGINE] Transformação com '{engine}'.")
+
+    spark = None
+    transformer = None
+    loader = None
 
     try:
-        transformer = SparkTransformer(spark)
-        dfs_clean = transformer.run(csv_paths)
+        if engine == 'spark':
+            from db.transform import SparkTransformer
 
-        loader = DataModeler(DB_PATH)
+            spark = start_spark()
+            transformer = SparkTransformer(spark)
+        else:
+            transformer = PandasTransformer()
+
+        dfs_clean = transformer.run(extracted_paths)
+
+        loader = DataModeler(
+            DB_PATH,
+            incremental=not args.full_refresh,
+            bulk=args.bulk,
+            parquet_dir=parquet_target(args)
+        )
         loader.run(dfs_clean)
 
+        for excel_file, paths, _ in extracted:
+            workbook_name = os.path.basename(excel_file)
+            for source in paths:
+                manifest.record('sheet', f"{workbook_name}:{source}", sheet_hashes[workbook_name][source])
+            manifest.record('workbook', workbook_name, workbook_hashes[workbook_name])
+        for table, (content_hash, row_count) in loader.table_hashes.items():
+            manifest.record('table', table, content_hash, row_count)
+
     finally:
-        spark.stop()
+        if spark is not None:
+            spark.stop()
+
+        # Também em caso de falha: as etapas concluídas mostram onde parou
+        for stage_owner in (transformer, loader):
+            if stage_owner is not None:
+                telemetry.extend(stage_owner.telemetry.records)
+        save_telemetry(telemetry, run_id, args, started, engine=engine)
+
         print("--- PIPELINE FINALIZADO ---")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,18 +1,135 @@
 import pandas as pd
 import os
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from db.telemetry import StageTelemetry
 
 class ExcelExtractor:
 
-    def __init__(self, excel_file_path, output_folder):
+    OUTPUT_FORMATS = ['parquet', 'csv']
+
+    def __init__(self, excel_file_path, output_folder, output_format='parquet'):
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Formato de saída inválido: {output_format}")
+
         self.excel_file = excel_file_path
         self.output_folder = output_folder
+        self.output_format = output_format
         self.csv_paths = {}
+        self.telemetry = StageTelemetry()
 
+        # Schema fixo de cada aba (nomes já achatados): a tipagem não depende das células lidas
         self.tabs_config = {
-            'Pátios': {'filename': 'patios.csv', 'header': 0},
-            'Terminais': {'filename': 'terminais.csv', 'header': [0, 1]},
-            'Entre Pátios': {'filename': 'entre_patios.csv', 'header': [0, 1, 2]},
-            'Entre Trechos': {'filename': 'trechos_fisicos.csv', 'header': [0, 1]} 
+            'Pátios': {
+                'filename': 'patios.csv', 'header': 0,
+                'schema': pa.schema([
+                    ('Ferrovia', pa.string()),
+                    ('Ano', pa.int64()),
+                    ('Pátio', pa.string()),
+                    ('Código', pa.string()),
+                    ('Em Operação', pa.string()),
+                    ('Auto Assistido', pa.string()),
+                    ('Comprimento Útil de Desvio (m)', pa.float64()),
+                    ('Tempo Médio Licenc. (min.)', pa.float64()),
+                    ('Linhas de Referência', pa.string()),
+                ])
+            },
+            'Terminais': {
+                'filename': 'terminais.csv', 'header': [0, 1],
+                'schema': pa.schema([
+                    ('Ferrovia', pa.string()),
+                    ('Ano', pa.int64()),
+                    ('Pátio de Referência', pa.string()),
+                    ('Terminal', pa.string()),
+                    ('Mercadoria', pa.string()),
+                    ('Capacidade_Vg/dia', pa.float64()),
+                    ('Capacidade_TU/dia', pa.float64()),
+                    ('Nº Horas Func. Dia', pa.float64()),
+                    ('Tempo Médio de Carga_Vg/h', pa.float64()),
+                    ('Tempo Médio de Carga_TU/h', pa.float64()),
+                    ('Tempo Médio de Descarga_Vg/h', pa.float64()),
+                    ('Tempo Médio de Descarga_TU/h', pa.float64()),
+                ])
+            },
+            'Entre Pátios': {
+                'filename': 'entre_patios.csv', 'header': [0, 1, 2],
+                'schema': pa.schema([
+                    ('Ferrovia', pa.string()),
+                    ('Ano', pa.int64()),
+                    ('Linha', pa.string()),
+                    ('Segmento_Pátio A', pa.string()),
+                    ('Segmento_Pátio B', pa.string()),
+                    ('Extensão (km)', pa.float64()),
+                    ('Bitola', pa.string()),
+                    ('Raio Mín. de Curva (m)', pa.float64()),
+                    ('Rampa Máxima (%)_Crescente', pa.float64()),
+                    ('Rampa Máxima (%)_Decrescente', pa.float64()),
+                    ('Nº de Linhas', pa.string()),
+                    ('Sentido do Tráfego', pa.string()),
+                    ('Controle de Circulação', pa.string()),
+                    ('Nº Dias Operacionais', pa.float64()),
+                    ('Sist. de Sinalização', pa.string()),
+                    ('Potência (HP)', pa.float64()),
+                    ('Permite Circ. de Produto Perigoso', pa.string()),
+                    ('Equipamento Embarcado Loco.', pa.string()),
+                    ('Tempo de Percurso (min)_Crescente', pa.float64()),
+                    ('Tempo de Percurso (min)_Decrescente', pa.float64()),
+                    ('Justificativa de Tráfego', pa.string()),
+                    ('Tempo de Lic. (min)', pa.float64()),
+                    ('Sessões de Bloqueio', pa.float64()),
+                    ('Índices de Eficiência Considerado (%)_K1', pa.float64()),
+                    ('Índices de Eficiência Considerado (%)_K2', pa.float64()),
+                    ('Índices de Eficiência Considerado (%)_K3', pa.float64()),
+                    ('Índices de Eficiência Considerado (%)_K', pa.float64()),
+                    ('Capacidade_Instalada Calculada_Crescente', pa.float64()),
+                    ('Capacidade_Instalada Calculada_Decrescente', pa.float64()),
+                    ('Capacidade_Vinculada Considerada_Crescente', pa.float64()),
+                    ('Capacidade_Vinculada Considerada_Decrescente', pa.float64()),
+                    ('Capacidade_Ociosa Considerada_Crescente', pa.float64()),
+                    ('Capacidade_Ociosa Considerada_Decrescente', pa.float64()),
+                ])
+            },
+            'Entre Trechos': {
+                'filename': 'trechos_fisicos.csv', 'header': [0, 1],
+                'schema': pa.schema([
+                    ('Ferrovia', pa.string()),
+                    ('Ano', pa.int64()),
+                    ('Linha', pa.string()),
+                    ('Perfil Trilho_Perfil', pa.string()),
+                    ('Perfil Trilho_Faixa km', pa.string()),
+                    ('Fixação_Tipo', pa.string()),
+                    ('Fixação_Faixa km', pa.string()),
+                    ('Dormente_Tipo', pa.string()),
+                    ('Dormente_Faixa km', pa.string()),
+                    ('Taxa de Dormentação_Taxa (dorm/km)', pa.float64()),
+                    ('Taxa de Dormentação_Faixa km', pa.string()),
+                    ('Gabarito Horizontal_Gabarito (m)', pa.float64()),
+                    ('Gabarito Horizontal_Faixa km', pa.string()),
+                    ('Gabarito Vertical_Gabarito (m)', pa.float64()),
+                    ('Gabarito Vertical_Faixa km', pa.string()),
+                    ('VMA Trem Carregado_VMA (km/h)', pa.float64()),
+                    ('VMA Trem Carregado_Faixa km', pa.string()),
+                    ('VMA Trem Vazio_VMA (km/h)', pa.float64()),
+                    ('VMA Trem Vazio_Faixa km', pa.string()),
+                    ('VMA Produto Perigoso_VMA (km/h)', pa.float64()),
+                    ('VMA Produto Perigoso_Faixa km', pa.string()),
+                    ('VMC Trem Carregado_VMC (km/h)', pa.float64()),
+                    ('VMC Trem Carregado_Faixa km', pa.string()),
+                    ('VMC Trem Vazio_VMC (km/h)', pa.float64()),
+                    ('VMC Trem Vazio_Faixa km', pa.string()),
+                    ('VMC Produto Perigoso_VMC (km/h)', pa.float64()),
+                    ('VMC Produto Perigoso_Faixa km', pa.string()),
+                    ('Carga Máx. por Eixo_Carga (t)', pa.float64()),
+                    ('Carga Máx. por Eixo_Faixa km', pa.string()),
+                ])
+            }
         }
 
     def _flatten_headers(self, df, header_config):
@@ -25,33 +142,267 @@ class ExcelExtractor:
             df.columns = new_columns
         return df
 
-    def run(self):
-        if not os.path.exists(self.output_folder):
-            os.makedirs(self.output_folder)
+    def _sheet_parts(self, archive):
+        """Mapeia o nome de cada aba para o XML correspondente dentro do .xlsx"""
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        targets = {}
+        for rel in rels:
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join('xl', target))
+            targets[rel.get('Id')] = target
 
-        print(f"1. [EXTRACT] Lendo arquivo: {os.path.basename(self.excel_file)}...")
+        parts = {}
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        for element in workbook.iter():
+            if not element.tag.endswith('}sheet'):
+                continue
+            rel_id = next((v for k, v in element.attrib.items() if k.endswith('}id')), None)
+            if rel_id in targets:
+                parts[element.get('name')] = targets[rel_id]
+        return parts
+
+    def sheet_hashes(self):
+        """
+        Hash por aba calculado sobre as partes XML do .xlsx, sem interpretar as células.
+        Strings compartilhadas e estilos entram em todos os hashes, pois uma mudança
+        neles pode alterar o valor lido em qualquer aba.
+        """
+        hashes = {}
+        with zipfile.ZipFile(self.excel_file) as archive:
+            names = set(archive.namelist())
+            shared = hashlib.sha256()
+            for part in ('xl/sharedStrings.xml', 'xl/styles.xml'):
+                if part in names:
+                    shared.update(archive.read(part))
+
+            sheet_parts = self._sheet_parts(archive)
+            for excel_tab, config in self.tabs_config.items():
+                if sheet_parts.get(excel_tab) not in names:
+                    continue
 
+                key_name, _ = self._output_path(config)
+                digest = hashlib.sha256(shared.digest())
+                digest.update(repr(config).encode())
+                with archive.open(sheet_parts[excel_tab]) as f:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                        digest.update(chunk)
+                hashes[key_name] = digest.hexdigest()
+        return hashes
+
+    def _selected_tabs(self, only):
         for excel_tab, config in self.tabs_config.items():
-            output_path = os.path.join(self.output_folder, config['filename'])
+            key_name, _ = self._output_path(config)
+            if only is None or key_name in only:
+                yield excel_tab, config
+
+    def _stage(self, key_name):
+        return self.telemetry.stage('extract', key_name, workbook=os.path.basename(self.excel_file))
+
+    def _output_path(self, config):
+        key_name = config['filename'].replace('.csv', '')
+        filename = f"{key_name}.{self.output_format}"
+        return key_name, os.path.join(self.output_folder, filename)
+
+    def _run_csv(self, only):
+        """Modo legado: um read_excel por aba e saída em CSV ';'"""
+        for excel_tab, config in self._selected_tabs(only):
+            key_name, output_path = self._output_path(config)
 
             try:
-                df_temp = pd.read_excel(
-                    self.excel_file, 
-                    sheet_name=excel_tab, 
-                    header=config['header'], 
-                    engine='openpyxl'
-                )
+                with self._stage(key_name) as record:
+                    df_temp = pd.read_excel(
+                        self.excel_file,
+                        sheet_name=excel_tab,
+                        header=config['header'],
+                        engine='openpyxl'
+                    )
+                    record['rows_in'] = len(df_temp)
+
+                    df_temp = self._flatten_headers(df_temp, config['header'])
+                    df_temp = df_temp.dropna(how='all')
 
-                df_temp = self._flatten_headers(df_temp, config['header'])
-                df_temp = df_temp.dropna(how='all')
+                    df_temp.to_csv(output_path, index=False, sep=';', encoding='utf-8')
 
-                df_temp.to_csv(output_path, index=False, sep=';', encoding='utf-8')
+                    record['rows_out'] = len(df_temp)
+                    record['bytes_written'] = os.path.getsize(output_path)
 
-                key_name = config['filename'].replace('.csv', '')
                 self.csv_paths[key_name] = output_path
 
             except ValueError:
+                # Aba ausente: descarta o registro da tentativa
+                self.telemetry.records.pop()
                 print(f"   [AVISO] Aba '{excel_tab}' não encontrada. Pulando.")
                 continue
 
-        return self.csv_paths
\ No newline at end of file
+    def _stream_headers(self, header_rows):
+        """
+        Monta os nomes das colunas a partir das linhas de cabeçalho,
+        com o mesmo preenchimento de células mescladas do pd.read_excel.
+        """
+        width = 0
+        for row in header_rows:
+            filled = [i for i, value in enumerate(row) if value not in (None, "")]
+            if filled:
+                width = max(width, filled[-1] + 1)
+
+        levels = []
+        control_row = [True] * width
+        for row in header_rows:
+            row = list(row[:width]) + [None] * (width - len(row))
+            if len(header_rows) == 1:
+                levels.append(row)
+                continue
+
+            last = row[0] if width else None
+            for i in range(1, width):
+                if not control_row[i]:
+                    last = row[i]
+                if row[i] in (None, ""):
+                    row[i] = last
+                else:
+                    control_row[i] = False
+                    last = row[i]
+            levels.append(row)
+
+        columns = []
+        seen = {}
+        for i, parts in enumerate(zip(*levels)):
+            parts = [str(c).strip() for c in parts if c not in (None, "")]
+            if len(levels) == 1:
+                name = str(levels[0][i]) if parts else f"Unnamed: {i}"
+            else:
+                name = "_".join(parts)
+
+            if name in seen:
+                seen[name] += 1
+                name = f"{name}.{seen[name]}"
+            else:
+                seen[name] = 0
+            columns.append(name)
+
+        return columns
+
+    def _cast_cell(self, value, arrow_type):
+        """
+        Converte uma célula para o tipo declarado da coluna.
+        Devolve (valor, ok): célula que não converte vira None com ok=False.
+        """
+        if value is None:
+            return None, True
+        if pa.types.is_string(arrow_type):
+            return str(value), True
+        if isinstance(value, bool):
+            return None, False
+
+        if isinstance(value, str):
+            try:
+                value = float(value.strip().replace(',', '.'))
+            except ValueError:
+                return None, False
+        elif not isinstance(value, (int, float)):
+            return None, False
+
+        if pa.types.is_integer(arrow_type):
+            if isinstance(value, float) and not value.is_integer():
+                return None, False
+            return int(value), True
+        return float(value), True
+
+    def _typed_table(self, columns, data, schema, excel_tab):
+        """
+        Monta a tabela Arrow com o schema fixo da aba.
+        Células que não convertem viram nulas (com aviso por coluna); colunas
+        do schema ausentes na aba saem nulas e colunas fora dele saem como texto.
+        """
+        n_rows = len(data[0]) if data else 0
+        by_name = dict(zip(columns, data))
+
+        extras = [name for name in columns if schema.get_field_index(name) < 0]
+        missing = [name for name in schema.names if name not in by_name]
+        if extras:
+            print(f"   [AVISO] Aba '{excel_tab}': colunas fora do schema gravadas como texto: {extras}")
+        if missing:
+            print(f"   [AVISO] Aba '{excel_tab}': colunas do schema ausentes, gravadas nulas: {missing}")
+
+        fields = list(schema) + [pa.field(name, pa.string()) for name in extras]
+        arrays = []
+        for field in fields:
+            values = by_name.get(field.name, [None] * n_rows)
+            cast = [self._cast_cell(v, field.type) for v in values]
+            invalid = sum(1 for _, ok in cast if not ok)
+            if invalid:
+                print(f"   [AVISO] Aba '{excel_tab}', coluna '{field.name}': "
+                      f"{invalid} célula(s) fora do tipo {field.type} gravadas nulas.")
+            arrays.append(pa.array([v for v, _ in cast], type=field.type))
+
+        return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+    def _stream_tab(self, worksheet, config, excel_tab):
+        """
+        Lê a aba em uma única passada e devolve uma tabela Arrow com o schema
+        fixo da aba e o número de linhas de dados lidas (antes de descartar as vazias).
+        """
+        header = config['header']
+        n_header = len(header) if isinstance(header, list) else 1
+
+        rows = worksheet.iter_rows(values_only=True)
+        header_rows = [next(rows, ()) for _ in range(n_header)]
+        columns = self._stream_headers(header_rows)
+        width = len(columns)
+
+        data = [[] for _ in columns]
+        scanned = 0
+        for row in rows:
+            scanned += 1
+            values = [None if v == "" else v for v in row[:width]]
+            if all(v is None for v in values):
+                continue
+            values += [None] * (width - len(values))
+            for i, value in enumerate(values):
+                data[i].append(value)
+
+        table = self._typed_table(columns, data, config['schema'], excel_tab)
+        return table, scanned
+
+    def _run_parquet(self, only):
+        """Abre a planilha uma única vez (read-only) e grava Parquet por aba"""
+        workbook = openpyxl.load_workbook(self.excel_file, read_only=True, data_only=True)
+
+        try:
+            for excel_tab, config in self._selected_tabs(only):
+                if excel_tab not in workbook.sheetnames:
+                    print(f"   [AVISO] Aba '{excel_tab}' não encontrada. Pulando.")
+                    continue
+
+                key_name, output_path = self._output_path(config)
+
+                with self._stage(key_name) as record:
+                    table, record['rows_in'] = self._stream_tab(workbook[excel_tab], config, excel_tab)
+                    pq.write_table(table, output_path)
+
+                    record['rows_out'] = table.num_rows
+                    record['bytes_written'] = os.path.getsize(output_path)
+
+                self.csv_paths[key_name] = output_path
+        finally:
+            workbook.close()
+
+    def run(self, only=None):
+        """
+        Extrai as abas configuradas.
+        only: conjunto opcional de tabelas (ex: {'patios'}) para extrair só as abas alteradas.
+        """
+        if not os.path.exists(self.output_folder):
+            os.makedirs(self.output_folder)
+
+        print(f"1. [EXTRACT] Lendo arquivo: {os.path.basename(self.excel_file)}...")
+
+        if self.output_format == 'parquet':
+            self._run_parquet(only)
+        else:
+            self._run_csv(only)
+
+        return self.csv_paths
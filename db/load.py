@@ -1,31 +1,366 @@
 import sqlite3
 import pandas as pd
+import pyarrow as pa
 import os
+from contextlib import contextmanager
+
+from db import network, parquet_store, schema, segments, summaries
+from db.manifest import frame_hash, frame_row_hashes
+from db.telemetry import StageTelemetry
 
 class DataModeler:
     """
     Responsible for the LOAD step.
     """
 
-    def __init__(self, db_path):
+    # Tabelas de saída produzidas a partir de cada aba extraída
+    SOURCE_TABLES = {
+        'patios': ['dim_concessoes', 'dim_linhas', 'patios'],
+        'terminais': ['dim_concessoes', 'dim_mercadorias', 'terminais'],
+        'trechos_fisicos': ['dim_concessoes', 'trechos_fisicos', 'trechos_segmentos'],
+        'entre_patios': [
+            'dim_concessoes', 'dim_linhas', 'fact_segmentos',
+            'grafo_patios', 'grafo_arestas', 'grafo_terminais',
+        ],
+    }
+
+    # Chave natural usada no upsert incremental de cada fato
+    NATURAL_KEYS = {
+        'patios': ['id_concessao', 'codigo'],
+        'terminais': ['id_concessao', 'terminal', 'id_mercadoria'],
+        'trechos_fisicos': ['id_concessao', 'linha'],
+        'fact_segmentos': ['id_concessao', 'codigo_patio_a', 'codigo_patio_b'],
+    }
+
+    # Linhas por lote no executemany da carga
+    BATCH_SIZE = 50_000
+
+    def __init__(self, db_path, incremental=False, bulk=False, parquet_dir=None):
         self.db_path = db_path
+        self.incremental = incremental
+        # Cópia colunar opcional para o dashboard (parquet_store.py)
+        self.parquet_dir = parquet_dir
+        # Carga em massa: reconstrói o banco em um arquivo ao lado e troca no final
+        self.bulk = bulk and not incremental
+        self.build_path = f"{db_path}.building"
         self.conn = None
-        self.map_concessao = {}
+        self.dim_concessoes = None
         self.map_mercadoria = {}
+        self.table_hashes = {} # Estado: hash e nº de linhas de cada tabela gravada
+        self.conversion_times = {} # Estado: segundos para materializar cada entrada em pandas
+        self.telemetry = StageTelemetry()
+
+    def _materialize(self, dfs):
+        """
+        Converte cada entrada para pandas uma única vez (Spark via Arrow).
+        Dimensões e fatos trabalham sobre essa cópia, sem reexecutar o plano do Spark.
+        """
+        frames = {}
+        for table, df in dfs.items():
+            with self.telemetry.stage('materialize', table) as record:
+                frames[table] = df.toPandas() if hasattr(df, 'toPandas') else df
+                record['rows_in'] = record['rows_out'] = len(frames[table])
+            self.conversion_times[table] = record['wall_s']
+
+            print(
+                f"   [MODELAGEM] '{table}' materializada em "
+                f"{self.conversion_times[table]:.3f}s ({len(frames[table])} registros)."
+            )
+
+            if hasattr(df, 'unpersist'):
+                df.unpersist()
+        return frames
 
     def _connect(self):
+        if self.bulk:
+            self._connect_bulk()
+            return
+
         self.conn = sqlite3.connect(self.db_path)
         self.conn.execute("PRAGMA foreign_keys = ON;")
 
-    def _create_dim_concessoes(self, df_base):
+    def _connect_bulk(self):
+        """
+        Banco novo e privado: sem fsync, WAL e uma única transação explícita.
+        As FKs são verificadas de uma vez no final (PRAGMA foreign_key_check).
+        """
+        self._discard_build()
+
+        self.conn = sqlite3.connect(self.build_path, isolation_level=None)
+        # Histórico de execuções não faz parte do modelo: segue para o banco novo
+        StageTelemetry.copy_history(self.conn, self.db_path)
+        self.conn.execute("PRAGMA journal_mode = WAL;")
+        self.conn.execute("PRAGMA synchronous = OFF;")
+        self.conn.execute("PRAGMA temp_store = MEMORY;")
+        self.conn.execute("BEGIN")
+
+    def _discard_build(self):
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(self.build_path + suffix):
+                os.remove(self.build_path + suffix)
+
+    def _finish_bulk(self):
+        """Fecha a transação, valida, compacta o WAL e troca o arquivo de forma atômica"""
+        self.conn.execute("COMMIT")
+
+        violations = self.conn.execute("PRAGMA foreign_key_check").fetchall()
+        if violations:
+            self.conn.close()
+            self._discard_build()
+            raise RuntimeError(f"Carga em massa violou {len(violations)} chaves estrangeiras.")
+
+        print("   [MODELAGEM] Atualizando estatísticas do planejador (ANALYZE)...")
+        self.conn.execute("ANALYZE")
+        self.conn.execute("PRAGMA journal_mode = DELETE;")
+        self.conn.close()
+
+        # synchronous=OFF não garante o disco: força antes de publicar o arquivo
+        with open(self.build_path, 'rb') as f:
+            os.fsync(f.fileno())
+
+        os.replace(self.build_path, self.db_path)
+        print("   [MODELAGEM] Novo banco publicado (troca atômica do arquivo).")
+
+    def _insert_rows(self, table, df):
+        """
+        INSERT via executemany em lotes Arrow: a conversão para tipos Python
+        (e NaN -> NULL) é feita por coluna, não linha a linha no pandas.
+        """
+        if df.empty:
+            return
+
+        columns = ", ".join(f'"{c}"' for c in df.columns)
+        values = ", ".join("?" * len(df.columns))
+        sql = f'INSERT INTO "{table}" ({columns}) VALUES ({values})'
+
+        try:
+            batches = pa.Table.from_pandas(df, preserve_index=False).to_batches(self.BATCH_SIZE)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Colunas com tipos misturados (ex: planilhas diferentes): caminho genérico
+            rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            self.conn.executemany(sql, rows)
+            return
+
+        for batch in batches:
+            self.conn.executemany(sql, zip(*(column.to_pylist() for column in batch.columns)))
+
+    @staticmethod
+    def summaries_are_current(db_path):
+        """Os resumos gravados seguem as definições atuais (SUMMARY_VERSION)?"""
+        if not os.path.exists(db_path):
+            return False
+        conn = sqlite3.connect(db_path)
+        try:
+            return summaries.stored_version(conn) == summaries.SUMMARY_VERSION
+        finally:
+            conn.close()
+
+    @staticmethod
+    def schema_is_current(db_path):
+        """O banco existente foi criado com a DDL atual (schema.SCHEMA_VERSION)?"""
+        if not os.path.exists(db_path):
+            return False
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0] == schema.SCHEMA_VERSION
+        finally:
+            conn.close()
+
+    def _drop_tables(self):
+        """Carga completa: remove as tabelas do modelo, filhos antes dos pais"""
+        for table in reversed(schema.TABLE_ORDER):
+            self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+
+    def _create_table(self, table, df):
+        """Cria a tabela pela DDL explícita, grava os dados e só então os índices"""
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.conn.execute(schema.create_table_sql(table, df.dtypes))
+        self._insert_rows(table, df)
+        self._create_indexes(table, df.columns)
+
+    def _create_indexes(self, table, columns):
+        for statement in schema.create_index_sql(table, columns):
+            self.conn.execute(statement)
+
+    def _dedupe_primary_key(self, table, df):
+        """Linhas repetidas na chave primária: mantém a última ocorrência"""
+        pk = schema.TABLES[table].get('primary_key')
+        if not pk:
+            return df
+        duplicated = df.duplicated(subset=pk, keep='last')
+        if duplicated.any():
+            print(f"   [AVISO] '{table}': {int(duplicated.sum())} linhas com chave repetida descartadas.")
+            df = df[~duplicated]
+        return df
+
+    def _table_exists(self, table):
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+        return row is not None
+
+    def _read_table(self, table):
+        if not self._table_exists(table):
+            return None
+        return pd.read_sql_query(f'SELECT * FROM "{table}"', self.conn)
+
+    def _load_existing_maps(self):
+        """No modo incremental, reaproveita as dimensões já gravadas"""
+        self.dim_concessoes = self._read_table('dim_concessoes')
+
+        dim = self._read_table('dim_mercadorias')
+        if dim is not None:
+            self.map_mercadoria = dict(zip(dim['nome'], dim['id_mercadoria']))
+
+        dim = self._read_table('dim_linhas')
+        if dim is not None:
+            self.map_linhas = dict(zip(dim['nome_linha'], dim['id_linha']))
+
+    def _record(self, table, df):
+        self.table_hashes[table] = (frame_hash(df), len(df))
+
+    def _db_bytes(self):
+        """
+        Bytes em páginas ocupadas (fora da freelist), incluindo a transação aberta.
+        Páginas liberadas pelo DROP são reaproveitadas sem crescer o arquivo,
+        então o tamanho do arquivo sozinho não mede o que foi gravado.
+        """
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    @contextmanager
+    def _stage(self, table, rows_in):
+        """Telemetria da carga de uma dimensão/fato; bytes = páginas ocupadas a mais"""
+        before = self._db_bytes()
+        with self.telemetry.stage('load', table) as record:
+            record['rows_in'] = rows_in
+            yield record
+            record['rows_out'] = self.table_hashes[table][1]
+            record['bytes_written'] = self._db_bytes() - before
+
+    def _write_dim(self, table, dim, key_cols, id_col):
+        """
+        Grava a dimensão. No modo incremental os ids existentes são mantidos
+        e apenas os membros novos recebem ids, a partir do maior id atual.
+        """
+        existing = self._read_table(table) if self.incremental else None
+
+        if existing is None or existing.empty:
+            dim[id_col] = dim.index + 1
+            self._create_table(table, dim)
+            self._record(table, dim)
+            return dim
+
+        merged = dim.merge(existing[key_cols], on=key_cols, how='left', indicator=True)
+        novos = merged[merged['_merge'] == 'left_only'].drop(columns='_merge')
+        novos = novos.reset_index(drop=True)
+        novos[id_col] = novos.index + int(existing[id_col].max()) + 1
+
+        if not novos.empty:
+            print(f"   [INCREMENTAL] '{table}': {len(novos)} novos membros.")
+            self._insert_rows(table, novos)
+
+        dim = pd.concat([existing, novos], ignore_index=True)
+        self._record(table, dim)
+        return dim
+
+    def _group_keys(self, df, keys):
+        """Chave natural normalizada (texto), comparável entre SQLite e pandas"""
+        parts = []
+        for key in keys:
+            series = df[key]
+            if pd.api.types.is_numeric_dtype(series):
+                series = series.astype('float64')
+            parts.append(series.astype(str))
+        key_series = parts[0]
+        for part in parts[1:]:
+            key_series = key_series + '\x1f' + part
+        return key_series
+
+    def _group_hashes(self, df, keys):
+        """Conjunto de hashes de linha de cada chave natural"""
+        if df.empty:
+            return {}
+        row_hashes = frame_row_hashes(df)
+        grouped = row_hashes.groupby(self._group_keys(df, keys).values)
+        return {key: tuple(sorted(values.tolist())) for key, values in grouped}
+
+    def _upsert(self, table, df, keys):
+        """
+        Aplica apenas a diferença entre o que está gravado e o novo lote,
+        comparando as linhas de cada chave natural dentro das concessões do lote.
+        """
+        existing_cols = schema.data_columns(
+            table, [r[1] for r in self.conn.execute(f'PRAGMA table_info("{table}")')]
+        )
+        if set(existing_cols) != set(df.columns):
+            print(f"   [INCREMENTAL] '{table}': colunas mudaram, recriando tabela.")
+            self._create_table(table, df)
+            return
+
+        concessoes = [int(c) for c in df['id_concessao'].dropna().unique()]
+        placeholders = ", ".join("?" * len(concessoes))
+        existing = pd.read_sql_query(
+            f'SELECT rowid AS _rowid, * FROM "{table}" WHERE id_concessao IN ({placeholders})',
+            self.conn,
+            params=concessoes
+        )
+
+        old_groups = self._group_hashes(existing[existing_cols], keys)
+        new_groups = self._group_hashes(df, keys)
+
+        changed = {k for k, v in new_groups.items() if old_groups.get(k) != v}
+        removed = set(old_groups) - set(new_groups)
+
+        if not changed and not removed:
+            print(f"   [INCREMENTAL] '{table}': sem alterações.")
+            return
+
+        stale = existing[self._group_keys(existing, keys).isin(changed | removed)]
+        fresh = df[self._group_keys(df, keys).isin(changed)]
+
+        with self.conn:
+            self.conn.executemany(
+                f'DELETE FROM "{table}" WHERE rowid = ?',
+                [(int(r),) for r in stale['_rowid']]
+            )
+            self._insert_rows(table, fresh)
+
+        print(
+            f"   [INCREMENTAL] '{table}': {len(changed)} chaves inseridas/atualizadas, "
+            f"{len(removed)} removidas."
+        )
+
+    def _write_fact(self, table, df_final):
+        df_final = self._dedupe_primary_key(table, df_final)
+
+        if self.incremental and self._table_exists(table):
+            self._upsert(table, df_final, self.NATURAL_KEYS[table])
+        else:
+            self._create_table(table, df_final)
+        self._record(table, df_final)
+
+    def _create_dim_concessoes(self, dfs_base):
+        """Uma concessão por (ferrovia, ano), a partir de todas as abas recebidas"""
         print("   [MODELAGEM] Criando dimensão 'dim_concessoes'...")
 
-        dim = df_base[['ferrovia', 'ano']].drop_duplicates().reset_index(drop=True)
-        dim['id_concessao'] = dim.index + 1
+        dim = pd.concat([df[['ferrovia', 'ano']] for df in dfs_base], ignore_index=True)
+        dim = dim.drop_duplicates().reset_index(drop=True)
+        dim = self._write_dim('dim_concessoes', dim, ['ferrovia', 'ano'], 'id_concessao')
 
-        dim.to_sql('dim_concessoes', self.conn, if_exists='replace', index=False)
+        self.dim_concessoes = dim
 
-        self.map_concessao = dict(zip(dim['ferrovia'], dim['id_concessao']))
+    def _map_concessao(self, df):
+        """Resolve o id_concessao de cada linha pelo par (ferrovia, ano)"""
+        dim = self.dim_concessoes
+        lookup = pd.Series(
+            dim['id_concessao'].values,
+            index=pd.MultiIndex.from_arrays([dim['ferrovia'], dim['ano'].astype('float64')])
+        )
+        keys = pd.MultiIndex.from_arrays([df['ferrovia'], df['ano'].astype('float64')])
+        return lookup.reindex(keys).values
 
     def _create_dim_mercadorias(self, df_terminais):
         print("   [MODELAGEM] Criando dimensão 'dim_mercadorias'...")
@@ -33,31 +368,26 @@ class DataModeler:
         mercadorias = df_terminais['mercadoria'].unique()
         dim = pd.DataFrame(mercadorias, columns=['nome'])
         dim = dim.dropna().sort_values('nome').reset_index(drop=True)
-        dim['id_mercadoria'] = dim.index + 1
-
-        dim.to_sql('dim_mercadorias', self.conn, if_exists='replace', index=False)
+        dim = self._write_dim('dim_mercadorias', dim, ['nome'], 'id_mercadoria')
 
         self.map_mercadoria = dict(zip(dim['nome'], dim['id_mercadoria']))
 
-    def _create_dim_linhas(self, df_patios):
+    def _create_dim_linhas(self, linhas):
+        """Linhas citadas pelos pátios e pelos segmentos entre pátios"""
         print("   [MODELAGEM] Criando dimensão 'dim_linhas'...")
 
-        linhas_unicas = df_patios['nome_linha_limpo'].dropna().unique()
+        linhas_unicas = pd.concat(linhas, ignore_index=True).dropna().unique()
 
         dim = pd.DataFrame(linhas_unicas, columns=['nome_linha'])
         dim = dim[dim['nome_linha'] != ''] # Garante que não tem linha vazia
         dim = dim.sort_values('nome_linha').reset_index(drop=True)
-        dim['id_linha'] = dim.index + 1
-
-        dim.to_sql('dim_linhas', self.conn, if_exists='replace', index=False)
+        dim = self._write_dim('dim_linhas', dim, ['nome_linha'], 'id_linha')
 
         self.map_linhas = dict(zip(dim['nome_linha'], dim['id_linha']))
 
-    def _load_fact_patios(self, df_spark):
+    def _load_fact_patios(self, df):
         print("   [MODELAGEM] Salvando tabela 'patios'...")
-        df = df_spark.toPandas()
-
-        df['id_concessao'] = df['ferrovia'].map(self.map_concessao)
+        df = df.assign(id_concessao=self._map_concessao(df))
 
         if hasattr(self, 'map_linhas'):
             df['id_linha'] = df['nome_linha_limpo'].map(self.map_linhas)
@@ -65,57 +395,196 @@ class DataModeler:
         cols_drop = ['ferrovia', 'ano', 'linhas_de_referencia', 'nome_linha_limpo']
         df_final = df.drop(columns=cols_drop, errors='ignore')
 
-        df_final.to_sql('patios', self.conn, if_exists='replace', index=False)
+        self._write_fact('patios', df_final)
 
-    def _load_fact_terminais(self, df_spark):
+    def _load_fact_terminais(self, df):
 
         print("   [MODELAGEM] Salvando tabela 'terminais'...")
-        df = df_spark.toPandas()
-
-        df['id_concessao'] = df['ferrovia'].map(self.map_concessao)
-        df['id_mercadoria'] = df['mercadoria'].map(self.map_mercadoria)
+        df = df.assign(
+            id_concessao=self._map_concessao(df),
+            id_mercadoria=df['mercadoria'].map(self.map_mercadoria)
+        )
 
         df_final = df.drop(columns=['ferrovia', 'ano', 'mercadoria'], errors='ignore')
 
-        df_final.to_sql('terminais', self.conn, if_exists='replace', index=False)
+        self._write_fact('terminais', df_final)
 
-    def _load_fact_trechos(self, df_spark):
+    def _load_fact_trechos(self, df):
         print("   [MODELAGEM] Salvando tabela 'trechos_fisicos'...")
-        df = df_spark.toPandas()
-
-        df['id_concessao'] = df['ferrovia'].map(self.map_concessao)
+        df = df.assign(id_concessao=self._map_concessao(df))
 
         df_final = df.drop(columns=['ferrovia', 'ano'], errors='ignore')
 
-        df_final.to_sql('trechos_fisicos', self.conn, if_exists='replace', index=False)
+        self._write_fact('trechos_fisicos', df_final)
+
+    def _load_segments(self):
+        """
+        Faixas de km em formato longo, sempre a partir de trechos_fisicos já
+        gravada (no modo incremental, os trechos de todas as concessões)
+        """
+        print(f"   [MODELAGEM] Salvando tabela '{segments.TABLE}'...")
+        trechos = self._read_table('trechos_fisicos')
+        df = segments.build_segments(trechos)
+
+        self._create_table(segments.TABLE, df)
+        self._record(segments.TABLE, df)
+        return len(trechos)
+
+    def _load_fact_segmentos(self, df):
+        print("   [MODELAGEM] Salvando tabela 'fact_segmentos'...")
+        df = df.assign(
+            id_concessao=self._map_concessao(df),
+            id_linha=df['linha'].map(self.map_linhas)
+        )
+
+        # Extremidades já separadas em nome/código/km pelo transformer
+        cols_drop = ['ferrovia', 'ano', 'linha', 'segmento_patio_a', 'segmento_patio_b']
+        df_final = df.drop(columns=cols_drop, errors='ignore')
+
+        self._write_fact('fact_segmentos', df_final)
+
+    def _load_network(self):
+        """
+        Grafo da malha a partir de patios, fact_segmentos e terminais já
+        gravados (no modo incremental, de todas as concessões)
+        """
+        print("   [MODELAGEM] Montando o grafo da malha (CSR)...")
+        # Filhos antes dos pais: o DROP de grafo_patios não pode deixar arestas órfãs
+        for table in reversed(network.TABLES):
+            self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+
+        patios = self._read_table('patios')
+        segmentos = self._read_table('fact_segmentos')
+        frames = network.build_network(
+            patios if patios is not None else pd.DataFrame(columns=['id_concessao', 'codigo', 'patio']),
+            segmentos,
+            self._read_table('terminais')
+        )
+        for table, df in frames.items():
+            self._create_table(table, df)
+            self._record(table, df)
+        return len(segmentos)
+
+    def _build_summaries(self):
+        """Remonta os resumos do dashboard a partir das tabelas já gravadas"""
+        print("   [MODELAGEM] Montando tabelas de resumo...")
+
+        before = self._db_bytes()
+        with self.telemetry.stage('load', 'resumos') as record:
+            frames = summaries.build_summaries(self.conn)
+            for table, df in frames.items():
+                self._create_table(table, df)
+
+            self._create_table(summaries.VERSION_TABLE, summaries.version_frame())
+
+            record['rows_out'] = sum(len(df) for df in frames.values())
+            record['bytes_written'] = self._db_bytes() - before
+
+    def refresh_summaries(self):
+        """Só os resumos: usado quando os dados não mudaram, mas as definições sim"""
+        self.conn = sqlite3.connect(self.db_path)
+        try:
+            self._build_summaries()
+            self.conn.commit()
+        finally:
+            self.conn.close()
+
+        self.export_parquet()
+
+    def export_parquet(self):
+        """Republica a cópia Parquet a partir do banco já gravado (sempre completa)"""
+        if self.parquet_dir is None:
+            return
+        print("   [MODELAGEM] Exportando cópia colunar (Parquet)...")
+        parquet_store.export_store(self.db_path, self.parquet_dir, self.telemetry)
 
     def run(self, dfs_spark):
         """
         Método principal que orquestra a carga.
-        Recebe: Dicionário de DataFrames do Spark
+        Recebe: Dicionário de DataFrames (Spark ou pandas)
         """
+        frames = self._materialize(dfs_spark)
+
         self._connect()
 
-        if 'patios' in dfs_spark:
-            df_patios_pd = dfs_spark['patios'].toPandas()
-            self._create_dim_concessoes(df_patios_pd)
-            self._create_dim_linhas(df_patios_pd)
+        try:
+            self._load_all(frames)
+        except Exception:
+            if self.bulk:
+                self.conn.close()
+                self._discard_build()
+            raise
+
+        self.export_parquet()
+
+        print(f"\nSUCESSO! Banco Relacional modelado em: {self.db_path}")
 
-        if 'terminais' in dfs_spark:
-            df_term = dfs_spark['terminais'].toPandas()
-            self._create_dim_mercadorias(df_term)
+    def _load_all(self, frames):
 
-        if 'patios' in dfs_spark:
-            self._load_fact_patios(dfs_spark['patios'])
+        if self.incremental:
+            self._load_existing_maps()
+        else:
+            self._drop_tables()
 
-        if 'terminais' in dfs_spark:
-            self._load_fact_terminais(dfs_spark['terminais'])
+        dfs_base = [
+            frames[table]
+            for table in ('patios', 'terminais', 'trechos_fisicos', 'entre_patios')
+            if table in frames
+        ]
+        if dfs_base:
+            with self._stage('dim_concessoes', sum(len(df) for df in dfs_base)):
+                self._create_dim_concessoes(dfs_base)
 
-        if 'trechos_fisicos' in dfs_spark:
-            self._load_fact_trechos(dfs_spark['trechos_fisicos'])
+        linhas = [
+            frames[table][col_name]
+            for table, col_name in (('patios', 'nome_linha_limpo'), ('entre_patios', 'linha'))
+            if table in frames
+        ]
+        if linhas:
+            with self._stage('dim_linhas', sum(len(s) for s in linhas)):
+                self._create_dim_linhas(linhas)
 
+        if 'terminais' in frames:
+            with self._stage('dim_mercadorias', len(frames['terminais'])):
+                self._create_dim_mercadorias(frames['terminais'])
+
+        if 'patios' in frames:
+            with self._stage('patios', len(frames['patios'])):
+                self._load_fact_patios(frames['patios'])
+
+        if 'terminais' in frames:
+            with self._stage('terminais', len(frames['terminais'])):
+                self._load_fact_terminais(frames['terminais'])
+
+        if 'trechos_fisicos' in frames:
+            with self._stage('trechos_fisicos', len(frames['trechos_fisicos'])):
+                self._load_fact_trechos(frames['trechos_fisicos'])
+
+            with self._stage(segments.TABLE, None) as record:
+                record['rows_in'] = self._load_segments()
+
+        if 'entre_patios' in frames:
+            with self._stage('fact_segmentos', len(frames['entre_patios'])):
+                self._load_fact_segmentos(frames['entre_patios'])
+
+        if self._table_exists('fact_segmentos'):
+            with self._stage('grafo_arestas', None) as record:
+                record['rows_in'] = self._load_network()
+
+        self._build_summaries()
+
+        self.conn.execute(f"PRAGMA user_version = {schema.SCHEMA_VERSION}")
+
+        if self.bulk:
+            self._finish_bulk()
+            return
+
+        self.conn.commit()
+
+        print("   [MODELAGEM] Atualizando estatísticas do planejador (ANALYZE)...")
+        self.conn.execute("ANALYZE")
+        self.conn.commit()
         self.conn.close()
-        print(f"\nSUCESSO! Banco Relacional modelado em: {self.db_path}")
 
 def load_data(dfs, db_path):
     modeler = DataModeler(db_path)
@@ -0,0 +1,120 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_row_hashes(df):
+    """
+    Hash estável por linha, independente do dtype de origem
+    (o que vem do SQLite e o que sai do transformer comparam igual).
+    """
+    normalized = pd.DataFrame(index=df.index)
+    for col_name in sorted(df.columns):
+        series = df[col_name]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            normalized[col_name] = series.astype('float64')
+        else:
+            normalized[col_name] = series.astype(object).where(series.notna(), None).astype(str)
+    return pd.util.hash_pandas_object(normalized, index=False)
+
+
+def frame_hash(df):
+    """Hash do conteúdo da tabela, independente da ordem das linhas"""
+    if df.empty:
+        return hashlib.sha256(repr(sorted(df.columns)).encode()).hexdigest()
+    row_hashes = sorted(frame_row_hashes(df).tolist())
+    digest = hashlib.sha256(repr(sorted(df.columns)).encode())
+    digest.update(pd.Series(row_hashes, dtype='uint64').to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """
+    Registro das execuções do ETL dentro do próprio antt.db:
+    um hash por planilha, por aba e por tabela de saída.
+    """
+
+    TABLE = 'etl_manifest'
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                row_count INTEGER,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (kind, name)
+            )
+        """)
+        return conn
+
+    def get(self, kind, name):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT content_hash FROM {self.TABLE} WHERE kind = ? AND name = ?",
+                (kind, name)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def record(self, kind, name, content_hash, row_count=None):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    f"""
+                    INSERT INTO {self.TABLE} (kind, name, content_hash, row_count, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(kind, name) DO UPDATE SET
+                        content_hash = excluded.content_hash,
+                        row_count = excluded.row_count,
+                        updated_at = excluded.updated_at
+                    """,
+                    (kind, name, content_hash, row_count,
+                     datetime.now(timezone.utc).isoformat(timespec='seconds'))
+                )
+        finally:
+            conn.close()
+
+    def is_current(self, kind, name, content_hash):
+        return self.get(kind, name) == content_hash
+
+    def has_tables(self, tables):
+        """Todas as tabelas existem no banco e têm registro no manifesto"""
+        conn = self._connect()
+        try:
+            recorded = {r[0] for r in conn.execute(
+                f"SELECT name FROM {self.TABLE} WHERE kind = 'table'"
+            )}
+            existing = {r[0] for r in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )}
+        finally:
+            conn.close()
+        return all(t in recorded and t in existing for t in tables)
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(f"DELETE FROM {self.TABLE}")
+        finally:
+            conn.close()
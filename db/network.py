@@ -0,0 +1,119 @@
+"""
+Grafo da malha (pátios e segmentos entre pátios) em formato CSR.
+
+Os nós são os pátios de cada concessão: os da aba Pátios e as extremidades
+citadas na aba Entre Pátios. Cada segmento vira até duas arestas dirigidas,
+uma por sentido com tempo de percurso: crescente (A -> B, km crescente) e
+decrescente (B -> A). As arestas ficam ordenadas pelo nó de origem e cada nó
+guarda o intervalo [aresta_inicio, aresta_fim) das suas arestas de saída,
+então o dashboard (src/utils/network.py) monta os vetores de adjacência sem
+reordenar nada. Os terminais se ligam ao grafo pelo pátio de referência.
+"""
+import numpy as np
+import pandas as pd
+
+# Ordem de criação; grafo_arestas e grafo_terminais referenciam grafo_patios
+TABLES = ['grafo_patios', 'grafo_arestas', 'grafo_terminais']
+
+# Sufixo das colunas de cada sentido -> (extremidade de origem, de destino)
+DIRECTIONS = {'crescente': ('a', 'b'), 'decrescente': ('b', 'a')}
+
+# 'Água Branca (IAB, MRS)' -> 'IAB'
+REFERENCE_YARD_PATTERN = r"\(\s*([^,()]+?)\s*,"
+
+EDGE_COLUMNS = [
+    'id_aresta', 'id_concessao', 'id_no_origem', 'id_no_destino', 'id_linha', 'sentido',
+    'tempo_min', 'extensao_km', 'capacidade_instalada', 'capacidade_ociosa', 'utilizacao',
+]
+
+
+def _nodes(patios, segmentos):
+    """Um nó por (concessão, código); o nome da aba Pátios tem prioridade"""
+    colunas = ['id_concessao', 'codigo', 'nome']
+    partes = [patios[['id_concessao', 'codigo', 'patio']].set_axis(colunas, axis=1)]
+    for ponta in ('a', 'b'):
+        extremidade = segmentos[['id_concessao', f'codigo_patio_{ponta}', f'nome_patio_{ponta}']]
+        partes.append(extremidade.set_axis(colunas, axis=1))
+
+    nos = pd.concat(partes, ignore_index=True)
+    nos = nos[nos['codigo'].notna() & (nos['codigo'] != '')]
+    nos = nos.drop_duplicates(subset=['id_concessao', 'codigo'], keep='first')
+    nos = nos.sort_values(['id_concessao', 'codigo'], kind='stable').reset_index(drop=True)
+    nos.insert(0, 'id_no', np.arange(len(nos), dtype='int64'))
+    return nos
+
+
+def _node_ids(lookup, df, c_codigo):
+    """id_no de cada linha pelo par (id_concessao, código); NaN se o pátio não existe"""
+    chaves = pd.MultiIndex.from_arrays([df['id_concessao'], df[c_codigo]])
+    return lookup.reindex(chaves).to_numpy()
+
+
+def _measure(df, coluna):
+    return df[coluna].astype('float64').to_numpy()
+
+
+def _edges(segmentos, lookup):
+    """Arestas dirigidas; um sentido sem tempo de percurso (> 0) não tem circulação"""
+    partes = []
+    for sentido, (origem, destino) in DIRECTIONS.items():
+        tempo = segmentos[f'tempo_de_percurso_min_{sentido}'].astype('float64')
+        ativos = segmentos[tempo > 0]
+
+        partes.append(pd.DataFrame({
+            'id_concessao': ativos['id_concessao'].to_numpy(),
+            'id_no_origem': _node_ids(lookup, ativos, f'codigo_patio_{origem}'),
+            'id_no_destino': _node_ids(lookup, ativos, f'codigo_patio_{destino}'),
+            'id_linha': ativos['id_linha'].to_numpy(),
+            'sentido': sentido,
+            'tempo_min': _measure(ativos, f'tempo_de_percurso_min_{sentido}'),
+            'extensao_km': _measure(ativos, 'extensao_km'),
+            'capacidade_instalada': _measure(ativos, f'capacidade_instalada_calculada_{sentido}'),
+            'capacidade_ociosa': _measure(ativos, f'capacidade_ociosa_considerada_{sentido}'),
+            'utilizacao': _measure(ativos, f'utilizacao_{sentido}'),
+        }))
+
+    arestas = pd.concat(partes, ignore_index=True)
+    arestas = arestas.dropna(subset=['id_no_origem', 'id_no_destino'])
+    arestas = arestas.astype({'id_no_origem': 'int64', 'id_no_destino': 'int64'})
+    arestas = arestas.sort_values(['id_no_origem', 'id_no_destino'], kind='stable').reset_index(drop=True)
+    arestas.insert(0, 'id_aresta', np.arange(len(arestas), dtype='int64'))
+    return arestas[EDGE_COLUMNS]
+
+
+def _terminals(terminais, lookup):
+    referencias = terminais.assign(
+        codigo=terminais['patio_de_referencia'].astype('string').str.extract(REFERENCE_YARD_PATTERN)[0]
+    )
+
+    ligados = pd.DataFrame({
+        'id_concessao': referencias['id_concessao'].to_numpy(),
+        'terminal': referencias['terminal'].to_numpy(),
+        'id_no': _node_ids(lookup, referencias, 'codigo'),
+    }).dropna()
+    ligados = ligados.astype({'id_no': 'int64'}).drop_duplicates()
+    return ligados.sort_values(['id_concessao', 'terminal'], kind='stable').reset_index(drop=True)
+
+
+def build_network(patios, segmentos, terminais=None):
+    """
+    Monta grafo_patios, grafo_arestas e grafo_terminais a partir das tabelas
+    já gravadas (patios, fact_segmentos e terminais).
+    """
+    nos = _nodes(patios, segmentos)
+    lookup = pd.Series(
+        nos['id_no'].to_numpy(),
+        index=pd.MultiIndex.from_arrays([nos['id_concessao'], nos['codigo']])
+    )
+
+    arestas = _edges(segmentos, lookup)
+
+    # CSR: arestas de saída do nó i em [aresta_inicio[i], aresta_fim[i])
+    origem = arestas['id_no_origem'].to_numpy()
+    nos['aresta_inicio'] = np.searchsorted(origem, nos['id_no'].to_numpy(), side='left')
+    nos['aresta_fim'] = np.searchsorted(origem, nos['id_no'].to_numpy(), side='right')
+
+    frames = {'grafo_patios': nos, 'grafo_arestas': arestas}
+    if terminais is not None:
+        frames['grafo_terminais'] = _terminals(terminais, lookup)
+    return frames
@@ -0,0 +1,149 @@
+"""
+Cópia colunar (Parquet) do banco, lida pelo dashboard com pyarrow.
+
+Opcional (etl.py --parquet): depois da carga no SQLite, cada tabela do modelo é
+exportada para <raiz>/<tabela>/. Os fatos ganham ferrovia e ano da concessão e
+são particionados por elas no estilo Hive (ferrovia=MRS/ano=2025/), então um
+filtro de concessão só abre os arquivos daquela concessão e uma consulta só lê
+as colunas que usa. Dimensões e resumos são pequenos e ficam em um arquivo só.
+
+A cópia é montada em um diretório ao lado e trocada no final, como a carga em
+massa do SQLite; o _build.json identifica a versão publicada.
+"""
+import json
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from db import schema
+from db.telemetry import new_run_id
+
+BUILD_FILE = '_build.json'
+PARTITION_COLUMNS = ['ferrovia', 'ano']
+
+# Tipo declarado no SQLite -> tipo Arrow (colunas só com NULL não têm tipo inferível)
+ARROW_TYPES = {
+    'TEXT': pa.string(),
+    'REAL': pa.float64(),
+    'INTEGER': pa.int64(),
+}
+
+
+def is_partitioned(table):
+    """Fatos (com FK para dim_concessoes) são particionados por concessão"""
+    foreign_keys = schema.TABLES.get(table, {}).get('foreign_keys', {})
+    return foreign_keys.get('id_concessao', (None,))[0] == 'dim_concessoes'
+
+
+def _arrow_schema(conn, table, columns):
+    declared = {
+        name: col_type.split()[0].upper() if col_type else ''
+        for _, name, col_type, *_ in conn.execute(f"PRAGMA table_info({table})")
+    }
+    declared.update(ferrovia='TEXT', ano='INTEGER')
+    return pa.schema([
+        (col, ARROW_TYPES.get(declared.get(col), pa.string())) for col in columns
+    ])
+
+
+def read_table(conn, table):
+    """Tabela do SQLite como pyarrow.Table; fatos com ferrovia e ano da concessão"""
+    if is_partitioned(table):
+        sql = f"""
+            SELECT t.*, c.ferrovia, c.ano
+            FROM {table} t
+            JOIN dim_concessoes c ON c.id_concessao = t.id_concessao
+        """
+    else:
+        sql = f"SELECT * FROM {table}"
+
+    df = pd.read_sql_query(sql, conn, dtype_backend='pyarrow')
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+    return arrow_table.cast(_arrow_schema(conn, table, arrow_table.column_names))
+
+
+def _dir_bytes(path):
+    return sum(
+        os.path.getsize(os.path.join(folder, name))
+        for folder, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def write_table(arrow_table, table_dir, partitioned):
+    if partitioned:
+        ds.write_dataset(
+            arrow_table,
+            table_dir,
+            format='parquet',
+            partitioning=PARTITION_COLUMNS,
+            partitioning_flavor='hive',
+            basename_template='part-{i}.parquet',
+        )
+    else:
+        os.makedirs(table_dir)
+        pq.write_table(arrow_table, os.path.join(table_dir, 'part-0.parquet'))
+
+
+def _publish(build_dir, root):
+    """Troca o diretório publicado pelo novo (o antigo só é apagado depois)"""
+    old_dir = f"{root}.old"
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.exists(root):
+        os.replace(root, old_dir)
+    os.replace(build_dir, root)
+    if os.path.exists(old_dir):
+        shutil.rmtree(old_dir)
+
+
+def export_store(db_path, root, telemetry):
+    """
+    Exporta as tabelas do modelo de db_path para root.
+    Cada tabela vira uma etapa 'parquet' da telemetria.
+    """
+    build_dir = f"{root}.building"
+    if os.path.exists(build_dir):
+        shutil.rmtree(build_dir)
+    os.makedirs(build_dir)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        existing = {
+            name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        tables = {}
+        for table in schema.TABLE_ORDER:
+            if table not in existing:
+                continue
+
+            table_dir = os.path.join(build_dir, table)
+            partitioned = is_partitioned(table)
+            with telemetry.stage('parquet', table) as record:
+                arrow_table = read_table(conn, table)
+                write_table(arrow_table, table_dir, partitioned)
+                record['rows_in'] = record['rows_out'] = arrow_table.num_rows
+                record['bytes_written'] = _dir_bytes(table_dir)
+
+            tables[table] = {'rows': arrow_table.num_rows, 'partitioned': partitioned}
+    except Exception:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    finally:
+        conn.close()
+
+    with open(os.path.join(build_dir, BUILD_FILE), 'w', encoding='utf-8') as f:
+        json.dump({
+            'build_id': new_run_id(),
+            'schema_version': schema.SCHEMA_VERSION,
+            'partitioning': PARTITION_COLUMNS,
+            'tables': tables,
+        }, f, ensure_ascii=False, indent=2)
+
+    _publish(build_dir, root)
+    print(f"   [PARQUET] {len(tables)} tabelas publicadas em '{root}'.")
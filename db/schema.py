@@ -0,0 +1,281 @@
+"""
+Esquema físico do banco (antt.db): chaves, relacionamentos e índices.
+
+As colunas de cada tabela vêm do DataFrame transformado (a planilha pode ganhar
+colunas); aqui ficam apenas os tipos que não podem ser inferidos, as chaves
+e os índices pensados para as consultas de src/database/queries.py.
+"""
+
+# Incrementar sempre que a DDL mudar: bancos com outra versão são recriados
+# (os resumo_* têm versão própria, SUMMARY_VERSION, e são remontados a cada carga)
+SCHEMA_VERSION = 4
+
+# Concessão gravada em cada resumo (sem FK: os resumos são recriados a cada carga)
+_CONCESSAO_TYPES = {'ferrovia': 'TEXT NOT NULL', 'ano': 'INTEGER NOT NULL'}
+
+TABLES = {
+    'dim_concessoes': {
+        'primary_key': ['id_concessao'],
+        'unique': [['ferrovia', 'ano']],
+        'types': {'ferrovia': 'TEXT NOT NULL', 'ano': 'INTEGER NOT NULL'},
+    },
+    'dim_linhas': {
+        'primary_key': ['id_linha'],
+        'unique': [['nome_linha']],
+        'types': {'nome_linha': 'TEXT NOT NULL'},
+    },
+    'dim_mercadorias': {
+        'primary_key': ['id_mercadoria'],
+        'unique': [['nome']],
+        'types': {'nome': 'TEXT NOT NULL'},
+    },
+    'patios': {
+        'primary_key': ['id_concessao', 'codigo'],
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+            'id_linha': ('dim_linhas', 'id_linha'),
+        },
+    },
+    'terminais': {
+        'primary_key': ['id_concessao', 'terminal', 'id_mercadoria'],
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+            'id_mercadoria': ('dim_mercadorias', 'id_mercadoria'),
+        },
+    },
+    'trechos_fisicos': {
+        # Uma linha tem vários trechos: chave substituta (alias do rowid)
+        'surrogate_key': 'id_trecho',
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+        },
+    },
+    'trechos_segmentos': {
+        # Faixas de trechos_fisicos em formato longo (db/segments.py), recriada a
+        # cada carga; id_trecho sem FK para não travar o upsert de trechos_fisicos
+        'surrogate_key': 'id_segmento',
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+        },
+        'types': {
+            'linha': 'TEXT NOT NULL',
+            'atributo': 'TEXT NOT NULL',
+            'km_inicio': 'REAL NOT NULL',
+            'km_fim': 'REAL NOT NULL',
+            'valor_num': 'REAL',
+            'valor_texto': 'TEXT',
+        },
+    },
+    'fact_segmentos': {
+        # Códigos de pátio sem FK: a aba cita pátios que não constam da aba Pátios
+        'primary_key': ['id_concessao', 'codigo_patio_a', 'codigo_patio_b'],
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+            'id_linha': ('dim_linhas', 'id_linha'),
+        },
+    },
+
+    # Grafo da malha em formato CSR (db/network.py), recriado a cada carga
+    'grafo_patios': {
+        'primary_key': ['id_no'],
+        'unique': [['id_concessao', 'codigo']],
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+        },
+        'types': {
+            'codigo': 'TEXT NOT NULL',
+            'aresta_inicio': 'INTEGER NOT NULL',
+            'aresta_fim': 'INTEGER NOT NULL',
+        },
+    },
+    'grafo_arestas': {
+        # id_aresta é a posição no vetor CSR (arestas ordenadas pela origem)
+        'primary_key': ['id_aresta'],
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+            'id_no_origem': ('grafo_patios', 'id_no'),
+            'id_no_destino': ('grafo_patios', 'id_no'),
+            'id_linha': ('dim_linhas', 'id_linha'),
+        },
+        'types': {'sentido': 'TEXT NOT NULL', 'tempo_min': 'REAL NOT NULL'},
+    },
+    'grafo_terminais': {
+        'primary_key': ['id_concessao', 'terminal', 'id_no'],
+        'foreign_keys': {
+            'id_concessao': ('dim_concessoes', 'id_concessao'),
+            'id_no': ('grafo_patios', 'id_no'),
+        },
+    },
+
+    # Resumos pré-agregados lidos pelo dashboard (db/summaries.py), no grão da concessão
+    'resumo_patios_situacao': {
+        'primary_key': ['ferrovia', 'ano', 'em_operacao'],
+        'types': {
+            **_CONCESSAO_TYPES,
+            'qtd_tempo_licenc': 'INTEGER NOT NULL',
+            'qtd_patios': 'INTEGER NOT NULL',
+        },
+    },
+    'resumo_patios_linha': {
+        'primary_key': ['ferrovia', 'ano', 'nome_linha'],
+        'types': {
+            **_CONCESSAO_TYPES,
+            'qtd_tempo_licenc': 'INTEGER NOT NULL',
+            'qtd_patios': 'INTEGER NOT NULL',
+        },
+    },
+    'resumo_capacidade_mercadoria': {
+        'primary_key': ['ferrovia', 'ano', 'nome'],
+        'types': _CONCESSAO_TYPES,
+    },
+    'resumo_capacidade_setor': {
+        'primary_key': ['ferrovia', 'ano', 'setor'],
+        'types': _CONCESSAO_TYPES,
+    },
+    'resumo_capacidade_terminal': {
+        'primary_key': ['ferrovia', 'ano', 'terminal', 'mercadoria'],
+        'types': _CONCESSAO_TYPES,
+    },
+    'resumo_carga_velocidade': {
+        'primary_key': ['ferrovia', 'ano', 'carga_eixo'],
+        'types': {
+            **_CONCESSAO_TYPES,
+            'qtd_vma': 'INTEGER NOT NULL',
+            'qtd_vmc': 'INTEGER NOT NULL',
+        },
+    },
+    'resumo_eficiencia_trechos': {
+        'types': _CONCESSAO_TYPES,
+    },
+    'resumo_eficiencia_linha': {
+        'primary_key': ['ferrovia', 'ano', 'linha'],
+        'types': {**_CONCESSAO_TYPES, 'qtd_trechos': 'INTEGER NOT NULL'},
+    },
+    'resumo_versao': {
+        'types': {'versao': 'INTEGER NOT NULL', 'gerado_em': 'TEXT NOT NULL'},
+    },
+}
+
+# Ordem de criação (pais antes dos filhos); a remoção usa a ordem inversa
+TABLE_ORDER = [
+    'dim_concessoes', 'dim_linhas', 'dim_mercadorias',
+    'patios', 'terminais', 'trechos_fisicos', 'trechos_segmentos', 'fact_segmentos',
+    'grafo_patios', 'grafo_arestas', 'grafo_terminais',
+    'resumo_patios_situacao', 'resumo_patios_linha',
+    'resumo_capacidade_mercadoria', 'resumo_capacidade_setor', 'resumo_capacidade_terminal',
+    'resumo_carga_velocidade', 'resumo_eficiencia_trechos', 'resumo_eficiencia_linha',
+    'resumo_versao',
+]
+
+INDEXES = {
+    'patios': {
+        # QUERY_YARDS_BY_STATUS: filtro + colunas lidas, sem acessar a tabela
+        'idx_patios_status': ['em_operacao', 'tempo_medio_licenc_min', 'patio'],
+        # QUERY_YARDS_BY_LINE: junção por id_linha, filtro e agregados no índice
+        'idx_patios_linha': ['id_linha', 'tempo_medio_licenc_min', 'patio'],
+    },
+    'terminais': {
+        # QUERY_CAPACITY_BY_COMMODITY: junção por id_mercadoria + filtro de capacidade
+        'idx_terminais_mercadoria': ['id_mercadoria', 'capacidade_vg_dia'],
+        # QUERY_TERMINAL_FULL_DETAILS: faixa de capacidade cobrindo terminal e mercadoria
+        'idx_terminais_capacidade': ['capacidade_vg_dia', 'id_mercadoria', 'terminal'],
+    },
+    'trechos_fisicos': {
+        'idx_trechos_concessao_linha': ['id_concessao', 'linha'],
+        # QUERY_LOAD_VS_VMA / QUERY_LOAD_VS_VMC: GROUP BY carga já na ordem do índice
+        'idx_trechos_carga_vma': ['carga_max_por_eixo_carga_t', 'vma_trem_carregado_vma_km_h'],
+        'idx_trechos_carga_vmc': ['carga_max_por_eixo_carga_t', 'vmc_trem_carregado_vmc_km_h'],
+        # QUERY_SPEED_ANOMALIES / QUERY_SPEED_CLEAN_DATA: comparação VMA x VMC coberta
+        'idx_trechos_vma_vmc': [
+            'vma_trem_carregado_vma_km_h', 'vmc_trem_carregado_vmc_km_h', 'linha'
+        ],
+    },
+    'trechos_segmentos': {
+        # Atributos vigentes no km X de uma linha: busca por faixa no índice
+        'idx_trechos_segmentos_km': ['linha', 'km_inicio', 'km_fim', 'atributo'],
+    },
+    'fact_segmentos': {
+        # Segmentos de uma linha em ordem de quilometragem
+        'idx_segmentos_linha': ['id_linha', 'km_patio_a', 'km_patio_b'],
+        # Junções com patios (id_concessao, codigo) pela extremidade B
+        'idx_segmentos_patio_b': ['id_concessao', 'codigo_patio_b'],
+        # Gargalos: maiores utilizações de cada sentido direto no índice
+        'idx_segmentos_utilizacao_crescente': ['utilizacao_crescente', 'id_linha'],
+        'idx_segmentos_utilizacao_decrescente': ['utilizacao_decrescente', 'id_linha'],
+    },
+    'resumo_eficiencia_trechos': {
+        # Filtro de concessão da página de velocidades
+        'idx_resumo_trechos_concessao': ['ferrovia', 'ano'],
+    },
+}
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def column_type(col_name, dtype):
+    """
+    Tipo SQLite de uma coluna a partir do dtype do pandas.
+    Medidas numéricas ficam REAL mesmo quando a planilha só traz inteiros.
+    """
+    if col_name.startswith('id_'):
+        return 'INTEGER'
+    kind = getattr(dtype, 'kind', 'O')
+    if kind == 'b':
+        return 'INTEGER'
+    if kind in 'iuf':
+        return 'REAL'
+    return 'TEXT'
+
+
+def data_columns(table, columns):
+    """Colunas gravadas pelo ETL (exclui a chave substituta gerada pelo banco)"""
+    surrogate = TABLES.get(table, {}).get('surrogate_key')
+    return [c for c in columns if c != surrogate]
+
+
+def create_table_sql(table, dtypes):
+    """
+    DDL de uma tabela.
+    dtypes: mapeamento coluna -> dtype do pandas (ex: df.dtypes)
+    """
+    spec = TABLES[table]
+    types = spec.get('types', {})
+    lines = []
+
+    if spec.get('surrogate_key'):
+        lines.append(f"{_quote(spec['surrogate_key'])} INTEGER PRIMARY KEY")
+
+    for col_name, dtype in dtypes.items():
+        if col_name == spec.get('surrogate_key'):
+            continue
+        col_type = types.get(col_name, column_type(col_name, dtype))
+        lines.append(f"{_quote(col_name)} {col_type}")
+
+    if spec.get('primary_key'):
+        lines.append(f"PRIMARY KEY ({', '.join(_quote(c) for c in spec['primary_key'])})")
+
+    for cols in spec.get('unique', []):
+        lines.append(f"UNIQUE ({', '.join(_quote(c) for c in cols)})")
+
+    for col_name, (parent, parent_col) in spec.get('foreign_keys', {}).items():
+        if col_name in dtypes:
+            lines.append(
+                f"FOREIGN KEY ({_quote(col_name)}) REFERENCES {_quote(parent)} ({_quote(parent_col)})"
+            )
+
+    body = ",\n    ".join(lines)
+    return f"CREATE TABLE {_quote(table)} (\n    {body}\n)"
+
+
+def create_index_sql(table, columns):
+    """DDL dos índices da tabela que se aplicam às colunas existentes"""
+    statements = []
+    for index_name, index_cols in INDEXES.get(table, {}).items():
+        if all(c in columns for c in index_cols):
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} ON {_quote(table)} "
+                f"({', '.join(_quote(c) for c in index_cols)})"
+            )
+    return statements
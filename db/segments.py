@@ -0,0 +1,82 @@
+"""
+Faixas de quilometragem de trechos_fisicos em formato longo (trechos_segmentos).
+
+Cada linha de trechos_fisicos traz um par <atributo>_inicio_faixa/_fim_faixa
+por atributo (VMA, VMC, carga por eixo, perfil do trilho...), cada um com a
+sua própria faixa. Aqui os pares viram uma linha por (trecho, atributo):
+linha, atributo, km_inicio, km_fim e o valor, numérico ou texto. Ordenada por
+linha e km, é a base do índice de intervalos do dashboard
+(src/utils/intervals.py) e do índice idx_trechos_segmentos_km no SQLite.
+"""
+import numpy as np
+import pandas as pd
+
+TABLE = 'trechos_segmentos'
+
+START_SUFFIX = '_inicio_faixa'
+END_SUFFIX = '_fim_faixa'
+RAW_SUFFIX = '_faixa_km'
+
+COLUMNS = [
+    'id_trecho', 'id_concessao', 'linha', 'atributo',
+    'km_inicio', 'km_fim', 'valor_num', 'valor_texto',
+]
+
+
+def range_attributes(columns):
+    """
+    (atributo, coluna de valor, coluna de início, coluna de fim) de cada faixa.
+    O valor é a coluna do mesmo prefixo que não é a faixa: 'vma_trem_carregado'
+    -> 'vma_trem_carregado_vma_km_h'.
+    """
+    columns = list(columns)
+    attributes = []
+    for c_inicio in [c for c in columns if c.endswith(START_SUFFIX)]:
+        atributo = c_inicio[:-len(START_SUFFIX)]
+        c_fim = atributo + END_SUFFIX
+        if c_fim not in columns:
+            continue
+
+        derived = {c_inicio, c_fim, atributo + RAW_SUFFIX}
+        valores = [c for c in columns if c.startswith(atributo + '_') and c not in derived]
+        if valores:
+            attributes.append((atributo, valores[0], c_inicio, c_fim))
+    return attributes
+
+
+def build_segments(df):
+    """
+    Monta trechos_segmentos a partir de trechos_fisicos (já com id_trecho).
+    Uma coluna por vez, sem laço por linha; faixas invertidas são reordenadas
+    e faixas sem nenhuma extremidade são descartadas.
+    """
+    parts = []
+    for atributo, c_valor, c_inicio, c_fim in range_attributes(df.columns):
+        inicio = df[c_inicio].astype('float64').to_numpy()
+        fim = df[c_fim].astype('float64').to_numpy()
+        # Faixa com uma só extremidade vira um ponto
+        inicio = np.where(np.isnan(inicio), fim, inicio)
+        fim = np.where(np.isnan(fim), inicio, fim)
+
+        valor = df[c_valor]
+        numerico = pd.api.types.is_numeric_dtype(valor)
+        parts.append(pd.DataFrame({
+            'id_trecho': df['id_trecho'].to_numpy(),
+            'id_concessao': df['id_concessao'].to_numpy(),
+            'linha': df['linha'].to_numpy(),
+            'atributo': atributo,
+            'km_inicio': np.fmin(inicio, fim),
+            'km_fim': np.fmax(inicio, fim),
+            'valor_num': valor.astype('float64').to_numpy() if numerico else np.nan,
+            'valor_texto': None if numerico else valor.astype(object).to_numpy(),
+        }))
+
+    if not parts:
+        return pd.DataFrame(columns=COLUMNS)
+
+    segmentos = pd.concat(parts, ignore_index=True)
+    segmentos = segmentos[segmentos['km_inicio'].notna() & segmentos['linha'].notna()]
+    segmentos = segmentos.sort_values(
+        ['id_concessao', 'linha', 'atributo', 'km_inicio', 'km_fim'], kind='stable'
+    )
+    return segmentos.reset_index(drop=True)[COLUMNS]
@@ -0,0 +1,206 @@
+"""
+Tabelas de resumo pré-agregadas, montadas no final de cada carga.
+
+Os agrupamentos e as classificações (setor, eficiência) que as páginas do
+dashboard faziam a cada renderização rodam aqui uma única vez. Cada resumo
+guarda a concessão (ferrovia, ano) no próprio grão: o dashboard soma as linhas
+sem filtro e aplica o filtro de concessão como um WHERE, sem voltar aos fatos.
+Médias são guardadas como soma e quantidade, para poderem ser reagregadas.
+
+As regras de classificação e a versão dos resumos vêm de config/rules.py,
+o mesmo módulo que o dashboard importa.
+"""
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from config.rules import SUMMARY_VERSION, classify_sectors, classify_efficiency
+
+# Registro da versão das definições de resumo gravada no banco
+VERSION_TABLE = 'resumo_versao'
+
+# Grão comum a todos os resumos
+CONCESSAO = ['ferrovia', 'ano']
+
+
+def _patios_situacao(conn):
+    return pd.read_sql_query("""
+        SELECT
+            c.ferrovia,
+            c.ano,
+            p.em_operacao,
+            SUM(p.tempo_medio_licenc_min) as soma_tempo_licenc_min,
+            COUNT(p.tempo_medio_licenc_min) as qtd_tempo_licenc,
+            COUNT(*) as qtd_patios
+        FROM patios p
+        JOIN dim_concessoes c ON c.id_concessao = p.id_concessao
+        WHERE p.em_operacao IS NOT NULL
+        GROUP BY c.ferrovia, c.ano, p.em_operacao
+    """, conn)
+
+
+def _patios_linha(conn):
+    return pd.read_sql_query("""
+        SELECT
+            c.ferrovia,
+            c.ano,
+            l.nome_linha,
+            SUM(p.tempo_medio_licenc_min) as soma_tempo_licenc_min,
+            COUNT(*) as qtd_tempo_licenc,
+            COUNT(p.patio) as qtd_patios
+        FROM patios p
+        JOIN dim_linhas l ON p.id_linha = l.id_linha
+        JOIN dim_concessoes c ON c.id_concessao = p.id_concessao
+        WHERE p.tempo_medio_licenc_min > 0
+        GROUP BY c.ferrovia, c.ano, l.nome_linha
+    """, conn)
+
+
+def _capacidade_mercadoria(conn):
+    df = pd.read_sql_query("""
+        SELECT
+            c.ferrovia,
+            c.ano,
+            m.nome,
+            SUM(t.capacidade_vg_dia) as capacidade_total
+        FROM terminais t
+        JOIN dim_mercadorias m ON t.id_mercadoria = m.id_mercadoria
+        JOIN dim_concessoes c ON c.id_concessao = t.id_concessao
+        WHERE t.capacidade_vg_dia > 0
+        GROUP BY c.ferrovia, c.ano, m.nome
+    """, conn)
+    df['setor'] = classify_sectors(df['nome'])
+    return df
+
+
+def _capacidade_setor(conn):
+    df = _capacidade_mercadoria(conn)
+    return df.groupby(CONCESSAO + ['setor'])['capacidade_total'].sum().reset_index()
+
+
+def _capacidade_terminal(conn):
+    """Linhas terminal x mercadoria; o ranking de terminais depende do filtro e fica no dashboard"""
+    df = pd.read_sql_query("""
+        SELECT
+            c.ferrovia,
+            c.ano,
+            t.terminal,
+            m.nome as mercadoria,
+            t.capacidade_vg_dia
+        FROM terminais t
+        JOIN dim_mercadorias m ON t.id_mercadoria = m.id_mercadoria
+        JOIN dim_concessoes c ON c.id_concessao = t.id_concessao
+        WHERE t.capacidade_vg_dia > 0
+    """, conn)
+    df['setor'] = classify_sectors(df['mercadoria'])
+    return df
+
+
+def _carga_velocidade(conn):
+    # VMA e VMC positivas contam cada uma por si, como nas consultas de cada velocidade
+    return pd.read_sql_query("""
+        SELECT
+            c.ferrovia,
+            c.ano,
+            tf.carga_max_por_eixo_carga_t as carga_eixo,
+            SUM(CASE WHEN tf.vma_trem_carregado_vma_km_h > 0
+                THEN tf.vma_trem_carregado_vma_km_h END) as soma_vma,
+            COUNT(CASE WHEN tf.vma_trem_carregado_vma_km_h > 0 THEN 1 END) as qtd_vma,
+            SUM(CASE WHEN tf.vmc_trem_carregado_vmc_km_h > 0
+                THEN tf.vmc_trem_carregado_vmc_km_h END) as soma_vmc,
+            COUNT(CASE WHEN tf.vmc_trem_carregado_vmc_km_h > 0 THEN 1 END) as qtd_vmc
+        FROM trechos_fisicos tf
+        JOIN dim_concessoes c ON c.id_concessao = tf.id_concessao
+        WHERE tf.carga_max_por_eixo_carga_t > 0
+        GROUP BY c.ferrovia, c.ano, tf.carga_max_por_eixo_carga_t
+        HAVING qtd_vma > 0 OR qtd_vmc > 0
+    """, conn)
+
+
+# Trechos consistentes: VMA e VMC positivas e VMC <= VMA
+_TRECHOS_VALIDOS = """
+    SELECT
+        c.ferrovia,
+        c.ano,
+        tf.linha,
+        tf.vma_trem_carregado_vma_km_h as vma,
+        tf.vmc_trem_carregado_vmc_km_h as vmc
+    FROM trechos_fisicos tf
+    JOIN dim_concessoes c ON c.id_concessao = tf.id_concessao
+    WHERE tf.vma_trem_carregado_vma_km_h > 0
+      AND tf.vmc_trem_carregado_vmc_km_h > 0
+      AND tf.vma_trem_carregado_vma_km_h >= tf.vmc_trem_carregado_vmc_km_h
+    ORDER BY tf.id_trecho
+"""
+
+
+def _eficiencia_trechos(conn):
+    df = pd.read_sql_query(_TRECHOS_VALIDOS, conn)
+    df['eficiencia'] = (df['vmc'] / df['vma']) * 100
+    df['status'] = df['eficiencia'].apply(classify_efficiency)
+    return df
+
+
+def _eficiencia_linha(conn):
+    return pd.read_sql_query(f"""
+        SELECT
+            ferrovia,
+            ano,
+            linha,
+            SUM(vma) as soma_vma,
+            SUM(vmc) as soma_vmc,
+            COUNT(*) as qtd_trechos
+        FROM ({_TRECHOS_VALIDOS})
+        GROUP BY ferrovia, ano, linha
+    """, conn)
+
+
+# Origens de cada grupo de resumos; a concessão vem de dim_concessoes
+_PATIOS = ['patios', 'dim_concessoes']
+_TERMINAIS = ['terminais', 'dim_mercadorias', 'dim_concessoes']
+_TRECHOS = ['trechos_fisicos', 'dim_concessoes']
+
+# Tabela de resumo -> (tabelas de origem, função que monta o DataFrame)
+SUMMARIES = {
+    'resumo_patios_situacao': (_PATIOS, _patios_situacao),
+    'resumo_patios_linha': (_PATIOS + ['dim_linhas'], _patios_linha),
+    'resumo_capacidade_mercadoria': (_TERMINAIS, _capacidade_mercadoria),
+    'resumo_capacidade_setor': (_TERMINAIS, _capacidade_setor),
+    'resumo_capacidade_terminal': (_TERMINAIS, _capacidade_terminal),
+    'resumo_carga_velocidade': (_TRECHOS, _carga_velocidade),
+    'resumo_eficiencia_trechos': (_TRECHOS, _eficiencia_trechos),
+    'resumo_eficiencia_linha': (_TRECHOS, _eficiencia_linha),
+}
+
+
+def _existing_tables(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+
+def build_summaries(conn):
+    """
+    Monta os resumos a partir do que está gravado no banco (carga completa
+    ou incremental). Resumos cujas tabelas de origem não existem são pulados.
+    """
+    existing = _existing_tables(conn)
+    frames = {}
+    for table, (sources, builder) in SUMMARIES.items():
+        if all(source in existing for source in sources):
+            frames[table] = builder(conn).reset_index(drop=True)
+    return frames
+
+
+def version_frame():
+    """Linha única gravada em resumo_versao ao final da montagem"""
+    return pd.DataFrame({
+        'versao': [SUMMARY_VERSION],
+        'gerado_em': [datetime.now(timezone.utc).isoformat(timespec='seconds')],
+    })
+
+
+def stored_version(conn):
+    """Versão dos resumos gravada no banco (None se ainda não foram montados)"""
+    if VERSION_TABLE not in _existing_tables(conn):
+        return None
+    row = conn.execute(f'SELECT MAX(versao) FROM "{VERSION_TABLE}"').fetchone()
+    return row[0]
@@ -0,0 +1,207 @@
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows: sem getrusage, o pico de memória fica em branco
+    resource = None
+
+
+# Maior VmHWM lido antes de cada reset: o reset também zera o ru_maxrss
+_highest_peak_mb = 0.0
+
+
+def peak_rss_mb():
+    """Pico de memória residente do processo atual, em MB (None fora do Unix)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(max(peak / unit, _highest_peak_mb), 1)
+
+
+def _proc_status_mb(field):
+    """Campo de /proc/self/status em MB (VmRSS atual, VmHWM pico); None fora do Linux"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _reset_peak_rss():
+    """Zera o pico de RSS (VmHWM) do processo; False onde o kernel não permite"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+# Etapas abertas (podem se aninhar): RSS no início e maior pico visto desde então
+_open_stages = []
+
+
+def _fold_peak():
+    """Leva o pico desde o último reset para as etapas abertas e zera o pico"""
+    global _highest_peak_mb
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        _highest_peak_mb = max(_highest_peak_mb, peak)
+        for frame in _open_stages:
+            frame['peak'] = max(frame['peak'], peak)
+    return _reset_peak_rss()
+
+
+def new_run_id():
+    return datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S.%fZ')
+
+
+class StageTelemetry:
+    """
+    Tempo, linhas de entrada/saída, pico de memória e bytes gravados
+    de cada etapa do ETL (aba extraída, tabela transformada, tabela carregada).
+
+    O pico (mem_peak_mb) é o da própria etapa: quanto o RSS do processo subiu
+    acima do que era no início dela. O pico do kernel (VmHWM) é zerado a cada
+    etapa, então uma etapa leve depois de uma pesada não herda o pico dela.
+    Só no Linux (None nos outros sistemas); a JVM do Spark fica de fora. O
+    pico de RSS do processo inteiro vai no relatório.
+
+    Os registros são dicts simples: voltam dos processos de extração por pickle
+    e são gravados juntos no final, na tabela etl_runs e no relatório JSON.
+    """
+
+    TABLE = 'etl_runs'
+
+    COLUMNS = [
+        'stage', 'target', 'workbook', 'started_at', 'wall_s',
+        'rows_in', 'rows_out', 'mem_peak_mb', 'bytes_written',
+    ]
+
+    def __init__(self):
+        self.records = []
+
+    @contextmanager
+    def stage(self, stage, target, workbook=None):
+        """
+        Mede o bloco 'with'. Quem chama preenche rows_in, rows_out e
+        bytes_written no dict recebido; o resto é medido aqui.
+        """
+        record = dict.fromkeys(self.COLUMNS)
+        record.update(
+            stage=stage,
+            target=target,
+            workbook=workbook,
+            started_at=datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        )
+        measured = _fold_peak()
+        base = _proc_status_mb('VmRSS')
+        frame = {'base': base, 'peak': base}
+        if measured and base is not None:
+            _open_stages.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = round(time.perf_counter() - start, 4)
+            if frame in _open_stages:
+                _fold_peak()
+                _open_stages.remove(frame)
+                record['mem_peak_mb'] = round(frame['peak'] - frame['base'], 1)
+            self.records.append(record)
+
+    def extend(self, records):
+        self.records.extend(records)
+
+    def save(self, db_path, run_id):
+        """Acrescenta os registros da execução à tabela etl_runs (histórico de todas as cargas)"""
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                self.create_table(conn)
+                conn.executemany(
+                    f"""
+                    INSERT INTO {self.TABLE} (run_id, {", ".join(self.COLUMNS)})
+                    VALUES (?, {", ".join("?" * len(self.COLUMNS))})
+                    """,
+                    [(run_id, *(r[c] for c in self.COLUMNS)) for r in self.records]
+                )
+        finally:
+            conn.close()
+
+    @classmethod
+    def create_table(cls, conn):
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {cls.TABLE} (
+                run_id TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                target TEXT NOT NULL,
+                workbook TEXT,
+                started_at TEXT NOT NULL,
+                wall_s REAL NOT NULL,
+                rows_in INTEGER,
+                rows_out INTEGER,
+                mem_peak_mb REAL,
+                bytes_written INTEGER
+            )
+        """)
+        # Históricos de antes do pico por etapa têm peak_rss_mb no lugar de mem_peak_mb
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({cls.TABLE})")}
+        if 'mem_peak_mb' not in columns:
+            conn.execute(f"ALTER TABLE {cls.TABLE} ADD COLUMN mem_peak_mb REAL")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_etl_runs_run ON {cls.TABLE} (run_id)")
+
+    @classmethod
+    def copy_history(cls, conn, source_db_path):
+        """Carga em massa: leva o histórico do banco atual para o banco novo"""
+        cls.create_table(conn)
+        if not os.path.exists(source_db_path):
+            return
+
+        conn.execute("ATTACH DATABASE ? AS anterior", (source_db_path,))
+        try:
+            exists = conn.execute(
+                "SELECT 1 FROM anterior.sqlite_master WHERE type = 'table' AND name = ?",
+                (cls.TABLE,)
+            ).fetchone()
+            if exists:
+                # Só as colunas em comum: o histórico antigo pode ter outro layout
+                previous = {row[1] for row in conn.execute(f"PRAGMA anterior.table_info({cls.TABLE})")}
+                columns = ", ".join(c for c in ['run_id'] + cls.COLUMNS if c in previous)
+                conn.execute(
+                    f"INSERT INTO {cls.TABLE} ({columns}) SELECT {columns} FROM anterior.{cls.TABLE}"
+                )
+        finally:
+            conn.execute("DETACH DATABASE anterior")
+
+    def write_report(self, path, run_id, **info):
+        """Relatório JSON da execução: parâmetros, totais por etapa e todos os registros"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'wall_s': 0.0, 'rows_out': 0})
+            total['wall_s'] = round(total['wall_s'] + record['wall_s'], 4)
+            total['rows_out'] += record['rows_out'] or 0
+
+        report = {
+            'run_id': run_id,
+            **info,
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': totals,
+            'records': self.records,
+        }
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
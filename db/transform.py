@@ -1,25 +1,22 @@
-import unicodedata
-import re
-from pyspark.sql.functions import col, split, regexp_replace, trim
+from pyspark.sql.functions import col, split, regexp_replace, regexp_extract, trim, when
 
-class SparkTransformer:
+from db.transform_base import BaseTransformer
+
+
+class SparkTransformer(BaseTransformer):
     """
     Responsável pela limpeza, normalização e tipagem dos dados usando PySpark.
     """
     
     def __init__(self, spark_session):
+        super().__init__()
         self.spark = spark_session
-        self.cleaned_dfs = {} # Estado: Guarda os DataFrames prontos
-
-    def _normalize_text(self, text):
-        """Normaliza strings (remove acentos e caracteres especiais)"""
-        if not text: return ""
-        nfkd = unicodedata.normalize('NFKD', text)
-        text = "".join([c for c in nfkd if not unicodedata.combining(c)])
-        text = text.lower()
-        text = re.sub(r'[().]', '', text)
-        text = re.sub(r'[ /]', '_', text)
-        return text
+
+    def _read(self, paths):
+        paths = self._as_list(paths)
+        if paths[0].endswith('.parquet'):
+            return self.spark.read.option("mergeSchema", "true").parquet(*paths)
+        return self.spark.read.csv(paths, header=True, inferSchema=True, sep=';')
 
     def _clean_column_names(self, df):
         """Aplica a normalização em todas as colunas"""
@@ -30,28 +27,48 @@ class SparkTransformer:
 
     def _process_trechos_fisicos(self, df):
         """Lógica de negócio específica para a tabela de trechos"""
-        cols_faixa = [c for c in df.columns if 'faixa_km' in c]
-
-        for c_faixa in cols_faixa:
-            prefixo = c_faixa.replace('_faixa_km', '').replace('faixa_km', '')
-            nome_inicio = f"{prefixo}_inicio_faixa"
-            nome_fim = f"{prefixo}_fim_faixa"
+        faixas = self._range_columns(df.columns)
+        cols_faixa = [c_faixa for c_faixa, _, _ in faixas]
 
-            df = df.withColumn(nome_inicio, split(col(c_faixa), " à ").getItem(0))
-            df = df.withColumn(nome_fim, split(col(c_faixa), " à ").getItem(1))
-
-            df = df.withColumn(nome_inicio, regexp_replace(col(nome_inicio), ",", ".").cast("double"))
-            df = df.withColumn(nome_fim, regexp_replace(col(nome_fim), ",", ".").cast("double"))
+        # Um único select com todas as faixas: o split de cada coluna é feito uma vez
+        novas_colunas = []
+        for c_faixa, nome_inicio, nome_fim in faixas:
+            partes = split(col(c_faixa), self.RANGE_SEPARATOR)
+            novas_colunas.append(regexp_replace(partes.getItem(0), ",", ".").cast("double").alias(nome_inicio))
+            novas_colunas.append(regexp_replace(partes.getItem(1), ",", ".").cast("double").alias(nome_fim))
+        df = df.select("*", *novas_colunas)
 
         for col_name in df.columns:
             if col_name in cols_faixa: continue
 
-            keywords = ['vma', 'velocidade', 'carga', 'eixo', 'taxa', 'gabarito']
-            if any(x in col_name for x in keywords):
+            if self._is_numeric_column(col_name):
                 df = df.withColumn(col_name, regexp_replace(col(col_name), ",", ".").cast("double"))
 
         return df
 
+    def _process_entre_patios(self, df):
+        """
+        Separa nome, código e km das extremidades de cada segmento
+        e calcula a utilização (vinculada / instalada) por sentido.
+        """
+        for c_segmento, sufixo in self.SEGMENT_ENDPOINTS.items():
+            if c_segmento not in df.columns: continue
+
+            for grupo, nome in ((1, f"nome_{sufixo}"), (2, f"codigo_{sufixo}")):
+                parte = trim(regexp_extract(col(c_segmento), self.YARD_PATTERN, grupo))
+                df = df.withColumn(nome, when(parte != "", parte))
+
+            km = regexp_extract(col(c_segmento), self.YARD_PATTERN, 3)
+            df = df.withColumn(f"km_{sufixo}", regexp_replace(km, ",", ".").cast("double"))
+
+        for nome_razao, c_vinculada, c_instalada in self._utilization_columns(df.columns):
+            vinculada = regexp_replace(col(c_vinculada).cast("string"), ",", ".").cast("double")
+            instalada = regexp_replace(col(c_instalada).cast("string"), ",", ".").cast("double")
+            # Sem capacidade instalada a razão não é definida
+            df = df.withColumn(nome_razao, when(instalada > 0, vinculada / instalada))
+
+        return df
+
     def _clean_line_name(self, df):
         """
         Remove a informação de quilometragem da coluna de linha.
@@ -63,7 +80,7 @@ class SparkTransformer:
 
             df = df.withColumn(
                 'nome_linha_limpo', 
-                regexp_replace(col(col_name), r"\s*\(km.*", "")
+                regexp_replace(col(col_name), self.LINE_KM_PATTERN, "")
             )
             df = df.withColumn('nome_linha_limpo', trim(col('nome_linha_limpo')))
 
@@ -73,21 +90,31 @@ class SparkTransformer:
         """Executa a transformação em todas as tabelas recebidas"""
         print("\n2. [TRANSFORM] Normalizando dados com PySpark...")
 
-        for table_name, path in paths_dict.items():
-            df = self.spark.read.csv(path, header=True, inferSchema=True, sep=';')
+        for table_name, paths in paths_dict.items():
+            # Plano preguiçoso: o tempo da etapa é o do count() que materializa a tabela.
+            # Linhas de entrada ficam em branco para não disparar um job extra.
+            with self.telemetry.stage('transform', table_name) as record:
+                df = self._read(paths)
+
+                df = self._clean_column_names(df)
+
+                if "ferrovia" in df.columns:
+                    df = df.filter(col("ferrovia").isNotNull())
 
-            df = self._clean_column_names(df)
+                if table_name == 'patios':
+                    df = self._clean_line_name(df)
 
-            if "ferrovia" in df.columns:
-                df = df.filter(col("ferrovia").isNotNull())
+                if table_name == 'trechos_fisicos':
+                    df = self._process_trechos_fisicos(df)
 
-            if table_name == 'patios':
-                df = self._clean_line_name(df)
+                if table_name == 'entre_patios':
+                    df = self._process_entre_patios(df)
 
-            if table_name == 'trechos_fisicos':
-                df = self._process_trechos_fisicos(df)
+                # Persistido: o count() abaixo materializa e a carga reaproveita o cache
+                df = df.persist()
+                record['rows_out'] = df.count()
 
             self.cleaned_dfs[table_name] = df
-            print(f"   -> Tabela '{table_name}' pronta: {df.count()} registros.")
+            print(f"   -> Tabela '{table_name}' pronta: {record['rows_out']} registros.")
 
         return self.cleaned_dfs
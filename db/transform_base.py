@@ -0,0 +1,73 @@
+import unicodedata
+import re
+
+from db.telemetry import StageTelemetry
+
+
+class BaseTransformer:
+    """
+    Regras de limpeza compartilhadas pelos motores de transformação.
+    """
+
+    # Colunas de trechos que carregam valores numéricos com vírgula decimal
+    NUMERIC_KEYWORDS = ['vma', 'velocidade', 'carga', 'eixo', 'taxa', 'gabarito']
+
+    # Remove a quilometragem do nome da linha: 'Santos - Jundiaí (km 86,062)'
+    LINE_KM_PATTERN = r"\s*\(km.*"
+
+    # Separador das faixas de quilometragem: '64,285 à 452,000'
+    RANGE_SEPARATOR = " à "
+
+    # Extremidade de um segmento entre pátios: 'Brisamar (FBA), km 0,000'
+    YARD_PATTERN = r"^\s*(.*?)\s*\(([^()]*)\)\s*,\s*km\s*([0-9.,]+)\s*$"
+
+    # Colunas de extremidade do segmento e o sufixo das colunas derivadas
+    SEGMENT_ENDPOINTS = {'segmento_patio_a': 'patio_a', 'segmento_patio_b': 'patio_b'}
+
+    def __init__(self):
+        self.cleaned_dfs = {} # Estado: Guarda os DataFrames prontos
+        self.telemetry = StageTelemetry()
+
+    def _normalize_text(self, text):
+        """Normaliza strings (remove acentos e caracteres especiais)"""
+        if not text: return ""
+        nfkd = unicodedata.normalize('NFKD', text)
+        text = "".join([c for c in nfkd if not unicodedata.combining(c)])
+        text = text.lower()
+        text = re.sub(r'[().]', '', text)
+        text = re.sub(r'[ /]', '_', text)
+        return text
+
+    def _as_list(self, paths):
+        """run() aceita um caminho ou uma lista de caminhos (uma por planilha)"""
+        if isinstance(paths, (list, tuple)):
+            return list(paths)
+        return [paths]
+
+    def _range_columns(self, columns):
+        """Retorna as colunas de faixa km e os nomes de início/fim derivados"""
+        ranges = []
+        for c_faixa in [c for c in columns if 'faixa_km' in c]:
+            prefixo = c_faixa.replace('_faixa_km', '').replace('faixa_km', '')
+            ranges.append((c_faixa, f"{prefixo}_inicio_faixa", f"{prefixo}_fim_faixa"))
+        return ranges
+
+    def _utilization_columns(self, columns):
+        """
+        Retorna (utilizacao_<sentido>, vinculada, instalada) para cada sentido
+        que tenha as duas colunas de capacidade.
+        """
+        ratios = []
+        for c_vinculada in [c for c in columns if c.startswith('capacidade_vinculada')]:
+            sentido = c_vinculada.rsplit('_', 1)[-1]
+            c_instalada = next(
+                (c for c in columns
+                 if c.startswith('capacidade_instalada') and c.endswith(f"_{sentido}")),
+                None
+            )
+            if c_instalada:
+                ratios.append((f"utilizacao_{sentido}", c_vinculada, c_instalada))
+        return ratios
+
+    def _is_numeric_column(self, col_name):
+        return any(x in col_name for x in self.NUMERIC_KEYWORDS)
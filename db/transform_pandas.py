@@ -0,0 +1,123 @@
+import pandas as pd
+
+from db.transform_base import BaseTransformer
+
+
+class PandasTransformer(BaseTransformer):
+    """
+    Motor de transformação vetorizado (pandas/pyarrow), sem JVM.
+    Segue o mesmo contrato do SparkTransformer: run(paths_dict) -> dict de DataFrames.
+    """
+
+    def _read_one(self, path):
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_csv(path, sep=';', encoding='utf-8', engine='pyarrow')
+
+    def _read(self, paths):
+        frames = [self._read_one(path) for path in self._as_list(paths)]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, ignore_index=True)
+
+    def _clean_column_names(self, df):
+        """Aplica a normalização em todas as colunas"""
+        return df.rename(columns=self._normalize_text)
+
+    def _to_double(self, series):
+        """Equivalente ao regexp_replace(',', '.').cast('double') do Spark"""
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype('float64')
+        texto = series.astype('string').str.replace(',', '.', regex=False)
+        return pd.to_numeric(texto, errors='coerce').astype('float64')
+
+    def _process_trechos_fisicos(self, df):
+        """Lógica de negócio específica para a tabela de trechos"""
+        faixas = self._range_columns(df.columns)
+        cols_faixa = [c_faixa for c_faixa, _, _ in faixas]
+
+        novas_colunas = {}
+        for c_faixa, nome_inicio, nome_fim in faixas:
+            partes = df[c_faixa].astype('string').str.split(self.RANGE_SEPARATOR, n=1, expand=True)
+            partes = partes.reindex(columns=[0, 1])
+
+            novas_colunas[nome_inicio] = self._to_double(partes[0])
+            novas_colunas[nome_fim] = self._to_double(partes[1])
+
+        df = df.assign(**novas_colunas)
+
+        for col_name in df.columns:
+            if col_name in cols_faixa: continue
+
+            if self._is_numeric_column(col_name):
+                df[col_name] = self._to_double(df[col_name])
+
+        return df
+
+    def _process_entre_patios(self, df):
+        """
+        Separa nome, código e km das extremidades de cada segmento
+        e calcula a utilização (vinculada / instalada) por sentido.
+        """
+        novas_colunas = {}
+        for c_segmento, sufixo in self.SEGMENT_ENDPOINTS.items():
+            if c_segmento not in df.columns: continue
+
+            partes = df[c_segmento].astype('string').str.extract(self.YARD_PATTERN)
+            novas_colunas[f"nome_{sufixo}"] = partes[0].str.strip()
+            novas_colunas[f"codigo_{sufixo}"] = partes[1].str.strip()
+            novas_colunas[f"km_{sufixo}"] = self._to_double(partes[2])
+
+        for nome_razao, c_vinculada, c_instalada in self._utilization_columns(df.columns):
+            vinculada = self._to_double(df[c_vinculada])
+            instalada = self._to_double(df[c_instalada])
+            # Sem capacidade instalada a razão não é definida
+            novas_colunas[nome_razao] = (vinculada / instalada).where(instalada > 0)
+
+        return df.assign(**novas_colunas)
+
+    def _clean_line_name(self, df):
+        """
+        Remove a informação de quilometragem da coluna de linha.
+        Ex: 'Santos - Jundiaí (km 86,062)' -> 'Santos - Jundiaí'
+        """
+        col_name = 'linhas_de_referencia'
+
+        if col_name in df.columns:
+            df['nome_linha_limpo'] = (
+                df[col_name]
+                .str.replace(self.LINE_KM_PATTERN, "", regex=True)
+                .str.strip()
+            )
+
+        return df
+
+    def run(self, paths_dict):
+        """Executa a transformação em todas as tabelas recebidas"""
+        print("\n2. [TRANSFORM] Normalizando dados com pandas...")
+
+        for table_name, paths in paths_dict.items():
+            with self.telemetry.stage('transform', table_name) as record:
+                df = self._read(paths)
+                record['rows_in'] = len(df)
+
+                df = self._clean_column_names(df)
+
+                if "ferrovia" in df.columns:
+                    df = df[df["ferrovia"].notna()].reset_index(drop=True)
+
+                if table_name == 'patios':
+                    df = self._clean_line_name(df)
+
+                if table_name == 'trechos_fisicos':
+                    df = self._process_trechos_fisicos(df)
+
+                if table_name == 'entre_patios':
+                    df = self._process_entre_patios(df)
+
+                record['rows_out'] = len(df)
+
+            self.cleaned_dfs[table_name] = df
+            print(f"   -> Tabela '{table_name}' pronta: {len(df)} registros.")
+
+        return self.cleaned_dfs
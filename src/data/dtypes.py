@@ -0,0 +1,71 @@
+"""
+Column types of the frames served by the loader.
+
+Each repository query declares a schema {column: type}. The loader applies it
+before the result enters st.cache_data, so the cached frame (pickled, and
+copied back on every hit) is already compact:
+
+    CATEGORY  low-cardinality text (Sim/Não, sector, line, status) -> category
+    TEXT      free text (yard, terminal, commodity names) -> Arrow-backed string
+    FLOAT     measures -> float32 when every value survives the round trip, else float64
+    INT       counts, years and ids -> smallest integer type holding the range
+
+Any other type is handed to DataFrame.astype as is.
+"""
+import numpy as np
+import pandas as pd
+
+CATEGORY = 'category'
+TEXT = 'string[pyarrow]'
+FLOAT = 'float'
+INT = 'integer'
+
+# Dtype of each downcast type in an empty result
+_EMPTY = {FLOAT: 'float32', INT: 'int8'}
+
+
+def _downcast_float(values: pd.Series) -> pd.Series:
+    values = values.astype('float64')
+    narrow = values.astype('float32')
+    # Averages and ratios rarely fit exactly; those columns stay float64
+    if np.array_equal(narrow.to_numpy(dtype='float64'), values.to_numpy(), equal_nan=True):
+        return narrow
+    return values
+
+
+def _downcast_int(values: pd.Series) -> pd.Series:
+    return pd.to_numeric(values.astype('int64'), downcast='integer')
+
+
+def apply_schema(df: pd.DataFrame, schema) -> pd.DataFrame:
+    """
+    Convert a query result to its declared column types.
+
+    Args:
+        df: Query result
+        schema: {column: type} or (column, type) pairs
+
+    Returns:
+        DataFrame with the declared types; an empty result still gets every column
+    """
+    schema = dict(schema)
+    if not schema:
+        return df
+
+    if df.empty:
+        return pd.DataFrame({
+            column: pd.Series(dtype=_EMPTY.get(dtype, dtype)) for column, dtype in schema.items()
+        })
+
+    columns = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        if dtype == FLOAT:
+            columns[column] = _downcast_float(df[column])
+        elif dtype == INT:
+            columns[column] = _downcast_int(df[column])
+        else:
+            columns[column] = df[column].astype(dtype)
+
+    return df.assign(**columns)
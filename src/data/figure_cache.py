@@ -0,0 +1,90 @@
+"""
+Cross-session cache of rendered Plotly figures.
+"""
+import json
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import streamlit as st
+
+from config.settings import FIGURE_CACHE_MAX_ENTRIES
+from src.data.loader import get_data_version
+from src.utils import profiling
+
+
+class FigureCache:
+    """
+    Thread-safe LRU store of serialized figures (Plotly JSON strings).
+
+    Strings are immutable, so one entry can be handed to every session
+    without copying or risk of a page mutating another session's figure.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            spec = self._entries.get(key)
+            if spec is not None:
+                self._entries.move_to_end(key)
+            return spec
+
+    def put(self, key, spec: str):
+        with self._lock:
+            self._entries[key] = spec
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """
+    Process-wide figure cache, shared by all sessions.
+
+    Returns:
+        FigureCache bounded by FIGURE_CACHE_MAX_ENTRIES
+    """
+    return FigureCache(FIGURE_CACHE_MAX_ENTRIES)
+
+
+def cached_figure(builder):
+    """
+    Cache a figure builder on (data version, language, parameters).
+
+    The builder must load its own data and depend only on its arguments:
+    ``builder(lang, **params) -> plotly Figure``. On a hit the stored JSON is
+    returned as a figure dict for st.plotly_chart, skipping pandas and Plotly
+    Express entirely.
+
+    Args:
+        builder: Function building the figure
+
+    Returns:
+        Wrapped function returning a figure dict
+    """
+    name = f"{builder.__module__}.{builder.__qualname__}"
+
+    @wraps(builder)
+    def wrapper(lang: str, **params) -> dict:
+        key = (name, get_data_version(), lang, tuple(sorted(params.items())))
+        cache = get_figure_cache()
+
+        spec = cache.get(key)
+        profiling.count('figure', spec is not None)
+        if spec is None:
+            with profiling.section(f"build {builder.__name__}"):
+                spec = builder(lang, **params).to_json()
+            cache.put(key, spec)
+
+        return json.loads(spec)
+
+    return wrapper
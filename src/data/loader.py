@@ -5,16 +5,126 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 import os
-from config.settings import DB_PATH
+import pyarrow as pa
+from config.settings import (
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_MMAP_SIZE,
+    DB_IMMUTABLE,
+    PARQUET_STORE_DIR,
+    DATA_BACKEND,
+    DUCKDB_THREADS,
+    DUCKDB_IN_MEMORY,
+    CACHE_TTL_SECONDS,
+    CACHE_MAX_ENTRIES
+)
+from config.rules import SUMMARY_VERSION
+from src.data.dtypes import apply_schema
+from src.database.backends import SQLiteBackend, DuckDBBackend
+from src.database.connection import ConnectionPool
+from src.database.parquet_store import ParquetStore
+from src.database.queries import QUERY_SUMMARY_VERSION
+from src.utils import profiling
 
 
-@st.cache_data
-def load_data(query: str) -> pd.DataFrame:
+@st.cache_resource
+def get_connection_pool() -> ConnectionPool:
     """
-    Load data from SQLite database with caching.
+    Process-wide read-only connection pool, shared by all sessions.
+    
+    Returns:
+        ConnectionPool bound to DB_PATH
+    """
+    return ConnectionPool(
+        DB_PATH, max_size=DB_POOL_SIZE, mmap_size=DB_MMAP_SIZE, immutable=DB_IMMUTABLE
+    )
+
+
+@st.cache_resource
+def get_parquet_store() -> ParquetStore:
+    """
+    Process-wide dataset cache over the Parquet copy, shared by all sessions.
+    
+    Returns:
+        ParquetStore bound to PARQUET_STORE_DIR
+    """
+    return ParquetStore(PARQUET_STORE_DIR)
+
+
+def scans_use_parquet() -> bool:
+    """
+    Check whether single-table scans are served from the Parquet copy.
+    
+    Returns:
+        True if DATA_BACKEND reads the Parquet copy and the ETL has published one
+    """
+    return DATA_BACKEND in ('parquet', 'duckdb') and get_parquet_store().available()
+
+
+@st.cache_resource
+def get_sqlite_backend() -> SQLiteBackend:
+    """
+    SQLite backend over the shared connection pool.
+    
+    Returns:
+        SQLiteBackend bound to DB_PATH
+    """
+    return SQLiteBackend(get_connection_pool())
+
+
+@st.cache_resource
+def get_duckdb_backend() -> DuckDBBackend:
+    """
+    Process-wide DuckDB database with views over the Parquet copy.
+    
+    Returns:
+        DuckDBBackend bound to PARQUET_STORE_DIR
+    """
+    return DuckDBBackend(get_parquet_store(), threads=DUCKDB_THREADS, in_memory=DUCKDB_IN_MEMORY)
+
+
+def get_query_backend():
+    """
+    Backend that runs load_data queries, as selected by DATA_BACKEND.
+    
+    Returns:
+        DuckDBBackend when selected and the Parquet copy exists, SQLiteBackend otherwise
+    """
+    if DATA_BACKEND == 'duckdb' and get_parquet_store().available():
+        try:
+            return get_duckdb_backend()
+        except ImportError:
+            st.warning("DuckDB is not installed (pip install duckdb): running queries on SQLite.")
+    return get_sqlite_backend()
+
+
+def get_data_version() -> str:
+    """
+    Version of the data currently served.
+    
+    Returns:
+        Token that changes whenever the ETL rewrites or swaps antt.db
+        (or republishes the Parquet copy, when reads are served from it)
+    """
+    parts = (get_query_backend().name,) + get_connection_pool().file_identity()
+    if scans_use_parquet():
+        parts += get_parquet_store().build_identity()
+    return "-".join(str(part) for part in parts)
+
+
+def load_data(query: str, params: tuple = (), schema: tuple = ()) -> pd.DataFrame:
+    """
+    Load data from the configured backend (SQLite or DuckDB) with caching.
+    
+    The cache key includes the data version, so a new ETL load is picked up
+    immediately while queries on unchanged data stay warm. Errors are handled
+    here, outside the cache, so a transient failure (a locked database during
+    the ETL swap) is not served for the rest of the TTL.
     
     Args:
         query: SQL query string
+        params: Values bound to the query's ? placeholders
+        schema: (column, type) pairs applied before caching (src/data/dtypes.py)
         
     Returns:
         DataFrame with query results
@@ -24,15 +134,129 @@ def load_data(query: str) -> pd.DataFrame:
             f"Error: Database not found at {DB_PATH}. "
             "Please run the ETL process first!"
         )
-        return pd.DataFrame()
+        return apply_schema(pd.DataFrame(), schema)
     
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(query, conn)
-    conn.close()
+    with profiling.query(query, params) as stats:
+        try:
+            df = _load_data_cached(query, tuple(params), tuple(schema), get_data_version())
+        except get_query_backend().errors as exc:
+            st.error(f"Error: {exc}. Please run the ETL process again!")
+            df = apply_schema(pd.DataFrame(), schema)
+        stats['rows'] = len(df)
+
+    return df
+
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def _load_data_cached(query: str, params: tuple, schema: tuple, data_version: str) -> pd.DataFrame:
+    """
+    Cached query execution, keyed on (query, params, schema, data_version).
+    Backend errors propagate, so st.cache_data never stores a failed result.
     
+    Args:
+        query: SQL query string
+        params: Values bound to the query's ? placeholders
+        schema: (column, type) pairs of the result
+        data_version: Value of get_data_version() when the query was issued
+        
+    Returns:
+        DataFrame with query results
+    """
+    profiling.mark_cache_miss()
+
+    df = get_query_backend().read_sql(query, params)
+    return apply_schema(df, schema)
+
+
+def load_table(table: str, columns: tuple = (), filters: tuple = (), comparisons: tuple = (),
+               order_by: tuple = (), limit=None, schema: tuple = ()) -> pd.DataFrame:
+    """
+    Load one table from the Parquet copy with caching.
+    
+    Only the projected columns are read and the predicates are pushed into
+    the scan (partition pruning on ferrovia/ano). Cached like load_data,
+    with read errors handled outside the cache.
+    
+    Args:
+        table: Table name
+        columns: (alias, column) pairs to read
+        filters: (column, op, value) predicates
+        comparisons: (column, op, other_column) predicates
+        order_by: (output column, descending) pairs
+        limit: Maximum number of rows
+        schema: (column, type) pairs applied before caching (src/data/dtypes.py)
+        
+    Returns:
+        DataFrame with the selected columns
+    """
+    label = f"PARQUET {table} [{', '.join(alias for alias, _ in columns) or '*'}]"
+    params = [f"{column} {op} {value}" for column, op, value in filters + comparisons]
+
+    with profiling.query(label, params) as stats:
+        try:
+            df = _load_table_cached(
+                table, columns, filters, comparisons, order_by, limit, tuple(schema), get_data_version()
+            )
+        except (OSError, pa.ArrowException) as exc:
+            st.error(f"Error: {exc}. Please run the ETL process again!")
+            df = apply_schema(pd.DataFrame(), schema)
+        stats['rows'] = len(df)
+
     return df
 
 
+@st.cache_data(ttl=CACHE_TTL_SECONDS, max_entries=CACHE_MAX_ENTRIES)
+def _load_table_cached(table: str, columns: tuple, filters: tuple, comparisons: tuple,
+                       order_by: tuple, limit, schema: tuple, data_version: str) -> pd.DataFrame:
+    """
+    Cached Parquet scan, keyed on the scan and data_version.
+    A read that still fails after rediscovering the files propagates uncached.
+    
+    Args:
+        table: Table name
+        columns: (alias, column) pairs to read
+        filters: (column, op, value) predicates
+        comparisons: (column, op, other_column) predicates
+        order_by: (output column, descending) pairs
+        limit: Maximum number of rows
+        schema: (column, type) pairs of the result
+        data_version: Value of get_data_version() when the scan was issued
+        
+    Returns:
+        DataFrame with the selected columns
+    """
+    profiling.mark_cache_miss()
+
+    store = get_parquet_store()
+    try:
+        df = store.scan(table, columns, filters, comparisons, order_by, limit)
+    except (OSError, pa.ArrowException):
+        # Copy republished mid-read: rediscover the files once
+        store.invalidate()
+        df = store.scan(table, columns, filters, comparisons, order_by, limit)
+
+    return apply_schema(df, schema)
+
+
+def summaries_are_current() -> bool:
+    """
+    Check whether the ETL-built summary tables match this dashboard version.
+    
+    Returns:
+        True if the stored summary version equals SUMMARY_VERSION
+    """
+    if not os.path.exists(DB_PATH):
+        return False
+
+    try:
+        with get_connection_pool().connection() as conn:
+            version = conn.execute(QUERY_SUMMARY_VERSION).fetchone()[0]
+    except sqlite3.Error:
+        return False
+
+    return version == SUMMARY_VERSION
+
+
 def validate_data(df: pd.DataFrame, min_rows: int = 1) -> bool:
     """
     Validate if DataFrame has sufficient data.
@@ -0,0 +1,80 @@
+"""
+Background warm-up of the process-wide caches.
+
+On a fresh server process the first visit to each page pays for importing it
+(Plotly Express, matplotlib for the Styler), for its queries and for every
+figure build. start_warmup() runs once per process, after the first page has
+been rendered, and preloads every page in a daemon thread: unfiltered data,
+for every language, into the same caches the sessions read.
+"""
+import logging
+import threading
+import time
+
+import streamlit as st
+
+from config.settings import LANGUAGES, WARMUP_ON_START
+from src.database import repository
+from src.pages import PAGES, get_page
+from src.utils import profiling
+
+logger = logging.getLogger(__name__)
+
+THREAD_NAME = 'cache-warmup'
+
+
+class _MissingContextFilter(logging.Filter):
+    """Drop Streamlit's "missing ScriptRunContext" warning for the warm-up thread."""
+
+    def filter(self, record):
+        return record.threadName != THREAD_NAME
+
+
+def warm_caches():
+    """
+    Import every page and preload its unfiltered queries and figures.
+
+    Returns:
+        Seconds spent
+    """
+    start = time.perf_counter()
+    repository.concessions()
+    for key in PAGES:
+        page = get_page(key)
+        for lang in LANGUAGES:
+            page.warmup(lang)
+    return time.perf_counter() - start
+
+
+def _run():
+    try:
+        seconds = warm_caches()
+    except Exception:
+        # Never fatal: the sessions simply fill the caches themselves
+        logger.exception("Cache warm-up failed")
+        return
+
+    if profiling.env_enabled():
+        profiling.append_log({'event': 'warmup', 'ms': round(seconds * 1000, 2)})
+
+
+@st.cache_resource
+def start_warmup():
+    """
+    Start the warm-up thread once per server process.
+
+    Returns:
+        The started thread, or None when WARMUP_ON_START is off
+    """
+    if not WARMUP_ON_START:
+        return None
+
+    # No script context on purpose: it belongs to the visitor whose rerun started
+    # the thread, and anything the loaders emit (st.error, cache spinners) would be
+    # drawn into that session after its rerun ended. Without one they are no-ops
+    logging.getLogger('streamlit.runtime.scriptrunner_utils.script_run_context').addFilter(
+        _MissingContextFilter()
+    )
+    thread = threading.Thread(target=_run, name=THREAD_NAME, daemon=True)
+    thread.start()
+    return thread
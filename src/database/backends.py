@@ -0,0 +1,115 @@
+"""
+Query backends behind src/data/loader.load_data.
+
+Both run the same SQL (the query catalog in queries.py and the statements
+built by repository.py); DATA_BACKEND in config/settings.py picks one.
+"""
+import threading
+
+import pandas as pd
+
+from src.database.connection import ConnectionPool
+from src.database.parquet_store import ParquetStore
+
+
+class SQLiteBackend:
+    """Row-oriented execution on antt.db through the read-only connection pool."""
+
+    name = 'sqlite'
+    errors = (pd.errors.DatabaseError,)
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+
+    def read_sql(self, query: str, params: tuple) -> pd.DataFrame:
+        """
+        Run a query on a pooled connection, reopening once if the file changed mid-read.
+
+        Args:
+            query: SQL query string
+            params: Values bound to the query's ? placeholders
+
+        Returns:
+            DataFrame with query results
+        """
+        try:
+            with self.pool.connection() as conn:
+                return pd.read_sql_query(query, conn, params=params)
+        except pd.errors.DatabaseError:
+            self.pool.invalidate()
+            with self.pool.connection() as conn:
+                return pd.read_sql_query(query, conn, params=params)
+
+
+class DuckDBBackend:
+    """
+    Vectorized, columnar execution with DuckDB over the Parquet copy.
+
+    Every table of the copy is loaded into DuckDB's in-memory columnar storage
+    (or, with in_memory=False, exposed as a view over its files), without the
+    ferrovia/ano partition fields so the schema matches SQLite. Aggregations
+    and joins only touch the columns they use, in parallel. Results are
+    returned as Arrow-backed DataFrames, without a conversion to NumPy.
+    Tables are reloaded when the ETL publishes a new copy.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, store: ParquetStore, threads=None, in_memory: bool = True):
+        import duckdb  # optional dependency, only needed for this backend
+
+        self.store = store
+        self.in_memory = in_memory
+        self.errors = (duckdb.Error,)
+        self._io_errors = (duckdb.IOException, duckdb.InvalidInputException)
+
+        config = {} if threads is None else {'threads': int(threads)}
+        self._conn = duckdb.connect(':memory:', config=config)
+        self._lock = threading.Lock()
+        self._identity = None
+
+    def _view_sql(self, table: str, info: dict) -> str:
+        path = self.store.table_path(table).replace("'", "''")
+        if info['partitioned']:
+            return (
+                f"SELECT * EXCLUDE (ferrovia, ano) "
+                f"FROM read_parquet('{path}/**/*.parquet', hive_partitioning = true)"
+            )
+        return f"SELECT * FROM read_parquet('{path}/*.parquet')"
+
+    def _refresh_tables(self, force: bool = False):
+        """Load (or point the views at) the current copy (lock held)."""
+        identity = self.store.build_identity()
+        if identity == self._identity and not force:
+            return
+        kind = 'TABLE' if self.in_memory else 'VIEW'
+        for table, info in self.store.tables().items():
+            self._conn.execute(f"CREATE OR REPLACE {kind} {table} AS {self._view_sql(table, info)}")
+        self._identity = identity
+
+    def _execute(self, query: str, params: tuple, force_refresh: bool = False) -> pd.DataFrame:
+        with self._lock:
+            self._refresh_tables(force_refresh)
+            # One cursor per query: cursors are independent connections to the same database
+            cursor = self._conn.cursor()
+        try:
+            arrow_table = cursor.execute(query, list(params)).to_arrow_table()
+        finally:
+            cursor.close()
+        return arrow_table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def read_sql(self, query: str, params: tuple) -> pd.DataFrame:
+        """
+        Run a query on a fresh cursor, retrying once if the copy was swapped mid-read.
+
+        Args:
+            query: SQL query string
+            params: Values bound to the query's ? placeholders
+
+        Returns:
+            Arrow-backed DataFrame with query results
+        """
+        try:
+            return self._execute(query, params)
+        except self._io_errors:
+            return self._execute(query, params, force_refresh=True)
@@ -0,0 +1,119 @@
+"""
+Read-only SQLite connection pool shared by all Streamlit sessions.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of read-only connections to the ETL database.
+
+    Connections are opened with ``mode=ro`` and a memory-mapped I/O window, so
+    concurrent cache misses skip the connect and schema parse. The file
+    identity (inode, size, mtime) is checked on every checkout: when the ETL
+    swaps in a new ``antt.db`` the pool is drained and new connections are
+    opened on the new file.
+
+    ``immutable=1`` skips SQLite's locking and change detection altogether. It
+    is only safe when the file is never written after it is published (bulk
+    swap with no later writes): the incremental ETL, the run manifest and the
+    telemetry all write to the live database, and an immutable connection to a
+    file that changes may return wrong results or SQLITE_CORRUPT.
+    """
+
+    def __init__(self, db_path: str, max_size: int = 4,
+                 mmap_size: int = 256 * 1024 * 1024, immutable: bool = False):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.mmap_size = mmap_size
+        self.immutable = immutable
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle = []
+        self._identity = None
+        self._generation = 0
+
+    def file_identity(self) -> tuple:
+        """
+        Identity of the database file as it is on disk right now.
+        
+        Returns:
+            (device, inode, size, mtime_ns); changes whenever the ETL writes or swaps the file
+        """
+        stat = os.stat(self.db_path)
+        return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _uri(self) -> str:
+        uri = f"{Path(os.path.abspath(self.db_path)).as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def _open(self) -> sqlite3.Connection:
+        # Checked out by one thread at a time, but not always the one that opened it
+        conn = sqlite3.connect(self._uri(), uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _refresh_if_swapped(self):
+        """Drop idle connections when the database file changed on disk (lock held)."""
+        identity = self.file_identity()
+        if identity != self._identity:
+            self._close_idle()
+            self._identity = identity
+            self._generation += 1
+
+    def _close_idle(self):
+        for conn in self._idle:
+            conn.close()
+        self._idle = []
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of the ``with`` block.
+
+        Yields:
+            Read-only sqlite3 connection
+        """
+        self._slots.acquire()
+        conn = None
+        try:
+            with self._lock:
+                self._refresh_if_swapped()
+                generation = self._generation
+                conn = self._idle.pop() if self._idle else None
+
+            if conn is None:
+                conn = self._open()
+
+            yield conn
+
+        except Exception:
+            # Possibly broken or replaced under our feet (pandas wraps sqlite3
+            # errors in its own DatabaseError): never hand this connection out again
+            if conn is not None:
+                conn.close()
+                conn = None
+            raise
+
+        finally:
+            if conn is not None:
+                with self._lock:
+                    if generation == self._generation:
+                        self._idle.append(conn)
+                    else:
+                        conn.close()
+            self._slots.release()
+
+    def invalidate(self):
+        """Force every connection to be reopened on the next checkout."""
+        with self._lock:
+            self._close_idle()
+            self._identity = None
@@ -0,0 +1,176 @@
+"""
+Read access to the partitioned Parquet copy of the database (db/parquet_store.py).
+"""
+import json
+import operator
+import os
+import threading
+
+import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+BUILD_FILE = '_build.json'
+
+# Comparison operators accepted in scan filters, besides 'in' and 'not null'
+OPERATORS = {
+    '=': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+}
+
+
+def filter_expression(filters: tuple, comparisons: tuple = ()):
+    """
+    Combine scan predicates into one Arrow expression.
+
+    Args:
+        filters: (column, op, value) with op in OPERATORS, 'in' or 'not null'
+        comparisons: (column, op, other_column) with op in OPERATORS
+
+    Returns:
+        pyarrow.compute.Expression, or None when there is nothing to filter
+    """
+    terms = []
+    for column, op, value in filters:
+        field = pc.field(column)
+        if op == 'not null':
+            terms.append(field.is_valid())
+        elif op == 'in':
+            terms.append(field.isin(list(value)))
+        else:
+            terms.append(OPERATORS[op](field, value))
+
+    for column, op, other in comparisons:
+        terms.append(OPERATORS[op](pc.field(column), pc.field(other)))
+
+    expression = None
+    for term in terms:
+        expression = term if expression is None else expression & term
+    return expression
+
+
+class ParquetStore:
+    """
+    Thread-safe cache of Arrow datasets over the Parquet copy published by the ETL.
+
+    Each table is a directory; fact tables are hive-partitioned by ferrovia and
+    ano, so a concession filter only opens that concession's files. Datasets
+    (file listing and schema) are discovered once and rediscovered when the
+    ETL publishes a new copy, detected through the identity of _build.json.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        self._datasets = {}
+        self._identity = None
+
+    def available(self) -> bool:
+        """
+        Check whether a complete copy has been published.
+
+        Returns:
+            True if the build file exists under root
+        """
+        return os.path.exists(os.path.join(self.root, BUILD_FILE))
+
+    def build_identity(self) -> tuple:
+        """
+        Identity of the published copy.
+
+        Returns:
+            (inode, mtime_ns) of the build file; changes on every ETL export
+        """
+        stat = os.stat(os.path.join(self.root, BUILD_FILE))
+        return (stat.st_ino, stat.st_mtime_ns)
+
+    def tables(self) -> dict:
+        """
+        Tables in the published copy.
+
+        Returns:
+            {table: {'rows': ..., 'partitioned': ...}} from the build file
+        """
+        with open(os.path.join(self.root, BUILD_FILE), encoding='utf-8') as f:
+            return json.load(f)['tables']
+
+    def table_path(self, table: str) -> str:
+        return os.path.join(self.root, table)
+
+    def dataset(self, table: str) -> ds.Dataset:
+        """
+        Dataset of one table, discovered on first use.
+
+        Args:
+            table: Table name (directory under root)
+
+        Returns:
+            pyarrow Dataset with hive partition fields
+        """
+        with self._lock:
+            identity = self.build_identity()
+            if identity != self._identity:
+                self._datasets = {}
+                self._identity = identity
+
+            if table not in self._datasets:
+                self._datasets[table] = ds.dataset(
+                    self.table_path(table), format='parquet', partitioning='hive'
+                )
+            return self._datasets[table]
+
+    def invalidate(self):
+        """Force every dataset to be rediscovered on the next scan."""
+        with self._lock:
+            self._datasets = {}
+            self._identity = None
+
+    def scan(self, table: str, columns: tuple = (), filters: tuple = (),
+             comparisons: tuple = (), order_by: tuple = (), limit=None) -> pd.DataFrame:
+        """
+        Read one table with projection and predicate pushdown.
+
+        Only the projected and filtered columns are decoded; predicates on the
+        partition fields skip whole files, the others use row-group statistics.
+
+        Args:
+            table: Table name
+            columns: (alias, column) pairs to read; all columns when empty
+            filters: (column, op, value) predicates, see filter_expression
+            comparisons: (column, op, other_column) predicates
+            order_by: (output column, descending) pairs
+            limit: Maximum number of rows
+
+        Returns:
+            DataFrame with the selected columns
+        """
+        dataset = self.dataset(table)
+        projection = {alias: pc.field(column) for alias, column in columns} or None
+        expression = filter_expression(filters, comparisons)
+
+        # Sort keys that are not selected are read, then dropped
+        sort_only = []
+        if projection is not None:
+            sort_only = [column for column, _ in order_by if column not in projection]
+            projection.update((column, pc.field(column)) for column in sort_only)
+
+        if limit is not None and not order_by:
+            arrow_table = dataset.head(int(limit), columns=projection, filter=expression)
+        else:
+            arrow_table = dataset.to_table(columns=projection, filter=expression)
+            if order_by:
+                arrow_table = arrow_table.sort_by([
+                    (column, 'descending' if descending else 'ascending')
+                    for column, descending in order_by
+                ])
+            if limit is not None:
+                arrow_table = arrow_table.slice(0, int(limit))
+            if sort_only:
+                arrow_table = arrow_table.drop_columns(sort_only)
+
+        # Numeric columns without nulls are handed over without a copy
+        return arrow_table.to_pandas(split_blocks=True, self_destruct=True)
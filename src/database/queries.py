@@ -97,3 +97,12 @@ QUERY_SPEED_CLEAN_DATA = """
       AND vmc_trem_carregado_vmc_km_h > 0
       AND vma_trem_carregado_vma_km_h >= vmc_trem_carregado_vmc_km_h
 """
+
+# ============================================================================
+# PRE-AGGREGATED SUMMARIES (built at ETL time by db/summaries.py)
+# ============================================================================
+
+QUERY_SUMMARY_VERSION = """
+    SELECT MAX(versao) as versao
+    FROM resumo_versao
+"""
@@ -0,0 +1,756 @@
+"""
+Parameterized queries over the star schema.
+
+Filters, ordering and LIMIT are pushed into SQLite with bound parameters, so a
+page only receives the rows it shows. Page aggregates come from the small
+summary tables built by the ETL, which keep the concession (ferrovia, ano) in
+their grain: without a concession filter their rows are summed, with one the
+filter is a WHERE on them. The fact tables are only aggregated for parameters
+the summaries cannot answer (e.g. a custom time threshold).
+
+Single-table reads are described as a TableScan: when DATA_BACKEND reads the
+Parquet copy they are served from it, reading only the projected columns.
+"""
+import pandas as pd
+import streamlit as st
+
+from config.settings import CACHE_MAX_ENTRIES
+from src.data.dtypes import CATEGORY, FLOAT, INT, TEXT
+from src.data.loader import get_data_version, load_data, load_table, scans_use_parquet
+from src.database.parquet_store import OPERATORS
+from src.utils.intervals import SegmentIndex
+from src.utils.network import RailNetwork
+
+# Summary tables carry ferrovia/ano as columns: the concession filter needs no join
+SUMMARY_PREFIX = 'resumo_'
+
+
+class SelectQuery:
+    """
+    Minimal SELECT builder: every value goes through a bound parameter.
+
+    Example:
+        SelectQuery('patios p').select('p.patio').where('p.tempo_medio_licenc_min > ?', 0)
+    """
+
+    def __init__(self, source: str, *params):
+        # params: bound values of a subquery used as source
+        self.source = source
+        self._source_params = list(params)
+        self._columns = []
+        self._joins = []
+        self._join_params = []
+        self._where = []
+        self._params = []
+        self._group_by = []
+        self._order_by = []
+        self._limit = None
+
+    def select(self, *columns: str) -> 'SelectQuery':
+        self._columns.extend(columns)
+        return self
+
+    def join(self, table: str, on: str, *params) -> 'SelectQuery':
+        self._joins.append(f"JOIN {table} ON {on}")
+        self._join_params.extend(params)
+        return self
+
+    def where(self, condition: str, *params) -> 'SelectQuery':
+        self._where.append(condition)
+        self._params.extend(params)
+        return self
+
+    def where_eq(self, column: str, value) -> 'SelectQuery':
+        """Equality filter, skipped when value is None."""
+        if value is not None:
+            self.where(f"{column} = ?", value)
+        return self
+
+    def where_in(self, column: str, values) -> 'SelectQuery':
+        """IN filter, skipped when values is None."""
+        if values is not None:
+            values = list(values)
+            placeholders = ", ".join("?" * len(values)) or "NULL"
+            self.where(f"{column} IN ({placeholders})", *values)
+        return self
+
+    def group_by(self, *columns: str) -> 'SelectQuery':
+        self._group_by.extend(columns)
+        return self
+
+    def order_by(self, column: str, descending: bool = False) -> 'SelectQuery':
+        self._order_by.append(f"{column} {'DESC' if descending else 'ASC'}")
+        return self
+
+    def limit(self, n) -> 'SelectQuery':
+        self._limit = None if n is None else int(n)
+        return self
+
+    def build(self) -> tuple:
+        """
+        Render the statement.
+
+        Returns:
+            (sql, params) ready for load_data
+        """
+        parts = [f"SELECT {', '.join(self._columns) or '*'}", f"FROM {self.source}"]
+        parts.extend(self._joins)
+        if self._where:
+            parts.append("WHERE " + " AND ".join(f"({c})" for c in self._where))
+        if self._group_by:
+            parts.append("GROUP BY " + ", ".join(self._group_by))
+        if self._order_by:
+            parts.append("ORDER BY " + ", ".join(self._order_by))
+
+        params = self._source_params + self._join_params + self._params
+        if self._limit is not None:
+            parts.append("LIMIT ?")
+            params.append(self._limit)
+
+        return "\n".join(parts), tuple(params)
+
+
+class TableScan:
+    """
+    Single-table read: projection, simple predicates, concession filter, ORDER BY and LIMIT.
+
+    Runs on SQLite through to_select(), or on the Parquet copy through spec(),
+    where fact tables carry ferrovia/ano as partition fields and summary
+    tables as columns.
+
+    Example:
+        TableScan('trechos_fisicos').select('linha', vma='vma_trem_carregado_vma_km_h')
+    """
+
+    def __init__(self, table: str):
+        self.table = table
+        self._columns = []
+        self._filters = []
+        self._comparisons = []
+        self._concession = {}
+        self._order_by = []
+        self._limit = None
+
+    def select(self, *columns: str, **aliases: str) -> 'TableScan':
+        """Columns to read; keyword arguments rename (alias=column)."""
+        self._columns.extend((column, column) for column in columns)
+        self._columns.extend(aliases.items())
+        return self
+
+    def where(self, column: str, op: str, value=None) -> 'TableScan':
+        """Predicate on a source column: op is a comparison, 'in' or 'not null'."""
+        if op not in OPERATORS and op not in ('in', 'not null'):
+            raise ValueError(f"Unsupported scan operator: {op}")
+        if op == 'in':
+            value = tuple(value)
+        self._filters.append((column, op, value))
+        return self
+
+    def where_eq(self, column: str, value) -> 'TableScan':
+        """Equality filter, skipped when value is None."""
+        if value is not None:
+            self.where(column, '=', value)
+        return self
+
+    def where_in(self, column: str, values) -> 'TableScan':
+        """IN filter, skipped when values is None."""
+        if values is not None:
+            self.where(column, 'in', values)
+        return self
+
+    def where_column(self, column: str, op: str, other: str) -> 'TableScan':
+        """Compare two source columns of the same row."""
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported scan operator: {op}")
+        self._comparisons.append((column, op, other))
+        return self
+
+    def concession(self, ferrovia=None, ano=None) -> 'TableScan':
+        """Concession filter; None values are skipped."""
+        self._concession = {
+            column: value
+            for column, value in (('ferrovia', ferrovia), ('ano', ano))
+            if value is not None
+        }
+        return self
+
+    def order_by(self, column: str, descending: bool = False) -> 'TableScan':
+        """Sort on an output column (alias)."""
+        self._order_by.append((column, descending))
+        return self
+
+    def limit(self, n) -> 'TableScan':
+        self._limit = None if n is None else int(n)
+        return self
+
+    def spec(self) -> dict:
+        """
+        Hashable description for load_table.
+
+        Returns:
+            Keyword arguments of load_table; the concession becomes a
+            filter on the ferrovia/ano partition fields
+        """
+        concession = tuple((column, '=', value) for column, value in self._concession.items())
+        return {
+            'table': self.table,
+            'columns': tuple(self._columns),
+            'filters': tuple(self._filters) + concession,
+            'comparisons': tuple(self._comparisons),
+            'order_by': tuple(self._order_by),
+            'limit': self._limit,
+        }
+
+    def to_select(self) -> SelectQuery:
+        """
+        Equivalent SQLite query.
+
+        Returns:
+            SelectQuery joining dim_concessoes when a concession filter is set
+        """
+        query = SelectQuery(f"{self.table} s").select(*(
+            f"s.{column}" if alias == column else f"s.{column} as {alias}"
+            for alias, column in self._columns
+        ))
+        for column, op, value in self._filters:
+            if op == 'not null':
+                query.where(f"s.{column} IS NOT NULL")
+            elif op == 'in':
+                query.where_in(f"s.{column}", value)
+            else:
+                query.where(f"s.{column} {op} ?", value)
+        for column, op, other in self._comparisons:
+            query.where(f"s.{column} {op} s.{other}")
+
+        if self.table == 'dim_concessoes' or self.table.startswith(SUMMARY_PREFIX):
+            for column, value in self._concession.items():
+                query.where_eq(f"s.{column}", value)
+        else:
+            _filter_concession(query, "s", **self._concession)
+
+        for column, descending in self._order_by:
+            query.order_by(column, descending)
+        return query.limit(self._limit)
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _fetch(query, dtypes: dict) -> pd.DataFrame:
+    """Run a SelectQuery or TableScan through the cached loader, typed by its schema."""
+    schema = tuple(dtypes.items())
+    if isinstance(query, TableScan):
+        if scans_use_parquet():
+            return load_table(**query.spec(), schema=schema)
+        query = query.to_select()
+
+    sql, params = query.build()
+    return load_data(sql, params, schema)
+
+
+def _as_list(value):
+    """Accept a single value or a collection for IN filters."""
+    if value is None or isinstance(value, (list, tuple, set)):
+        return value
+    return [value]
+
+
+def _is_filtered(ferrovia, ano) -> bool:
+    return ferrovia is not None or ano is not None
+
+
+def _filter_concession(query: SelectQuery, alias: str, ferrovia=None, ano=None) -> SelectQuery:
+    """Join dim_concessoes only when a concession filter is set."""
+    if _is_filtered(ferrovia, ano):
+        query.join("dim_concessoes c", f"c.id_concessao = {alias}.id_concessao")
+        query.where_eq("c.ferrovia", ferrovia).where_eq("c.ano", ano)
+    return query
+
+
+def _filter_summary(query: SelectQuery, alias: str, ferrovia=None, ano=None) -> SelectQuery:
+    """Concession filter on a summary table, which has ferrovia/ano itself."""
+    return query.where_eq(f"{alias}.ferrovia", ferrovia).where_eq(f"{alias}.ano", ano)
+
+
+# ============================================================================
+# FILTER OPTIONS
+# ============================================================================
+
+def concessions() -> pd.DataFrame:
+    """
+    Concessions (railway, year) available in the database.
+
+    Returns:
+        DataFrame with ferrovia and ano
+    """
+    query = (
+        TableScan("dim_concessoes")
+        .select("ferrovia", "ano")
+        .order_by("ferrovia")
+        .order_by("ano", descending=True)
+    )
+    return _fetch(query, {'ferrovia': CATEGORY, 'ano': INT})
+
+
+# ============================================================================
+# PAGE 1: YARDS
+# ============================================================================
+
+def yards(ferrovia=None, ano=None, linha=None) -> pd.DataFrame:
+    """
+    Yard rows with operational status and licensing time.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        linha: Reference line filter
+
+    Returns:
+        DataFrame with em_operacao, tempo_medio_licenc_min and patio
+    """
+    if linha is not None:
+        query = (
+            SelectQuery("patios p")
+            .select("p.em_operacao", "p.tempo_medio_licenc_min", "p.patio")
+            .join("dim_linhas l", "l.id_linha = p.id_linha")
+            .where("p.em_operacao IS NOT NULL")
+            .where_eq("l.nome_linha", linha)
+        )
+        _filter_concession(query, "p", ferrovia, ano)
+    else:
+        query = (
+            TableScan("patios")
+            .select("em_operacao", "tempo_medio_licenc_min", "patio")
+            .where("em_operacao", "not null")
+            .concession(ferrovia, ano)
+        )
+
+    return _fetch(query, {
+        'em_operacao': CATEGORY,
+        'tempo_medio_licenc_min': FLOAT,
+        'patio': TEXT
+    })
+
+
+def yards_by_status(ferrovia=None, ano=None) -> pd.DataFrame:
+    """
+    Average licensing time and yard count per operational status.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+
+    Returns:
+        DataFrame with em_operacao, tempo_medio_licenc_min and qtd_patios
+    """
+    query = (
+        SelectQuery("resumo_patios_situacao r")
+        .select(
+            "r.em_operacao",
+            "SUM(r.soma_tempo_licenc_min) / NULLIF(SUM(r.qtd_tempo_licenc), 0) as tempo_medio_licenc_min",
+            "SUM(r.qtd_patios) as qtd_patios"
+        )
+        .group_by("r.em_operacao")
+        .order_by("qtd_patios", descending=True)
+    )
+    _filter_summary(query, "r", ferrovia, ano)
+    return _fetch(query, {
+        'em_operacao': CATEGORY,
+        'tempo_medio_licenc_min': FLOAT,
+        'qtd_patios': INT
+    })
+
+
+def yards_by_line(ferrovia=None, ano=None, min_time: float = 0, limit=None) -> pd.DataFrame:
+    """
+    Average licensing time per reference line, slowest first.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        min_time: Only yards with licensing time above this value (minutes)
+        limit: Maximum number of lines
+
+    Returns:
+        DataFrame with nome_linha, tempo_medio and qtd_patios
+    """
+    if min_time != 0:
+        # The summary covers yards with time > 0 only; other thresholds go to the facts
+        query = (
+            SelectQuery("patios p")
+            .select(
+                "l.nome_linha",
+                "AVG(p.tempo_medio_licenc_min) as tempo_medio",
+                "COUNT(p.patio) as qtd_patios"
+            )
+            .join("dim_linhas l", "p.id_linha = l.id_linha")
+            .where("p.tempo_medio_licenc_min > ?", min_time)
+            .group_by("l.nome_linha")
+        )
+        _filter_concession(query, "p", ferrovia, ano)
+    else:
+        query = (
+            SelectQuery("resumo_patios_linha r")
+            .select(
+                "r.nome_linha",
+                "SUM(r.soma_tempo_licenc_min) / SUM(r.qtd_tempo_licenc) as tempo_medio",
+                "SUM(r.qtd_patios) as qtd_patios"
+            )
+            .group_by("r.nome_linha")
+        )
+        _filter_summary(query, "r", ferrovia, ano)
+
+    query.order_by("tempo_medio", descending=True).order_by("nome_linha").limit(limit)
+    return _fetch(query, {'nome_linha': CATEGORY, 'tempo_medio': FLOAT, 'qtd_patios': INT})
+
+
+# ============================================================================
+# PAGE 2: TERMINAL CAPACITY
+# ============================================================================
+
+def capacity_by_commodity(ferrovia=None, ano=None, mercadoria=None, limit=None) -> pd.DataFrame:
+    """
+    Total terminal capacity per commodity, with its sector.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        mercadoria: Commodity name(s) filter
+        limit: Maximum number of commodities
+
+    Returns:
+        DataFrame with nome, capacidade_total and setor, largest first
+    """
+    query = (
+        SelectQuery("resumo_capacidade_mercadoria r")
+        .select("r.nome", "SUM(r.capacidade_total) as capacidade_total", "r.setor")
+        .where_in("r.nome", _as_list(mercadoria))
+        .group_by("r.nome", "r.setor")
+        .order_by("capacidade_total", descending=True)
+        .limit(limit)
+    )
+    _filter_summary(query, "r", ferrovia, ano)
+    return _fetch(query, {'nome': TEXT, 'capacidade_total': FLOAT, 'setor': CATEGORY})
+
+
+def capacity_by_sector(ferrovia=None, ano=None) -> pd.DataFrame:
+    """
+    Total terminal capacity per sector, largest first.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+
+    Returns:
+        DataFrame with setor and capacidade_total
+    """
+    query = (
+        SelectQuery("resumo_capacidade_setor r")
+        .select("r.setor", "SUM(r.capacidade_total) as capacidade_total")
+        .group_by("r.setor")
+        .order_by("capacidade_total", descending=True)
+    )
+    _filter_summary(query, "r", ferrovia, ano)
+    return _fetch(query, {'setor': CATEGORY, 'capacidade_total': FLOAT})
+
+
+def top_terminals(limit: int = 15, ferrovia=None, ano=None, min_capacity: float = 0) -> pd.DataFrame:
+    """
+    Commodity breakdown of the terminals with the largest total capacity.
+
+    Args:
+        limit: Number of terminals in the ranking
+        ferrovia: Railway filter
+        ano: Year filter
+        min_capacity: Only rows with capacity above this value (wagons/day);
+            the summary holds positive capacities only
+
+    Returns:
+        DataFrame with terminal, mercadoria, capacidade_vg_dia and setor
+    """
+    # Ranked over the selected concessions, then their commodity rows
+    ranking = (
+        SelectQuery("resumo_capacidade_terminal r")
+        .select("r.terminal", "SUM(r.capacidade_vg_dia) as capacidade_terminal")
+        .where("r.capacidade_vg_dia > ?", min_capacity)
+        .group_by("r.terminal")
+        .order_by("capacidade_terminal", descending=True)
+        .order_by("r.terminal")
+        .limit(limit)
+    )
+    _filter_summary(ranking, "r", ferrovia, ano)
+    ranking_sql, ranking_params = ranking.build()
+
+    query = (
+        SelectQuery("resumo_capacidade_terminal t")
+        .select("t.terminal", "t.mercadoria", "t.capacidade_vg_dia", "t.setor")
+        .join(f"({ranking_sql}) k", "k.terminal = t.terminal", *ranking_params)
+        .where("t.capacidade_vg_dia > ?", min_capacity)
+        .order_by("k.capacidade_terminal", descending=True)
+        .order_by("t.terminal")
+        .order_by("t.capacidade_vg_dia", descending=True)
+        .order_by("t.mercadoria")
+    )
+    _filter_summary(query, "t", ferrovia, ano)
+    return _fetch(query, {
+        'terminal': TEXT,
+        'mercadoria': CATEGORY,
+        'capacidade_vg_dia': FLOAT,
+        'setor': CATEGORY
+    })
+
+
+# ============================================================================
+# PAGE 3: SPEED ANALYSIS
+# ============================================================================
+
+SPEED_COLUMNS = {
+    'vma': 'vma_trem_carregado_vma_km_h',
+    'vmc': 'vmc_trem_carregado_vmc_km_h',
+}
+
+
+def load_vs_speed(speed: str = 'vma', ferrovia=None, ano=None) -> pd.DataFrame:
+    """
+    Average speed per axle load.
+
+    Args:
+        speed: 'vma' (authorized) or 'vmc' (commercial)
+        ferrovia: Railway filter
+        ano: Year filter
+
+    Returns:
+        DataFrame with carga_eixo and <speed>_media, ordered by load
+    """
+    if speed not in SPEED_COLUMNS:
+        raise ValueError(f"Unknown speed column: {speed}")
+    media = f"{speed}_media"
+
+    query = (
+        SelectQuery("resumo_carga_velocidade r")
+        .select("r.carga_eixo", f"SUM(r.soma_{speed}) / SUM(r.qtd_{speed}) as {media}")
+        .where(f"r.qtd_{speed} > 0")
+        .group_by("r.carga_eixo")
+        .order_by("carga_eixo")
+    )
+    _filter_summary(query, "r", ferrovia, ano)
+    return _fetch(query, {'carga_eixo': FLOAT, media: FLOAT})
+
+
+def speed_anomalies(ferrovia=None, ano=None, limit=None) -> pd.DataFrame:
+    """
+    Segments where the commercial speed exceeds the authorized one.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        limit: Maximum number of rows
+
+    Returns:
+        DataFrame with linha, vma and vmc
+    """
+    query = (
+        TableScan("trechos_fisicos")
+        .select("linha", vma=SPEED_COLUMNS['vma'], vmc=SPEED_COLUMNS['vmc'])
+        .where_column(SPEED_COLUMNS['vmc'], ">", SPEED_COLUMNS['vma'])
+        .concession(ferrovia, ano)
+        .limit(limit)
+    )
+    return _fetch(query, {'linha': CATEGORY, 'vma': FLOAT, 'vmc': FLOAT})
+
+
+def speed_efficiency(ferrovia=None, ano=None, max_efficiency=None) -> pd.DataFrame:
+    """
+    Consistent segments (VMA >= VMC) with efficiency and status.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        max_efficiency: Only segments at or below this efficiency (%)
+
+    Returns:
+        DataFrame with linha, vma, vmc, eficiencia and status
+    """
+    dtypes = {
+        'linha': CATEGORY,
+        'vma': FLOAT,
+        'vmc': FLOAT,
+        'eficiencia': FLOAT,
+        'status': CATEGORY
+    }
+
+    query = TableScan("resumo_eficiencia_trechos").select(*dtypes).concession(ferrovia, ano)
+    if max_efficiency is not None:
+        query.where("eficiencia", "<=", max_efficiency)
+    return _fetch(query, dtypes)
+
+
+def corridor_efficiency(ferrovia=None, ano=None, ascending: bool = True, limit=None) -> pd.DataFrame:
+    """
+    Average speeds and efficiency per line.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        ascending: Worst corridors first when True
+        limit: Maximum number of corridors
+
+    Returns:
+        DataFrame with linha, vma, vmc and eficiencia
+    """
+    query = (
+        SelectQuery("resumo_eficiencia_linha r")
+        .select(
+            "r.linha",
+            "SUM(r.soma_vma) / SUM(r.qtd_trechos) as vma",
+            "SUM(r.soma_vmc) / SUM(r.qtd_trechos) as vmc",
+            "SUM(r.soma_vmc) * 100.0 / SUM(r.soma_vma) as eficiencia"
+        )
+        .group_by("r.linha")
+    )
+    _filter_summary(query, "r", ferrovia, ano)
+
+    query.order_by("eficiencia", descending=not ascending).limit(limit)
+    return _fetch(query, {'linha': CATEGORY, 'vma': FLOAT, 'vmc': FLOAT, 'eficiencia': FLOAT})
+
+
+# ============================================================================
+# TRACK SEGMENTS
+# ============================================================================
+
+SEGMENT_DTYPES = {
+    'linha': CATEGORY,
+    'atributo': CATEGORY,
+    'km_inicio': FLOAT,
+    'km_fim': FLOAT,
+    'valor_num': FLOAT,
+    'valor_texto': TEXT,
+}
+
+
+def track_segments(ferrovia=None, ano=None, linha=None) -> pd.DataFrame:
+    """
+    Track attributes (speeds, axle load, rail profile...) per km range.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+        linha: Line filter
+
+    Returns:
+        DataFrame with linha, atributo, km_inicio, km_fim, valor_num and valor_texto
+    """
+    query = (
+        TableScan("trechos_segmentos")
+        .select(*SEGMENT_DTYPES)
+        .where_eq("linha", linha)
+        .concession(ferrovia, ano)
+    )
+    return _fetch(query, SEGMENT_DTYPES)
+
+
+def segment_index(ferrovia=None, ano=None) -> SegmentIndex:
+    """
+    Interval index over track_segments, shared by all sessions.
+
+    Args:
+        ferrovia: Railway filter
+        ano: Year filter
+
+    Returns:
+        SegmentIndex answering "what applies at km X of line Y"
+    """
+    return _segment_index(ferrovia, ano, get_data_version())
+
+
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES)
+def _segment_index(ferrovia, ano, data_version: str) -> SegmentIndex:
+    # Read-only once built: one instance per (filters, data version), not a copy per session
+    return SegmentIndex(track_segments(ferrovia=ferrovia, ano=ano))
+
+
+# ============================================================================
+# RAILWAY NETWORK
+# ============================================================================
+
+def network_yards() -> pd.DataFrame:
+    """
+    Graph nodes: yards of every concession with their CSR edge offsets.
+
+    Returns:
+        DataFrame with id_no, id_concessao, ferrovia, ano, codigo, nome and aresta_inicio
+    """
+    query = (
+        SelectQuery("grafo_patios g")
+        .select(
+            "g.id_no", "g.id_concessao", "c.ferrovia", "c.ano",
+            "g.codigo", "g.nome", "g.aresta_inicio"
+        )
+        .join("dim_concessoes c", "c.id_concessao = g.id_concessao")
+        .order_by("g.id_no")
+    )
+    return _fetch(query, {
+        'id_no': INT,
+        'id_concessao': INT,
+        'ferrovia': CATEGORY,
+        'ano': INT,
+        'codigo': TEXT,
+        'nome': TEXT,
+        'aresta_inicio': INT
+    })
+
+
+def network_edges() -> pd.DataFrame:
+    """
+    Graph edges in CSR order (by origin yard), one per direction with traffic.
+
+    Returns:
+        DataFrame with id_aresta, id_no_origem, id_no_destino, sentido, tempo_min,
+        extensao_km, capacidade_instalada, capacidade_ociosa and utilizacao
+    """
+    dtypes = {
+        'id_aresta': INT,
+        'id_no_origem': INT,
+        'id_no_destino': INT,
+        'sentido': CATEGORY,
+        'tempo_min': FLOAT,
+        'extensao_km': FLOAT,
+        'capacidade_instalada': FLOAT,
+        'capacidade_ociosa': FLOAT,
+        'utilizacao': FLOAT
+    }
+    query = TableScan("grafo_arestas").select(*dtypes).order_by("id_aresta")
+    return _fetch(query, dtypes)
+
+
+def network_terminals() -> pd.DataFrame:
+    """
+    Terminals attached to the graph through their reference yard.
+
+    Returns:
+        DataFrame with id_concessao, terminal and id_no
+    """
+    query = (
+        TableScan("grafo_terminais")
+        .select("id_concessao", "terminal", "id_no")
+        .order_by("id_concessao")
+        .order_by("terminal")
+        .order_by("id_no")
+    )
+    return _fetch(query, {'id_concessao': INT, 'terminal': TEXT, 'id_no': INT})
+
+
+def rail_network() -> RailNetwork:
+    """
+    Railway graph of every concession, shared by all sessions.
+
+    Returns:
+        RailNetwork for shortest routes, bottlenecks and reachability
+    """
+    return _rail_network(get_data_version())
+
+
+@st.cache_resource(max_entries=4)
+def _rail_network(data_version: str) -> RailNetwork:
+    return RailNetwork(network_yards(), network_edges(), network_terminals())
@@ -3,10 +3,44 @@ Dashboard pages.
 
 Available pages:
 - page_yards: Yard licensing analysis
-- page_capacity: Terminal capacity analysis  
+- page_capacity: Terminal capacity analysis
 - page_speed: Load vs speed relationship analysis
+- page_network: Railway network routes, bottlenecks and reach
+
+Page modules (and Plotly Express with them) are imported on first use, so a
+session only pays for the page it opens; ``from src.pages import page_yards``
+still works and imports that page alone.
 """
+import importlib
+from collections import namedtuple
+
+Page = namedtuple('Page', ['module', 'label_key'])
+
+# Sidebar order: page key -> module name and translation key of its label
+PAGES = {
+    'yards': Page('page_yards', 'analysis_yards'),
+    'capacity': Page('page_capacity', 'analysis_capacity'),
+    'speed': Page('page_speed', 'analysis_speed'),
+    'network': Page('page_network', 'analysis_network'),
+}
+
+__all__ = [page.module for page in PAGES.values()]
+
+
+def get_page(key: str):
+    """
+    Import a page module on first use.
+
+    Args:
+        key: Page key from PAGES
+
+    Returns:
+        Page module exposing render() and warmup()
+    """
+    return importlib.import_module(f"{__name__}.{PAGES[key].module}")
 
-from . import page_yards, page_capacity, page_speed
 
-__all__ = ['page_yards', 'page_capacity', 'page_speed']
\ No newline at end of file
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
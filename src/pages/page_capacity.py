@@ -3,42 +3,40 @@ Page 2: Terminal Capacity by Commodity
 """
 import streamlit as st
 import plotly.express as px
-from src.data.loader import load_data, validate_data
-from src.database.queries import (
-    QUERY_CAPACITY_BY_COMMODITY,
-    QUERY_TERMINAL_FULL_DETAILS
-)
-from src.utils.helpers import classify_sector
+from src.data.loader import validate_data
+from src.data.figure_cache import cached_figure
+from src.database import repository
+from src.utils.profiling import profiled
 from config.settings import SECTOR_COLORS
-from config.translations import get_text, get_sector_name
+from config.translations import get_text, get_sector_name, translate_sectors
 
 
+@profiled
 def render():
     """Render the capacity analysis page."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('capacity_title', lang))
     st.markdown(get_text('capacity_subtitle', lang))
 
-    df_commodities = load_data(QUERY_CAPACITY_BY_COMMODITY)
+    # Already classified by sector
+    df_commodities = repository.capacity_by_commodity(**filters)
 
     if not validate_data(df_commodities):
         st.warning(get_text('capacity_no_data', lang))
         return
 
-    # Add sector classification
-    df_commodities['setor'] = df_commodities['nome'].apply(classify_sector)
-
     # Render KPIs
     _render_kpis(df_commodities)
 
     st.divider()
 
     # Render cargo map
-    _render_cargo_map(df_commodities)
+    _render_cargo_map()
 
     # Render sector analysis
-    _render_sector_analysis(df_commodities)
+    _render_sector_analysis()
 
     st.divider()
 
@@ -46,6 +44,16 @@ def render():
     _render_terminal_ranking()
 
 
+def warmup(lang, ferrovia=None, ano=None):
+    """Preload the queries and figures render() shows for these filters."""
+    repository.capacity_by_commodity(ferrovia=ferrovia, ano=ano)
+    repository.capacity_by_sector(ferrovia=ferrovia, ano=ano)
+    _cargo_map_figure(lang, ferrovia=ferrovia, ano=ano)
+    _market_share_figure(lang, ferrovia=ferrovia, ano=ano)
+    _top_terminals_figure(lang, ferrovia=ferrovia, ano=ano)
+
+
+@profiled
 def _render_kpis(df_commodities):
     """Render key performance indicators."""
     lang = st.session_state.language
@@ -72,17 +80,25 @@ def _render_kpis(df_commodities):
         )
 
 
-def _render_cargo_map(df_commodities):
+@profiled
+def _render_cargo_map():
     """Render treemap visualization of cargo distribution."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.markdown(f"### {get_text('capacity_map_title', lang)}")
+    st.plotly_chart(_cargo_map_figure(lang, **filters), width='stretch')
+
+
+@cached_figure
+def _cargo_map_figure(lang, ferrovia=None, ano=None):
+    """Treemap of capacity by sector and commodity."""
+    df_display = repository.capacity_by_commodity(ferrovia=ferrovia, ano=ano)
 
     # Translate sector names for display
-    df_display = df_commodities.copy()
-    df_display['setor_display'] = df_display['setor'].apply(
-        lambda x: get_sector_name(x, lang)
-    )
+    df_display['setor_display'] = translate_sectors(df_display['setor'], lang)
+    # The treemap aggregates its color column (max), which an unordered category rejects
+    df_display['setor'] = df_display['setor'].astype('string')
 
     fig = px.treemap(
         df_display,
@@ -93,22 +109,21 @@ def _render_cargo_map(df_commodities):
         title=get_text('capacity_treemap_title', lang)
     )
     fig.data[0].textinfo = 'label+text+value'
-    st.plotly_chart(fig, width='stretch')
+    return fig
 
 
-def _render_sector_analysis(df_commodities):
+@profiled
+def _render_sector_analysis():
     """Render sector ranking and market share analysis."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     col1, col2 = st.columns([1, 1])
 
-    df_sector = df_commodities.groupby('setor')['capacidade_total'].sum().reset_index()
-    df_sector = df_sector.sort_values('capacidade_total', ascending=False)
+    df_sector = repository.capacity_by_sector(**filters)
 
     # Translate sector names
-    df_sector['setor_display'] = df_sector['setor'].apply(
-        lambda x: get_sector_name(x, lang)
-    )
+    df_sector['setor_display'] = translate_sectors(df_sector['setor'], lang)
 
     with col1:
         st.write(f"### {get_text('capacity_sector_ranking', lang)}")
@@ -121,51 +136,50 @@ def _render_sector_analysis(df_commodities):
     with col2:
         st.write("---")
         st.markdown(f"**{get_text('capacity_market_share', lang)}**")
-        fig_pie = px.pie(
-            df_sector,
-            values='capacidade_total',
-            names='setor_display',
-            color='setor',
-            color_discrete_map=SECTOR_COLORS,
-            hole=0.4
-        )
-        fig_pie.update_layout(
-            showlegend=False,
-            margin=dict(t=0, b=0, l=0, r=0)
-        )
-        st.plotly_chart(fig_pie, width='stretch')
+        st.plotly_chart(_market_share_figure(lang, **filters), width='stretch')
+
+
+@cached_figure
+def _market_share_figure(lang, ferrovia=None, ano=None):
+    """Donut chart of capacity share per sector."""
+    df_sector = repository.capacity_by_sector(ferrovia=ferrovia, ano=ano)
+    df_sector['setor_display'] = translate_sectors(df_sector['setor'], lang)
+
+    fig_pie = px.pie(
+        df_sector,
+        values='capacidade_total',
+        names='setor_display',
+        color='setor',
+        color_discrete_map=SECTOR_COLORS,
+        hole=0.4
+    )
+    fig_pie.update_layout(
+        showlegend=False,
+        margin=dict(t=0, b=0, l=0, r=0)
+    )
+    return fig_pie
 
 
+@profiled
 def _render_terminal_ranking():
     """Render top terminals by total capacity."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('capacity_largest_terminals', lang))
     st.markdown(get_text('capacity_terminals_desc', lang))
 
-    df_full = load_data(QUERY_TERMINAL_FULL_DETAILS)
+    st.plotly_chart(_top_terminals_figure(lang, **filters), width='stretch')
 
-    if not validate_data(df_full):
-        st.warning(get_text('capacity_no_data', lang))
-        return
 
-    # Calculate ranking
-    ranking = (
-        df_full.groupby('terminal')['capacidade_vg_dia']
-        .sum()
-        .sort_values(ascending=False)
-        .head(15)
-    )
-    top_15_names = ranking.index.tolist()
-
-    # Filter and classify
-    df_top = df_full[df_full['terminal'].isin(top_15_names)].copy()
-    df_top['setor'] = df_top['mercadoria'].apply(classify_sector)
+@cached_figure
+def _top_terminals_figure(lang, ferrovia=None, ano=None):
+    """Stacked bars of the 15 largest terminals, split by commodity."""
+    # Ranking computed in SQL: only the top 15 terminals are loaded
+    df_top = repository.top_terminals(limit=15, ferrovia=ferrovia, ano=ano)
 
     # Translate sector names for display
-    df_top['setor_display'] = df_top['setor'].apply(
-        lambda x: get_sector_name(x, lang)
-    )
+    df_top['setor_display'] = translate_sectors(df_top['setor'], lang)
 
     # Create stacked bar chart
     fig_bar = px.bar(
@@ -197,4 +211,4 @@ def _render_terminal_ranking():
         insidetextanchor='middle'
     )
 
-    st.plotly_chart(fig_bar, width='stretch')
+    return fig_bar
@@ -0,0 +1,198 @@
+"""
+Page 4: Railway Network (routes, bottlenecks and reach)
+"""
+import streamlit as st
+import pandas as pd
+from src.database import repository
+from src.utils.profiling import profiled
+from config.translations import get_text, translate_keys
+
+
+@profiled
+def render():
+    """Render the railway network page."""
+    lang = st.session_state.language
+
+    st.subheader(get_text('network_title', lang))
+    st.markdown(get_text('network_subtitle', lang))
+
+    # Built once per data version; each query below walks its CSR arrays
+    network = repository.rail_network()
+    if network.nodes.empty:
+        st.warning(get_text('network_no_data', lang))
+        return
+
+    yards = _concession_yards(network)
+    # A concession without Pátios / Entre Pátios rows has no graph
+    if yards.empty:
+        st.warning(get_text('network_no_data', lang))
+        return
+
+    # Route between two yards
+    _render_route(network, yards)
+
+    st.divider()
+
+    # Yards reachable from a terminal
+    _render_reach(network, yards)
+
+
+def warmup(lang, ferrovia=None, ano=None):
+    """Preload the graph render() walks (shared by every filter)."""
+    repository.rail_network()
+
+
+def _concession_yards(network):
+    """Yards of the concession in the sidebar filters (or picked here when ambiguous)."""
+    lang = st.session_state.language
+    filters = st.session_state.filters
+
+    yards = network.nodes
+    for column in ('ferrovia', 'ano'):
+        if filters[column] is not None:
+            yards = yards[yards[column] == filters[column]]
+
+    # Each concession is its own graph: pick one when the filters leave several
+    concessions = yards[['id_concessao', 'ferrovia', 'ano']].drop_duplicates()
+    concessions = concessions.sort_values(['ferrovia', 'ano'], ascending=[True, False])
+    if len(concessions) > 1:
+        labels = dict(zip(
+            concessions['id_concessao'].tolist(),
+            (concessions['ferrovia'].astype('string') + ' ' + concessions['ano'].astype('string')).tolist()
+        ))
+        id_concessao = st.selectbox(
+            get_text('network_concession', lang),
+            list(labels),
+            format_func=labels.get
+        )
+        yards = yards[yards['id_concessao'] == id_concessao]
+
+    return yards.sort_values('nome', kind='stable')
+
+
+def _yard_label(yards):
+    names = yards['nome'].fillna('') + ' (' + yards['codigo'] + ')'
+    labels = dict(zip(yards['id_no'].tolist(), names.tolist()))
+    return labels.get
+
+
+@profiled
+def _render_route(network, yards):
+    """Render the fastest (or widest) route between two yards and its bottleneck."""
+    lang = st.session_state.language
+
+    st.subheader(get_text('network_route_title', lang))
+
+    options = yards['id_no'].tolist()
+    label = _yard_label(network.nodes)
+
+    c1, c2, c3 = st.columns([2, 2, 1])
+    with c1:
+        origin = st.selectbox(get_text('network_origin', lang), options, format_func=label)
+    with c2:
+        destination = st.selectbox(
+            get_text('network_destination', lang),
+            options,
+            index=min(1, len(options) - 1),
+            format_func=label
+        )
+    with c3:
+        criteria = {
+            'fastest': get_text('network_fastest', lang),
+            'widest': get_text('network_widest', lang),
+        }
+        criterion = st.radio(
+            get_text('network_criterion', lang),
+            list(criteria),
+            format_func=criteria.get
+        )
+
+    if criterion == 'widest':
+        route = network.widest_route(origin, destination)
+    else:
+        route = network.shortest_route(origin, destination)
+
+    if route is None:
+        st.warning(get_text(
+            'network_unreachable', lang, origin=label(origin), destination=label(destination)
+        ))
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric(get_text('network_time', lang), _format_hours(route.time_min))
+    col2.metric(get_text('network_length', lang), f"{route.length_km:,.1f} km")
+
+    if route.bottleneck_edge is None:
+        col3.metric(get_text('network_bottleneck', lang), "-")
+        return
+
+    bottleneck = network.edges.iloc[route.bottleneck_edge]
+    col3.metric(get_text('network_bottleneck', lang), f"{bottleneck['capacidade_instalada']:.1f}")
+    st.info(get_text(
+        'network_bottleneck_segment',
+        lang,
+        segment=f"{label(bottleneck['id_no_origem'])} → {label(bottleneck['id_no_destino'])}",
+        capacity=bottleneck['capacidade_instalada'],
+        utilization=bottleneck['utilizacao']
+    ))
+
+    st.dataframe(_route_table(network, route, label, lang), hide_index=True, width='stretch')
+
+
+def _route_table(network, route, label, lang):
+    """One row per segment of the route, in travel order."""
+    legs = network.edges.iloc[route.edges]
+    return pd.DataFrame({
+        get_text('network_from', lang): legs['id_no_origem'].map(label),
+        get_text('network_to', lang): legs['id_no_destino'].map(label),
+        get_text('network_direction', lang): translate_keys(legs['sentido'], lang, 'network_dir_'),
+        get_text('network_leg_time', lang): legs['tempo_min'].round(1),
+        get_text('network_leg_length', lang): legs['extensao_km'].round(3),
+        get_text('network_capacity', lang): legs['capacidade_instalada'].round(1),
+        get_text('network_utilization', lang): (legs['utilizacao'] * 100).round(1),
+    })
+
+
+@profiled
+def _render_reach(network, yards):
+    """Render the yards reachable from a terminal within a travel time."""
+    lang = st.session_state.language
+
+    st.subheader(get_text('network_reach_title', lang))
+
+    id_concessao = yards['id_concessao'].iloc[0]
+    terminals = network.terminals[network.terminals['id_concessao'] == id_concessao]
+    if terminals.empty:
+        st.info(get_text('network_no_terminals', lang))
+        return
+
+    c1, c2 = st.columns([2, 1])
+    with c1:
+        terminal = st.selectbox(
+            get_text('network_terminal', lang),
+            sorted(terminals['terminal'].unique().tolist())
+        )
+    with c2:
+        max_hours = st.slider(get_text('network_max_hours', lang), 1, 48, 12)
+
+    reached = network.reachable(
+        network.terminal_yards(terminal, id_concessao), max_time=max_hours * 60
+    )
+
+    st.metric(get_text('network_reach_count', lang), len(reached))
+
+    table = network.nodes.set_index('id_no').loc[reached.index, ['nome', 'codigo']]
+    st.dataframe(
+        pd.DataFrame({
+            get_text('network_yard', lang): table['nome'].to_numpy(),
+            get_text('network_code', lang): table['codigo'].to_numpy(),
+            get_text('network_hours', lang): (reached / 60).round(2).to_numpy(),
+        }),
+        hide_index=True,
+        width='stretch'
+    )
+
+
+def _format_hours(minutes):
+    hours, rest = divmod(int(round(minutes)), 60)
+    return f"{hours}h{rest:02d}"
@@ -2,19 +2,18 @@
 Page 3: Load vs Speed Relationship Analysis
 """
 import streamlit as st
+import pandas as pd
 import plotly.express as px
-from src.data.loader import load_data, validate_data
-from src.database.queries import (
-    QUERY_LOAD_VS_VMA,
-    QUERY_LOAD_VS_VMC,
-    QUERY_SPEED_ANOMALIES,
-    QUERY_SPEED_CLEAN_DATA
-)
-from src.utils.helpers import classify_efficiency, calculate_speed_insight
+from src.data.loader import validate_data
+from src.data.figure_cache import cached_figure
+from src.database import repository
+from src.utils.profiling import profiled
+from src.utils.helpers import calculate_speed_insight
 from config.settings import EFFICIENCY_COLORS
-from config.translations import get_text, get_efficiency_status
+from config.translations import get_text, get_efficiency_status, translate_efficiency, translate_keys
 
 
+@profiled
 def render():
     """Render the speed analysis page."""
     lang = st.session_state.language
@@ -36,32 +35,43 @@ def render():
     
     # Operational efficiency
     _render_operational_efficiency()
+    
+    st.divider()
+    
+    # Track attributes at a km of a line
+    _render_track_lookup()
+
 
+def warmup(lang, ferrovia=None, ano=None):
+    """Preload the queries and figures render() shows for these filters."""
+    for speed in ('vma', 'vmc'):
+        repository.load_vs_speed(speed, ferrovia=ferrovia, ano=ano)
+        _load_speed_figure(lang, speed=speed, ferrovia=ferrovia, ano=ano)
+    repository.speed_anomalies(ferrovia=ferrovia, ano=ano)
+    repository.speed_efficiency(ferrovia=ferrovia, ano=ano)
+    _efficiency_scatter_figure(lang, ferrovia=ferrovia, ano=ano)
+    # Default widget values of _render_corridor_ranking (top 10, worst first)
+    _corridor_ranking_figure(lang, ascending=True, limit=10, ferrovia=ferrovia, ano=ano)
+    repository.segment_index(ferrovia=ferrovia, ano=ano)
 
+    # The audit table's background_gradient imports matplotlib on first render
+    pd.DataFrame({'x': [0.0, 1.0]}).style.background_gradient(cmap='Reds').to_html()
+
+
+@profiled
 def _render_engineering_analysis():
     """Render engineering relationship between load and speed."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader(get_text('speed_vma_title', lang))
-        df_vma = load_data(QUERY_LOAD_VS_VMA)
+        df_vma = repository.load_vs_speed('vma', **filters)
 
         if validate_data(df_vma):
-            fig_vma = px.line(
-                df_vma,
-                x='carga_eixo',
-                y='vma_media',
-                markers=True,
-                labels={
-                    'carga_eixo': get_text('speed_load_label', lang),
-                    'vma_media': get_text('speed_vma_label', lang)
-                }
-            )
-            fig_vma.update_traces(fill='tozeroy', line_color='#2E86C1')
-            fig_vma.update_xaxes(type='category')
-            st.plotly_chart(fig_vma, width='stretch')
+            st.plotly_chart(_load_speed_figure(lang, speed='vma', **filters), width='stretch')
 
             insight = calculate_speed_insight(df_vma, 'vma_media')
             if insight:
@@ -71,22 +81,10 @@ def _render_engineering_analysis():
 
     with col2:
         st.subheader(get_text('speed_vmc_title', lang))
-        df_vmc = load_data(QUERY_LOAD_VS_VMC)
+        df_vmc = repository.load_vs_speed('vmc', **filters)
 
         if validate_data(df_vmc):
-            fig_vmc = px.line(
-                df_vmc,
-                x='carga_eixo',
-                y='vmc_media',
-                markers=True,
-                labels={
-                    'carga_eixo': get_text('speed_load_label', lang),
-                    'vmc_media': get_text('speed_vmc_label', lang)
-                }
-            )
-            fig_vmc.update_traces(fill='tozeroy', line_color='#2E86C1')
-            fig_vmc.update_xaxes(type='category')
-            st.plotly_chart(fig_vmc, width='stretch')
+            st.plotly_chart(_load_speed_figure(lang, speed='vmc', **filters), width='stretch')
 
             insight = calculate_speed_insight(df_vmc, 'vmc_media')
             if insight:
@@ -95,13 +93,36 @@ def _render_engineering_analysis():
                 )
 
 
+@cached_figure
+def _load_speed_figure(lang, speed='vma', ferrovia=None, ano=None):
+    """Area line of the average speed per axle load."""
+    df = repository.load_vs_speed(speed, ferrovia=ferrovia, ano=ano)
+    column = f'{speed}_media'
+
+    fig = px.line(
+        df,
+        x='carga_eixo',
+        y=column,
+        markers=True,
+        labels={
+            'carga_eixo': get_text('speed_load_label', lang),
+            column: get_text(f'speed_{speed}_label', lang)
+        }
+    )
+    fig.update_traces(fill='tozeroy', line_color='#2E86C1')
+    fig.update_xaxes(type='category')
+    return fig
+
+
+@profiled
 def _render_data_audit():
     """Render data consistency audit section."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('speed_audit_title', lang))
 
-    df_anomalies = load_data(QUERY_SPEED_ANOMALIES)
+    df_anomalies = repository.speed_anomalies(**filters)
     num_anomalies = len(df_anomalies)
 
     if num_anomalies > 0:
@@ -122,40 +143,55 @@ def _render_data_audit():
         st.success(get_text('speed_audit_success', lang))
 
 
+@profiled
 def _render_operational_efficiency():
     """Render operational efficiency analysis with clean data."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('speed_efficiency_title', lang))
     st.markdown(get_text('speed_efficiency_desc', lang))
 
-    df_clean = load_data(QUERY_SPEED_CLEAN_DATA)
+    # Efficiency and status already computed
+    df_clean = repository.speed_efficiency(**filters)
 
     if not validate_data(df_clean):
         st.warning(get_text('speed_no_data', lang))
         return
 
-    # Calculate efficiency
-    df_clean['eficiencia'] = (df_clean['vmc'] / df_clean['vma']) * 100
-    df_clean['status'] = df_clean['eficiencia'].apply(classify_efficiency)
-
     # Render scatter plot and KPIs
     _render_efficiency_scatter(df_clean)
 
     # Render corridor ranking
-    _render_corridor_ranking(df_clean)
+    _render_corridor_ranking()
 
 
+@profiled
 def _render_efficiency_scatter(df_clean):
     """Render scatter plot with efficiency classification."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     col_graph, col_kpi = st.columns([3, 1])
 
+    with col_graph:
+        st.plotly_chart(_efficiency_scatter_figure(lang, **filters), width='stretch')
+
+    with col_kpi:
+        st.markdown(f"#### {get_text('speed_global_summary', lang)}")
+        global_eff = (df_clean['vmc'].sum() / df_clean['vma'].sum()) * 100
+        st.metric(get_text('speed_avg_efficiency', lang), f"{global_eff:.1f}%")
+        st.metric(get_text('speed_segments_analyzed', lang), f"{len(df_clean)}")
+        st.caption(get_text('speed_segments_note', lang))
+
+
+@cached_figure
+def _efficiency_scatter_figure(lang, ferrovia=None, ano=None):
+    """VMA x VMC scatter colored by efficiency status, with the VMC = VMA diagonal."""
+    df_clean = repository.speed_efficiency(ferrovia=ferrovia, ano=ano)
+
     # Translate efficiency status for display
-    df_clean['status_display'] = df_clean['status'].apply(
-        lambda x: get_efficiency_status(x, lang)
-    )
+    df_clean['status_display'] = translate_efficiency(df_clean['status'], lang)
 
     # Create color map with translated labels
     color_map_translated = {
@@ -163,45 +199,36 @@ def _render_efficiency_scatter(df_clean):
         for k, v in EFFICIENCY_COLORS.items()
     }
 
-    with col_graph:
-        fig_scatter = px.scatter(
-            df_clean,
-            x='vma',
-            y='vmc',
-            color='status_display',
-            color_discrete_map=color_map_translated,
-            title=get_text('speed_scatter_title', lang),
-            hover_data=['linha'],
-            opacity=0.6
-        )
-
-        # Add reference diagonal line
-        max_val = df_clean['vma'].max()
-        fig_scatter.add_shape(
-            type="line",
-            x0=0, y0=0,
-            x1=max_val, y1=max_val,
-            line=dict(color="gray", dash="dash")
-        )
-        st.plotly_chart(fig_scatter, width='stretch')
+    fig_scatter = px.scatter(
+        df_clean,
+        x='vma',
+        y='vmc',
+        color='status_display',
+        color_discrete_map=color_map_translated,
+        title=get_text('speed_scatter_title', lang),
+        hover_data=['linha'],
+        opacity=0.6
+    )
 
-    with col_kpi:
-        st.markdown(f"#### {get_text('speed_global_summary', lang)}")
-        global_eff = (df_clean['vmc'].sum() / df_clean['vma'].sum()) * 100
-        st.metric(get_text('speed_avg_efficiency', lang), f"{global_eff:.1f}%")
-        st.metric(get_text('speed_segments_analyzed', lang), f"{len(df_clean)}")
-        st.caption(get_text('speed_segments_note', lang))
+    # Add reference diagonal line
+    max_val = df_clean['vma'].max()
+    fig_scatter.add_shape(
+        type="line",
+        x0=0, y0=0,
+        x1=max_val, y1=max_val,
+        line=dict(color="gray", dash="dash")
+    )
+    return fig_scatter
 
 
-def _render_corridor_ranking(df_clean):
+@profiled
+def _render_corridor_ranking():
     """Render interactive corridor ranking."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('speed_corridor_ranking', lang))
 
-    df_rank = df_clean.groupby('linha')[['vma', 'vmc']].mean().reset_index()
-    df_rank['eficiencia'] = (df_rank['vmc'] / df_rank['vma']) * 100
-
     c1, c2 = st.columns([1, 2])
 
     with c1:
@@ -222,14 +249,27 @@ def _render_corridor_ranking(df_clean):
         )
 
     ascending = sort_mode == get_text('speed_sort_worst', lang)
-    df_view = df_rank.sort_values('eficiencia', ascending=ascending).head(num_corridors)
+    st.plotly_chart(
+        _corridor_ranking_figure(lang, ascending=ascending, limit=num_corridors, **filters),
+        width='stretch'
+    )
+
+
+@cached_figure
+def _corridor_ranking_figure(lang, ascending=True, limit=10, ferrovia=None, ano=None):
+    """Horizontal bars of the least (or most) efficient corridors."""
+    # Sorting and top-N run in SQLite
+    df_view = repository.corridor_efficiency(
+        ascending=ascending, limit=limit, ferrovia=ferrovia, ano=ano
+    )
+    sort_mode = get_text('speed_sort_worst' if ascending else 'speed_sort_best', lang)
 
     fig_bar = px.bar(
         df_view,
         x='eficiencia',
         y='linha',
         orientation='h',
-        title=get_text('speed_top_corridors', lang, n=num_corridors, mode=sort_mode),
+        title=get_text('speed_top_corridors', lang, n=limit, mode=sort_mode),
         color='eficiencia',
         color_continuous_scale='RdYlGn',
         range_color=[0, 100],
@@ -239,4 +279,62 @@ def _render_corridor_ranking(df_clean):
         xaxis_range=[0, 100],
         yaxis={'categoryorder': 'total ascending'}
     )
-    st.plotly_chart(fig_bar, width='stretch')
+    return fig_bar
+
+
+@profiled
+def _render_track_lookup():
+    """Render the attributes in force at a chosen km of a line."""
+    lang = st.session_state.language
+    filters = st.session_state.filters
+
+    st.subheader(get_text('track_title', lang))
+    st.markdown(get_text('track_desc', lang))
+
+    # Built once per filter and data version; each lookup is a bisect
+    index = repository.segment_index(**filters)
+    lines = index.lines()
+    if not lines:
+        st.warning(get_text('speed_no_data', lang))
+        return
+
+    c1, c2 = st.columns([2, 1])
+
+    with c1:
+        line = st.selectbox(get_text('track_line', lang), lines)
+
+    km_start, km_end = index.extent(line)
+    with c2:
+        km = st.number_input(
+            get_text('track_km', lang),
+            min_value=float(km_start),
+            max_value=float(km_end),
+            value=float(km_start),
+            step=1.0,
+            format='%.3f'
+        )
+
+    df_at = index.at(line, km)
+    if df_at.empty:
+        st.info(get_text('track_no_data', lang))
+        return
+
+    st.dataframe(_track_table(df_at, lang), hide_index=True, width='stretch')
+
+
+def _track_table(df_at, lang):
+    """One row per attribute: translated name, value and the range it holds on."""
+    # Without a concession filter every year repeats the ranges that did not change
+    df_at = df_at.drop_duplicates(
+        subset=['atributo', 'km_inicio', 'km_fim', 'valor_num', 'valor_texto']
+    ).reset_index(drop=True)
+    values = df_at['valor_texto'].astype('object')
+    numeric = df_at['valor_num'].notna()
+    values[numeric] = df_at.loc[numeric, 'valor_num'].map('{:g}'.format)
+
+    return pd.DataFrame({
+        get_text('track_attribute', lang): translate_keys(df_at['atributo'], lang, 'attr_'),
+        get_text('track_value', lang): values,
+        get_text('track_from', lang): df_at['km_inicio'],
+        get_text('track_to', lang): df_at['km_fim'],
+    })
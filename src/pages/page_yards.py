@@ -1,41 +1,56 @@
 """
 Page 1: Yard Licensing by Operational Status
 """
+import numpy as np
 import streamlit as st
 import plotly.express as px
-from src.data.loader import load_data, validate_data
-from src.database.queries import QUERY_YARDS_BY_STATUS, QUERY_YARDS_BY_LINE
+import plotly.graph_objects as go
+from config.settings import BOX_PLOT_MAX_POINTS, BOX_PLOT_WEBGL_POINTS
+from src.data.loader import validate_data
+from src.data.figure_cache import cached_figure
+from src.database import repository
+from src.utils.boxplot import box_summary, sample_points
+from src.utils.profiling import profiled
 from config.translations import get_text
 
 
+@profiled
 def render():
     """Render the yards analysis page."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('yards_title', lang))
 
     # Load and process data
-    df = load_data(QUERY_YARDS_BY_STATUS)
+    df_grouped = repository.yards_by_status(**filters)
 
-    if not validate_data(df):
+    if not validate_data(df_grouped):
         st.warning(get_text('yards_no_data', lang))
         return
 
-    df_grouped = df.groupby('em_operacao')['tempo_medio_licenc_min'].mean().reset_index()
-
     # Overview section
-    _render_overview(df, df_grouped)
+    _render_overview(df_grouped)
 
     st.divider()
 
     # Detailed distribution
-    _render_distribution(df)
+    _render_distribution()
 
     # Corridor analysis
     _render_corridor_analysis()
 
 
-def _render_overview(df, df_grouped):
+def warmup(lang, ferrovia=None, ano=None):
+    """Preload the queries and figures render() shows for these filters."""
+    repository.yards_by_status(ferrovia=ferrovia, ano=ano)
+    repository.yards_by_line(ferrovia=ferrovia, ano=ano)
+    _distribution_figure(lang, ferrovia=ferrovia, ano=ano)
+    _top_lines_figure(lang, ferrovia=ferrovia, ano=ano)
+
+
+@profiled
+def _render_overview(df_grouped):
     """Render overview section with summary statistics."""
     lang = st.session_state.language
 
@@ -44,23 +59,37 @@ def _render_overview(df, df_grouped):
     with col1:
         st.markdown(f"### {get_text('overview', lang)}")
         st.dataframe(
-            df_grouped.style.format({"tempo_medio_licenc_min": "{:.2f} min"})
+            df_grouped[['em_operacao', 'tempo_medio_licenc_min']]
+            .style.format({"tempo_medio_licenc_min": "{:.2f} min"})
         )
 
     with col2:
-        count = df['em_operacao'].value_counts()
+        count = df_grouped.set_index('em_operacao')['qtd_patios']
         st.write(f"**{get_text('yards_distribution_title', lang)}**")
         st.bar_chart(count)
 
 
-def _render_distribution(df):
+@profiled
+def _render_distribution():
     """Render detailed time distribution box plot."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.markdown(f"### {get_text('yards_detailed_title', lang)}")
     st.info(get_text('yards_detailed_info', lang))
 
-    fig = px.box(
+    st.plotly_chart(_distribution_figure(lang, **filters), width='stretch')
+
+
+@cached_figure
+def _distribution_figure(lang, ferrovia=None, ano=None):
+    """Box plot of licensing time per status, with every yard as a point."""
+    df = repository.yards(ferrovia=ferrovia, ano=ano)
+
+    if len(df) > BOX_PLOT_WEBGL_POINTS:
+        return _summary_box_figure(df, lang)
+
+    return px.box(
         df,
         x='em_operacao',
         y='tempo_medio_licenc_min',
@@ -73,17 +102,81 @@ def _render_distribution(df):
             'em_operacao': get_text('yards_box_xlabel', lang)
         }
     )
-    st.plotly_chart(fig, width='stretch')
 
 
+def _summary_box_figure(df, lang):
+    """Boxes computed here plus one WebGL trace of points per status (sampled when large)."""
+    groups, values = df['em_operacao'], df['tempo_medio_licenc_min']
+    summary = box_summary(groups, values)
+    points = df.iloc[sample_points(groups, values, summary, BOX_PLOT_MAX_POINTS)]
+
+    x_label = get_text('yards_box_xlabel', lang)
+    y_label = get_text('yards_box_ylabel', lang)
+    colors = px.colors.qualitative.Plotly
+    # Fixed seed: the same data always yields the same figure (and figure cache entry)
+    jitter = np.random.default_rng(0).uniform(-0.1, 0.1, len(points))
+
+    fig = go.Figure()
+    for position, box in summary.iterrows():
+        name = str(box['group'])
+        color = colors[position % len(colors)]
+        in_group = (points['em_operacao'] == box['group']).to_numpy()
+
+        fig.add_trace(go.Box(
+            x=[position],
+            q1=[box['q1']],
+            median=[box['median']],
+            q3=[box['q3']],
+            lowerfence=[box['lowerfence']],
+            upperfence=[box['upperfence']],
+            width=0.4,
+            name=name,
+            legendgroup=name,
+            marker_color=color,
+            boxpoints=False
+        ))
+        fig.add_trace(go.Scattergl(
+            x=position - 0.4 + jitter[in_group],
+            y=points.loc[in_group, 'tempo_medio_licenc_min'],
+            customdata=points.loc[in_group, 'patio'],
+            mode='markers',
+            marker=dict(color=color, size=4, opacity=0.6),
+            name=name,
+            legendgroup=name,
+            showlegend=False,
+            hovertemplate=f"%{{customdata}}<br>{y_label}=%{{y}}<extra>{name}</extra>"
+        ))
+
+    title = get_text('yards_box_title', lang)
+    total = int(summary['count'].sum())
+    if len(points) < total:
+        sampled = get_text('yards_box_sampled', lang, shown=f"{len(points):,}", total=f"{total:,}")
+        title = f"{title}<br><sup>{sampled}</sup>"
+
+    fig.update_layout(
+        title=title,
+        xaxis=dict(
+            title=x_label,
+            tickmode='array',
+            tickvals=list(range(len(summary))),
+            ticktext=summary['group'].astype(str).tolist()
+        ),
+        yaxis_title=y_label,
+        legend_title_text=x_label
+    )
+    return fig
+
+
+@profiled
 def _render_corridor_analysis():
     """Render corridor congestion analysis."""
     lang = st.session_state.language
+    filters = st.session_state.filters
 
     st.subheader(get_text('yards_corridor_title', lang))
     st.markdown(get_text('yards_corridor_desc', lang))
 
-    df_lines = load_data(QUERY_YARDS_BY_LINE)
+    df_lines = repository.yards_by_line(**filters)
 
     if not validate_data(df_lines):
         st.warning(get_text('yards_no_data', lang))
@@ -101,20 +194,7 @@ def _render_corridor_analysis():
     col1, col2 = st.columns([3.5, 1.5])
 
     with col1:
-        fig_bar = px.bar(
-            df_lines.head(15),
-            x='nome_linha',
-            y='tempo_medio',
-            color='tempo_medio',
-            hover_data=['qtd_patios'],
-            title=get_text('yards_top_lines_title', lang),
-            labels={
-                'tempo_medio': get_text('yards_time_label', lang),
-                'nome_linha': get_text('yards_line_label', lang)
-            },
-            color_continuous_scale='Reds'
-        )
-        st.plotly_chart(fig_bar, width='stretch')
+        st.plotly_chart(_top_lines_figure(lang, **filters), width='stretch')
 
     with col2:
         st.markdown(f"### {get_text('details', lang)}")
@@ -122,3 +202,23 @@ def _render_corridor_analysis():
             df_lines[['nome_linha', 'tempo_medio', 'qtd_patios']],
             hide_index=True
         )
+
+
+@cached_figure
+def _top_lines_figure(lang, ferrovia=None, ano=None):
+    """Bar chart of the 15 lines with the longest average licensing time."""
+    df_lines = repository.yards_by_line(ferrovia=ferrovia, ano=ano, limit=15)
+
+    return px.bar(
+        df_lines,
+        x='nome_linha',
+        y='tempo_medio',
+        color='tempo_medio',
+        hover_data=['qtd_patios'],
+        title=get_text('yards_top_lines_title', lang),
+        labels={
+            'tempo_medio': get_text('yards_time_label', lang),
+            'nome_linha': get_text('yards_line_label', lang)
+        },
+        color_continuous_scale='Reds'
+    )
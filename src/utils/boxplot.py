@@ -0,0 +1,96 @@
+"""
+Box plot statistics computed on the server.
+
+With points="all" Plotly ships every value to the browser and computes the
+quartiles there. For large groups the figure instead carries the precomputed
+boxes (quartiles and Tukey whiskers, as Plotly draws them) plus a bounded set
+of points: the outliers first, then an evenly spaced sample of the values
+inside the whiskers, stratified by group and by value.
+"""
+import numpy as np
+import pandas as pd
+
+# Tukey fences: whiskers reach the last point within 1.5 IQR of the box
+WHISKER_IQR = 1.5
+
+SUMMARY_COLUMNS = ['group', 'count', 'q1', 'median', 'q3', 'lowerfence', 'upperfence']
+
+
+def box_summary(groups: pd.Series, values: pd.Series) -> pd.DataFrame:
+    """
+    Quartiles and whiskers of each group.
+
+    Args:
+        groups: Group of each value (order of first appearance is kept)
+        values: Values; missing ones are ignored
+
+    Returns:
+        DataFrame with group, count, q1, median, q3, lowerfence and upperfence
+    """
+    valid = values.notna() & groups.notna()
+    codes, labels = pd.factorize(groups[valid], sort=False)
+    data = values[valid].to_numpy(dtype='float64')
+
+    rows = []
+    for code, label in enumerate(labels):
+        group_values = data[codes == code]
+        q1, median, q3 = np.percentile(group_values, [25, 50, 75])
+        iqr = q3 - q1
+        inside = group_values[
+            (group_values >= q1 - WHISKER_IQR * iqr) & (group_values <= q3 + WHISKER_IQR * iqr)
+        ]
+        rows.append((label, len(group_values), q1, median, q3, inside.min(), inside.max()))
+
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+
+
+def _spread(positions: np.ndarray, data: np.ndarray, quota: int) -> np.ndarray:
+    """quota positions evenly spaced over the sorted values (both extremes included)"""
+    ordered = positions[np.argsort(data[positions], kind='stable')]
+    return ordered[np.linspace(0, len(ordered) - 1, quota).round().astype('int64')]
+
+
+def sample_points(groups: pd.Series, values: pd.Series, summary: pd.DataFrame,
+                  max_points: int) -> np.ndarray:
+    """
+    Points to draw next to the precomputed boxes.
+
+    Strata are (group, outlier or not). Outliers come first: all of them while
+    they fit in half of max_points. The rest of the budget goes to the values
+    inside the whiskers. Each stratum gets a share proportional to its size,
+    spread evenly over its sorted values, so dense ranges stay dense and the
+    extremes are always drawn.
+
+    Args:
+        groups: Group of each value
+        values: Values
+        summary: Result of box_summary for the same data
+        max_points: Number of points to aim for
+
+    Returns:
+        Sorted positions (0..n-1) of the rows to draw
+    """
+    fences = summary.set_index('group')
+    data = values.to_numpy(dtype='float64')
+    group_values = groups.to_numpy(dtype=object)
+    valid = ~np.isnan(data) & groups.notna().to_numpy()
+
+    lower = pd.Series(fences['lowerfence']).reindex(group_values).to_numpy()
+    upper = pd.Series(fences['upperfence']).reindex(group_values).to_numpy()
+    outlier = valid & ((data < lower) | (data > upper))
+
+    picked = [np.array([], dtype='int64')]
+    budget = max_points
+    for mask, share in ((outlier, max_points // 2), (valid & ~outlier, None)):
+        available = min(int(mask.sum()), budget if share is None else share)
+        if not available:
+            continue
+        strata = [np.flatnonzero(mask & (group_values == label)) for label in fences.index]
+        total = sum(len(positions) for positions in strata)
+        for positions in strata:
+            if len(positions):
+                quota = min(len(positions), max(1, round(available * len(positions) / total)))
+                picked.append(_spread(positions, data, quota))
+        budget -= available
+
+    return np.unique(np.concatenate(picked))
@@ -0,0 +1,131 @@
+"""
+Interval index over the km ranges of trechos_segmentos.
+
+Each line is cut at every range boundary into elementary intervals; each
+elementary interval keeps the segments that cover it. A point or range
+lookup along a line is then a bisect on the sorted boundaries plus the
+segments found there, instead of a scan over every (start, end) column pair.
+"""
+from bisect import bisect_right
+
+import numpy as np
+import pandas as pd
+
+
+class _LineIndex:
+    """Sorted boundaries of one line and the segments covering each elementary interval."""
+
+    def __init__(self, positions: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        bounds = np.unique(np.concatenate([starts, ends]))
+        self.bounds = bounds.tolist()
+        self.starts = dict(zip(positions.tolist(), starts.tolist()))
+        self.ends = dict(zip(positions.tolist(), ends.tolist()))
+
+        # Elementary interval j is [bounds[j], bounds[j + 1]]; a single boundary is one slot
+        n_slots = max(len(bounds) - 1, 1)
+        first = np.clip(np.searchsorted(bounds, starts, side='left') - 1, 0, n_slots - 1)
+        last = np.clip(np.searchsorted(bounds, ends, side='right') - 1, 0, n_slots - 1)
+
+        self.slots = [[] for _ in range(n_slots)]
+        for position, lo, hi in zip(positions.tolist(), first.tolist(), last.tolist()):
+            for slot in range(lo, hi + 1):
+                self.slots[slot].append(position)
+
+    def _slot(self, km: float) -> int:
+        return min(max(bisect_right(self.bounds, km) - 1, 0), len(self.slots) - 1)
+
+    def at(self, km: float) -> list:
+        if not self.bounds[0] <= km <= self.bounds[-1]:
+            return []
+        return [p for p in self.slots[self._slot(km)] if self.starts[p] <= km <= self.ends[p]]
+
+    def overlapping(self, km_start: float, km_end: float) -> list:
+        if km_end < self.bounds[0] or km_start > self.bounds[-1]:
+            return []
+        found = set()
+        first, last = self._slot(km_start), self._slot(km_end)
+        for slot in range(first, last + 1):
+            found.update(self.slots[slot])
+        return sorted(p for p in found if self.starts[p] <= km_end and self.ends[p] >= km_start)
+
+
+class SegmentIndex:
+    """
+    Point and range lookups of track attributes along each line.
+
+    Built once from the trechos_segmentos rows (linha, atributo, km_inicio,
+    km_fim, valor_num, valor_texto); lookups cost O(log n) plus the segments
+    returned. Ranges are closed: a boundary km belongs to both neighbours.
+    """
+
+    def __init__(self, segments: pd.DataFrame):
+        self.segments = segments.reset_index(drop=True)
+        self._lines = {}
+
+        if self.segments.empty:
+            return
+
+        starts = self.segments['km_inicio'].to_numpy(dtype='float64')
+        ends = self.segments['km_fim'].to_numpy(dtype='float64')
+        for linha, positions in self.segments.groupby('linha', sort=True, observed=True).indices.items():
+            self._lines[linha] = _LineIndex(positions, starts[positions], ends[positions])
+
+    def lines(self) -> list:
+        """
+        Lines with at least one segment.
+
+        Returns:
+            Sorted line names
+        """
+        return list(self._lines)
+
+    def extent(self, linha: str) -> tuple:
+        """
+        First and last km covered on a line.
+
+        Args:
+            linha: Line name
+
+        Returns:
+            (km_start, km_end), or None for an unknown line
+        """
+        index = self._lines.get(linha)
+        if index is None:
+            return None
+        return index.bounds[0], index.bounds[-1]
+
+    def _rows(self, positions: list) -> pd.DataFrame:
+        rows = self.segments.iloc[positions]
+        return rows.sort_values(['atributo', 'km_inicio'], kind='stable').reset_index(drop=True)
+
+    def at(self, linha: str, km: float) -> pd.DataFrame:
+        """
+        Segments in force at one km of a line.
+
+        Args:
+            linha: Line name
+            km: Position along the line
+
+        Returns:
+            Segment rows whose range contains km, by attribute
+        """
+        index = self._lines.get(linha)
+        return self._rows(index.at(km) if index is not None else [])
+
+    def overlapping(self, linha: str, km_start: float, km_end: float) -> pd.DataFrame:
+        """
+        Segments that overlap a stretch of a line.
+
+        Args:
+            linha: Line name
+            km_start: First km of the stretch
+            km_end: Last km of the stretch
+
+        Returns:
+            Segment rows whose range intersects [km_start, km_end], by attribute and km
+        """
+        index = self._lines.get(linha)
+        if index is None:
+            return self._rows([])
+        km_start, km_end = min(km_start, km_end), max(km_start, km_end)
+        return self._rows(index.overlapping(km_start, km_end))
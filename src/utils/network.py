@@ -0,0 +1,183 @@
+"""
+Railway network graph over the CSR arrays built by the ETL (db/network.py).
+
+Yards are nodes 0..n-1; the outgoing edges of node i are positions
+indptr[i]:indptr[i + 1] of the edge arrays. Path queries walk these arrays
+with a binary heap (Dijkstra), touching only the part of the network they reach.
+"""
+import heapq
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Route = namedtuple('Route', ['nodes', 'edges', 'time_min', 'length_km', 'bottleneck_edge'])
+
+
+class RailNetwork:
+    """
+    Directed yard graph with travel time and capacity on every edge.
+
+    Built once from grafo_patios / grafo_arestas / grafo_terminais and shared
+    read-only: the numeric arrays are NumPy, the adjacency lists plain Python
+    lists so the inner loop of a search avoids NumPy scalar overhead.
+    """
+
+    def __init__(self, nodes: pd.DataFrame, edges: pd.DataFrame, terminals: pd.DataFrame):
+        self.nodes = nodes.sort_values('id_no').reset_index(drop=True)
+        self.edges = edges.sort_values('id_aresta').reset_index(drop=True)
+        self.terminals = terminals.reset_index(drop=True)
+
+        self.indptr = np.append(
+            self.nodes['aresta_inicio'].to_numpy(dtype='int64'), len(self.edges)
+        )
+        self.indices = self.edges['id_no_destino'].to_numpy(dtype='int64')
+        self.time_min = self.edges['tempo_min'].to_numpy(dtype='float64')
+        self.length_km = self.edges['extensao_km'].to_numpy(dtype='float64')
+        self.capacity = self.edges['capacidade_instalada'].to_numpy(dtype='float64')
+
+        self._indptr = self.indptr.tolist()
+        self._indices = self.indices.tolist()
+        self._origins = self.edges['id_no_origem'].astype('int64').tolist()
+        self._time = self.time_min.tolist()
+        # Missing capacity never limits a route
+        self._capacity = np.nan_to_num(self.capacity, nan=np.inf).tolist()
+
+    def _search(self, sources, target=None, max_time=None):
+        """
+        Dijkstra from one or more sources.
+
+        Returns:
+            (distance, parent edge) dicts of the settled nodes
+        """
+        indptr, indices, time = self._indptr, self._indices, self._time
+        distance = {}
+        parent = {}
+        heap = [(0.0, node, -1) for node in sources]
+        heapq.heapify(heap)
+
+        while heap:
+            dist, node, edge = heapq.heappop(heap)
+            if node in distance:
+                continue
+            distance[node] = dist
+            parent[node] = edge
+            if node == target:
+                break
+
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[position]
+                if neighbour in distance:
+                    continue
+                candidate = dist + time[position]
+                if max_time is None or candidate <= max_time:
+                    heapq.heappush(heap, (candidate, neighbour, position))
+
+        return distance, parent
+
+    def shortest_route(self, source: int, target: int):
+        """
+        Fastest route between two yards.
+
+        Args:
+            source: id_no of the origin yard
+            target: id_no of the destination yard
+
+        Returns:
+            Route (yards, edge positions, total minutes, total km and the
+            position of the lowest-capacity edge), or None when unreachable
+        """
+        _, parent = self._search([source], target=target)
+        return self._route(source, target, parent)
+
+    def widest_route(self, source: int, target: int):
+        """
+        Route between two yards whose bottleneck has the highest installed capacity.
+
+        Args:
+            source: id_no of the origin yard
+            target: id_no of the destination yard
+
+        Returns:
+            Route, or None when unreachable
+        """
+        indptr, indices, capacity = self._indptr, self._indices, self._capacity
+        parent = {}
+        # Max-heap on the bottleneck so far (negated); ties go to the faster route
+        heap = [(-float('inf'), 0.0, source, -1)]
+
+        while heap:
+            width, dist, node, edge = heapq.heappop(heap)
+            if node in parent:
+                continue
+            parent[node] = edge
+            if node == target:
+                break
+
+            for position in range(indptr[node], indptr[node + 1]):
+                neighbour = indices[position]
+                if neighbour not in parent:
+                    heapq.heappush(heap, (
+                        max(width, -capacity[position]),
+                        dist + self._time[position],
+                        neighbour,
+                        position,
+                    ))
+
+        return self._route(source, target, parent)
+
+    def _route(self, source: int, target: int, parent: dict):
+        """Walk the parent edges back from target."""
+        if target not in parent:
+            return None
+
+        edges = []
+        node = target
+        while parent[node] != -1:
+            edge = parent[node]
+            edges.append(edge)
+            node = self._origins[edge]
+        edges.reverse()
+
+        capacities = self.capacity[edges]
+        bottleneck = None
+        if len(edges) and not np.isnan(capacities).all():
+            bottleneck = edges[int(np.nanargmin(capacities))]
+
+        return Route(
+            nodes=[source] + [self._indices[edge] for edge in edges],
+            edges=edges,
+            time_min=float(self.time_min[edges].sum()),
+            length_km=float(np.nansum(self.length_km[edges])),
+            bottleneck_edge=bottleneck,
+        )
+
+    def reachable(self, sources, max_time=None) -> pd.Series:
+        """
+        Yards reachable from a set of yards, with the fastest travel time.
+
+        Args:
+            sources: id_no of the starting yards
+            max_time: Only yards within this many minutes
+
+        Returns:
+            Series of minutes indexed by id_no, nearest first (sources included)
+        """
+        distance, _ = self._search(list(sources), max_time=max_time)
+        return pd.Series(distance, dtype='float64').sort_values(kind='stable')
+
+    def terminal_yards(self, terminal: str, id_concessao=None) -> list:
+        """
+        Reference yards of a terminal.
+
+        Args:
+            terminal: Terminal name
+            id_concessao: Concession of the terminal (all when None)
+
+        Returns:
+            id_no of the yards the terminal is attached to
+        """
+        rows = self.terminals[self.terminals['terminal'] == terminal]
+        if id_concessao is not None:
+            rows = rows[rows['id_concessao'] == id_concessao]
+        return rows['id_no'].astype('int64').tolist()
@@ -0,0 +1,229 @@
+"""
+Opt-in render and query profiling for dashboard reruns.
+
+Profiling is off unless the PROFILE_ENV_VAR environment variable is set or the
+sidebar toggle is on. While active, each rerun collects:
+
+- the wall time of every function decorated with ``@profiled``
+  (page ``render()`` and ``_render_*`` sections), nested by call depth;
+- every ``load_data`` query with its duration, row count and cache hit/miss;
+- hit/miss counters for the other caches (e.g. rendered figures).
+
+The collected run is shown in the debug panel and appended as one JSON line
+to PROFILE_LOG_PATH, so timings can be aggregated across sessions.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import wraps
+
+import pandas as pd
+
+from config.settings import PROFILE_ENV_VAR, PROFILE_LOG_PATH
+
+# Streamlit runs each session's script in its own thread
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+def env_enabled() -> bool:
+    """
+    Check whether profiling was switched on for every session.
+
+    Returns:
+        True if PROFILE_ENV_VAR is set to a truthy value
+    """
+    return os.environ.get(PROFILE_ENV_VAR, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class RunProfile:
+    """Timings collected during one script rerun."""
+
+    def __init__(self):
+        self.timestamp = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        self.started = time.perf_counter()
+        self.total_ms = None
+        self.sections = []
+        self.queries = []
+        self.caches = {}
+        self._depth = 0
+        self._query = None
+
+    def count(self, cache: str, hit: bool):
+        counts = self.caches.setdefault(cache, {'hit': 0, 'miss': 0})
+        counts['hit' if hit else 'miss'] += 1
+
+    def finish(self):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    def sections_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.sections, columns=['section', 'depth', 'ms'])
+
+    def queries_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.queries, columns=['query', 'params', 'rows', 'cache', 'ms'])
+
+    def caches_frame(self) -> pd.DataFrame:
+        return pd.DataFrame.from_dict(self.caches, orient='index', columns=['hit', 'miss'])
+
+    def to_record(self, **context) -> dict:
+        return {
+            'timestamp': self.timestamp,
+            **context,
+            'total_ms': round(self.total_ms, 2),
+            'sections': self.sections,
+            'queries': self.queries,
+            'caches': self.caches,
+        }
+
+
+def start_run() -> RunProfile:
+    """
+    Start collecting timings for the current rerun.
+
+    Returns:
+        RunProfile filled in by the instrumented code
+    """
+    _local.profile = RunProfile()
+    return _local.profile
+
+
+def current():
+    """
+    Profile of the rerun executing in this thread.
+
+    Returns:
+        RunProfile, or None when profiling is off
+    """
+    return getattr(_local, 'profile', None)
+
+
+def finish_run(**context):
+    """
+    Stop collecting and append the run to the structured log.
+
+    Args:
+        **context: Extra fields stored with the run (session, page, filters...)
+
+    Returns:
+        The finished RunProfile, or None when profiling is off
+    """
+    profile = current()
+    if profile is None:
+        return None
+    _local.profile = None
+
+    profile.finish()
+    append_log(profile.to_record(**context))
+    return profile
+
+
+def append_log(record: dict):
+    """
+    Append one JSON line to PROFILE_LOG_PATH.
+
+    Args:
+        record: JSON-serializable run record
+    """
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    with _log_lock:
+        os.makedirs(os.path.dirname(PROFILE_LOG_PATH), exist_ok=True)
+        with open(PROFILE_LOG_PATH, 'a', encoding='utf-8') as log:
+            log.write(line + '\n')
+
+
+@contextmanager
+def section(name: str):
+    """
+    Time the ``with`` block as a named section.
+
+    Args:
+        name: Section label shown in the debug panel
+    """
+    profile = current()
+    if profile is None:
+        yield
+        return
+
+    # Reserve the slot first so nested sections are listed after their parent
+    entry = {'section': name, 'depth': profile._depth, 'ms': None}
+    profile.sections.append(entry)
+    profile._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry['ms'] = round((time.perf_counter() - start) * 1000, 2)
+        profile._depth -= 1
+
+
+def profiled(func):
+    """Time every call of ``func`` as a section named after its module and function."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with section(name):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _query_label(query: str) -> str:
+    """Collapse whitespace and truncate so queries fit a table cell."""
+    text = ' '.join(query.split())
+    return text if len(text) <= 120 else text[:117] + '...'
+
+
+@contextmanager
+def query(sql: str, params: tuple):
+    """
+    Time one ``load_data`` call.
+
+    The cached function calls mark_cache_miss() when it actually runs, so a
+    query that never reaches it is counted as a cache hit.
+
+    Args:
+        sql: SQL query string
+        params: Values bound to the query's ? placeholders
+
+    Yields:
+        Dict where the caller stores the row count under 'rows'
+    """
+    profile = current()
+    stats = {'query': _query_label(sql), 'params': list(params), 'rows': None, 'cache': 'hit'}
+    if profile is None:
+        yield stats
+        return
+
+    profile._query = stats
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats['ms'] = round((time.perf_counter() - start) * 1000, 2)
+        profile._query = None
+        profile.queries.append(stats)
+        profile.count('query', stats['cache'] == 'hit')
+
+
+def mark_cache_miss():
+    """Flag the query being timed as a cache miss (called from inside the cached function)."""
+    profile = current()
+    if profile is not None and profile._query is not None:
+        profile._query['cache'] = 'miss'
+
+
+def count(cache: str, hit: bool):
+    """
+    Count a hit or miss on a named cache.
+
+    Args:
+        cache: Cache name shown in the debug panel
+        hit: Whether the lookup was served from the cache
+    """
+    profile = current()
+    if profile is not None:
+        profile.count(cache, hit)